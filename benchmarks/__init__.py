@@ -0,0 +1,4 @@
+"""
+Benchmark suite for Supermarket Management System
+Run the bench_*.py scripts directly; datagen holds the shared synthetic data generators
+"""
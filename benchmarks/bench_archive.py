@@ -0,0 +1,81 @@
+"""
+Archive Benchmark
+Measures heap released by archiving closed days and the cost of scanning them
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product
+from sales import Sale, SalesManager
+from sales_archive import SalesArchive
+
+
+def record_days(manager, num_days, sales_per_day, items_per_sale, num_products):
+    """Record sales_per_day sales on each of num_days days"""
+    catalog = [Product(f"P{i:06d}", f"Item {i}", 1.00 + (i % 500) / 100, 10**9, "General")
+               for i in range(num_products)]
+    start = datetime(2024, 1, 1, 8)
+    step = timedelta(hours=12) / sales_per_day
+    for day in range(num_days):
+        for n in range(sales_per_day):
+            sale = Sale(f"SALE-{day:04d}-{n:06d}")
+            for k in range(items_per_sale):
+                sale.add_item(catalog[(n * 7 + k * 131) % num_products], 1)
+            sale.complete_sale("Cash" if n % 3 else "Card")
+            sale.timestamp = start + timedelta(days=day) + n * step
+            manager.record_sale(sale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--sales-per-day", type=int, default=5_000)
+    parser.add_argument("--items-per-sale", type=int, default=5)
+    parser.add_argument("--products", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        gc.collect()
+        tracemalloc.start()
+        manager = SalesManager(sales_archive=SalesArchive(tmp))
+        record_days(manager, args.days, args.sales_per_day, args.items_per_sale, args.products)
+        gc.collect()
+        live_bytes = tracemalloc.get_traced_memory()[0]
+        
+        started = time.perf_counter()
+        days = manager.archive_closed_days(datetime(2100, 1, 1).date())
+        archive_seconds = time.perf_counter() - started
+        gc.collect()
+        archived_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        
+        started = time.perf_counter()
+        scanned = sum(manager.get_hourly_revenue(day)[12] for day in days)
+        scan_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        sales = sum(len(manager.get_sales_by_date(day)) for day in days)
+        materialize_seconds = time.perf_counter() - started
+        manager.sales_archive.close()
+    
+    print("\n" + "="*50)
+    print(f"ARCHIVE BENCHMARK ({args.days} days x {args.sales_per_day:,} sales)")
+    print("="*50)
+    print(f"Heap with live days:   {live_bytes / 2**20:10.1f} MiB")
+    print(f"Heap after archiving:  {archived_bytes / 2**20:10.1f} MiB")
+    print(f"Archive write:         {archive_seconds:10.2f} s")
+    print(f"Hourly revenue scan:   {scan_seconds * 1000:10.1f} ms  (noon total {scanned:,.2f})")
+    print(f"Materialize sales:     {materialize_seconds:10.2f} s  ({sales:,} sales)")
+
+
+if __name__ == "__main__":
+    main()
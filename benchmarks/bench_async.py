@@ -0,0 +1,77 @@
+"""
+Async Load Benchmark
+Drives concurrent simulated carts through AsyncSalesManager
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+from async_sales import AsyncSalesManager, AsyncSaleSink
+
+
+class LatencySink(AsyncSaleSink):
+    """Sink that simulates a fixed write latency per batch"""
+    
+    def __init__(self, latency):
+        self.latency = latency
+    
+    async def write_sales(self, sales):
+        await asyncio.sleep(self.latency)
+
+
+async def run(num_carts, num_products, items_per_cart, batch_size, max_pending, sink_latency):
+    """Run num_carts concurrent carts; return (seconds, pos, sale ids)"""
+    inventory = ProductManager()
+    for i in range(num_products):
+        inventory.add_product(Product(f"P{i:05d}", f"Item {i}", 1.00 + i % 9, 10**9))
+    rng = random.Random(42)
+    
+    async with AsyncSalesManager(SalesManager(inventory=inventory), LatencySink(sink_latency),
+                                 batch_size=batch_size, max_pending=max_pending) as pos:
+        async def cart():
+            sale = pos.create_sale()
+            for _ in range(items_per_cart):
+                # Yield between scans like a real request handler would
+                await asyncio.sleep(0)
+                sale.add_item(inventory.get_product(f"P{rng.randrange(num_products):05d}"), 1)
+            await pos.checkout(sale, "Card")
+            return sale.sale_id
+        
+        start = time.perf_counter()
+        sale_ids = await asyncio.gather(*(cart() for _ in range(num_carts)))
+    return time.perf_counter() - start, pos, sale_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--carts", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--items-per-cart", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--max-pending", type=int, default=1_000)
+    parser.add_argument("--sink-latency", type=float, default=0.002, help="seconds per batch write")
+    args = parser.parse_args()
+    
+    elapsed, pos, sale_ids = asyncio.run(run(args.carts, args.products, args.items_per_cart,
+                                             args.batch_size, args.max_pending, args.sink_latency))
+    
+    print("\n" + "="*50)
+    print(f"ASYNC LOAD BENCHMARK ({args.carts:,} concurrent carts)")
+    print("="*50)
+    print(f"Elapsed:            {elapsed:.2f} s")
+    print(f"Checkouts/second:   {args.carts / elapsed:,.0f}")
+    print(f"Sink batches:       {pos.batches_written:,}")
+    print(f"Unique sale IDs:    {len(set(sale_ids)) == len(sale_ids)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Batch Checkout Benchmark
+Compares completing and recording sales one at a time with complete_and_record_batch
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import ProductManager
+from sales import SalesManager
+from datagen import make_baskets, make_catalog
+
+
+def build_sales(args):
+    """Fresh managed catalog and open (uncompleted) sales for every basket"""
+    products = ProductManager()
+    catalog = make_catalog(args.products, quantity=10**9)
+    products.bulk_load(catalog)
+    manager = SalesManager()
+    sales = []
+    for basket in make_baskets(catalog, args.sales):
+        sale = manager.create_sale()
+        for product, quantity in basket:
+            sale.add_item(product, quantity)
+        sales.append(sale)
+    return manager, sales
+
+
+def one_at_a_time(manager, sales, batch_size):
+    for sale in sales:
+        sale.complete_sale("card")
+        manager.record_sale(sale)
+
+
+def batched(manager, sales, batch_size):
+    for start in range(0, len(sales), batch_size):
+        manager.complete_and_record_batch(sales[start:start + batch_size], "card")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    print("\n" + "="*50)
+    print(f"BATCH CHECKOUT BENCHMARK ({args.sales:,} sales, {args.products:,} products, "
+          f"batches of {args.batch_size:,})")
+    print("="*50)
+    results = {}
+    for name, func in (("one at a time", one_at_a_time), ("batched", batched)):
+        best = None
+        for _ in range(args.repeat):
+            manager, sales = build_sales(args)
+            start = time.perf_counter()
+            func(manager, sales, args.batch_size)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best
+        print(f"{name:<16} {best * 1000:10.1f} ms  {args.sales / best:12,.0f} sales/s")
+    print(f"Speedup: {results['one at a time'] / results['batched']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
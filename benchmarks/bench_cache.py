@@ -0,0 +1,79 @@
+"""
+Cache Benchmark
+Measures barcode-scan latency and hit rate under a Zipf workload on SQLiteStorage
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from storage import SQLiteStorage
+from datagen import ZipfSampler, product_id
+
+
+def populate(path, num_products):
+    """Create a database holding num_products products"""
+    storage = SQLiteStorage(path, batch_size=10_000)
+    products = ProductManager(storage)
+    for i in range(num_products):
+        products.add_product(Product(product_id(i), f"Item {i}", 1.00 + (i % 500) / 100, 1000, f"Cat{i % 50}"))
+    storage.close()
+
+
+def percentile(sorted_values, fraction):
+    """Pick a percentile from sorted values"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_scans(lookup, scans):
+    """Time each lookup; return sorted latencies in microseconds"""
+    latencies = []
+    clock = time.perf_counter
+    for scanned_id in scans:
+        started = clock()
+        lookup(scanned_id)
+        latencies.append((clock() - started) * 1e6)
+    latencies.sort()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--scans", type=int, default=200_000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent")
+    args = parser.parse_args()
+    
+    scans = [product_id(index) for index in ZipfSampler(args.products, args.zipf).samples(args.scans)]
+    print("\n" + "="*50)
+    print(f"CACHE BENCHMARK ({args.scans:,} scans over {args.products:,} products, s={args.zipf})")
+    print("="*50)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        populate(path, args.products)
+        
+        storage = SQLiteStorage(path)
+        latencies = run_scans(storage.load_product, scans)
+        print(f"{'Storage only:':<22} p50 {percentile(latencies, 0.5):7.1f} us  "
+              f"p99 {percentile(latencies, 0.99):7.1f} us")
+        storage.close()
+        
+        for fraction in (0.001, 0.01, 0.1):
+            storage = SQLiteStorage(path)
+            products = ProductManager(storage, cache_size=max(1, int(args.products * fraction)))
+            latencies = run_scans(products.get_product, scans)
+            cache = products.cache
+            print(f"{'LRU ' + format(cache.capacity, ',') + ' entries:':<22} p50 {percentile(latencies, 0.5):7.1f} us  "
+                  f"p99 {percentile(latencies, 0.99):7.1f} us  hit rate {cache.get_hit_rate():6.1%}  "
+                  f"evictions {cache.evictions:,}")
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Catalog Import Benchmark
+Measures streaming CSV / JSON Lines import speed and peak memory
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import ProductManager
+from catalog_io import import_csv, import_jsonl
+
+
+def write_catalog(path, num_rows, fmt):
+    """Write a synthetic catalog file without holding it in memory"""
+    with open(path, "w", encoding="utf-8") as handle:
+        if fmt == "csv":
+            handle.write("product_id,name,price,quantity,category\n")
+            for i in range(num_rows):
+                handle.write(f"P{i:07d},Item {i},{1 + i % 500 / 100:.2f},{i % 300},Cat{i % 40}\n")
+        else:
+            for i in range(num_rows):
+                handle.write(f'{{"product_id": "P{i:07d}", "name": "Item {i}", "price": {1 + i % 500 / 100:.2f}, '
+                             f'"quantity": {i % 300}, "category": "Cat{i % 40}"}}\n')
+
+
+def run_import(path, loader, trace):
+    """Import a file into a fresh manager; return (seconds, peak bytes, report)"""
+    manager = ProductManager()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    report = loader(manager, path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    if trace:
+        tracemalloc.stop()
+    return elapsed, peak, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--trace-memory", action="store_true", help="report peak allocations (slower)")
+    args = parser.parse_args()
+    
+    print("\n" + "="*50)
+    print(f"CATALOG IMPORT BENCHMARK ({args.rows:,} rows)")
+    print("="*50)
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, loader in [("csv", import_csv), ("jsonl", import_jsonl)]:
+            path = os.path.join(tmp, f"catalog.{fmt}")
+            write_catalog(path, args.rows, fmt)
+            elapsed, peak, report = run_import(path, loader, args.trace_memory)
+            line = f"{fmt:<6} {elapsed:6.2f} s  {args.rows / elapsed:>10,.0f} rows/s  loaded={report.loaded:,}"
+            if args.trace_memory:
+                line += f"  peak={peak / 2**20:.0f} MiB"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Concurrency Benchmark
+Stress-tests concurrent POS lanes against a lock-striped ProductManager
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+
+
+def run_lanes(num_lanes, checkouts_per_lane, num_products, stock):
+    """Run lanes in threads; return (checkouts per second, oversold units, stock consistent)"""
+    products = ProductManager(concurrent=True)
+    for i in range(num_products):
+        products.add_product(Product(f"P{i:05d}", f"Item {i}", 1.00, stock))
+    sales = SalesManager(inventory=products)
+    
+    def lane(lane_number):
+        for n in range(checkouts_per_lane):
+            sale = sales.create_sale()
+            try:
+                for k in range(3):
+                    sale.add_item(products.get_product(f"P{(n * 3 + k + lane_number) % num_products:05d}"), 1)
+                sale.complete_sale("Cash")
+            except ValueError:
+                sale.cancel_sale()
+                continue
+            sales.record_sale(sale)
+    
+    threads = [threading.Thread(target=lane, args=(i,)) for i in range(num_lanes)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    oversold = sum(-p.quantity for p in products.get_all_products() if p.quantity < 0)
+    units_sold = sum(item.quantity for sale in sales.sales for item in sale.items)
+    remaining = sum(p.quantity for p in products.get_all_products())
+    return num_lanes * checkouts_per_lane / elapsed, oversold, units_sold + remaining == num_products * stock
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lanes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 30])
+    parser.add_argument("--checkouts", type=int, default=2000, help="checkouts per lane")
+    parser.add_argument("--products", type=int, default=50, help="few SKUs means heavy contention")
+    parser.add_argument("--stock", type=int, default=1000)
+    args = parser.parse_args()
+    
+    # Switch threads often to expose check-then-act races
+    sys.setswitchinterval(1e-6)
+    
+    print("\n" + "="*50)
+    print("CONCURRENCY BENCHMARK")
+    print("="*50)
+    print(f"{'lanes':>5}  {'checkouts/s':>12}  {'oversold':>8}  {'consistent':>10}")
+    for num_lanes in args.lanes:
+        rate, oversold, consistent = run_lanes(num_lanes, args.checkouts, args.products, args.stock)
+        print(f"{num_lanes:>5}  {rate:>12,.0f}  {oversold:>8}  {str(consistent):>10}")
+
+
+if __name__ == "__main__":
+    main()
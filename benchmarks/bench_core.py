@@ -0,0 +1,234 @@
+"""
+Core Operations Benchmark
+Times the product and sales hot paths on synthetic data, saving results as JSON
+and flagging regressions against a saved baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import ProductManager
+from sales import Sale, SalesManager
+from datagen import ZipfSampler, make_baskets, make_catalog, make_sales, product_id
+
+
+def bench_add_product(data):
+    def setup():
+        # Fresh products, as adding attaches them to the new manager
+        return ProductManager(), make_catalog(len(data["catalog"]), seed=data["seed"])
+    
+    def run(state):
+        manager, catalog = state
+        for product in catalog:
+            manager.add_product(product)
+        return len(catalog)
+    return setup, run
+
+
+def bench_get_product(data):
+    def run(manager):
+        get_product = manager.get_product
+        for key in data["lookups"]:
+            get_product(key)
+        return len(data["lookups"])
+    return lambda: data["products"], run
+
+
+def bench_search_by_category(data):
+    def run(manager):
+        for category in data["categories"]:
+            manager.search_by_category(category)
+        return len(data["categories"])
+    return lambda: data["products"], run
+
+
+def bench_add_item(data):
+    def run(baskets):
+        count = 0
+        for basket in baskets:
+            sale = Sale("BENCH")
+            for product, quantity in basket:
+                sale.add_item(product, quantity)
+            count += len(basket)
+        return count
+    return lambda: data["baskets"], run
+
+
+def bench_complete_sale(data):
+    def setup():
+        sales = []
+        for basket in data["baskets"]:
+            sale = Sale("BENCH")
+            for product, quantity in basket:
+                sale.add_item(product, quantity)
+            sales.append(sale)
+        return sales
+    
+    def run(sales):
+        for sale in sales:
+            sale.complete_sale("card")
+        return len(sales)
+    return setup, run
+
+
+def bench_record_sale(data):
+    def run(manager):
+        for sale in data["sales"]:
+            manager.record_sale(sale)
+        return len(data["sales"])
+    return SalesManager, run
+
+
+def bench_get_total_revenue(data):
+    calls = 100_000
+    
+    def run(manager):
+        get_total_revenue = manager.get_total_revenue
+        for _ in range(calls):
+            get_total_revenue()
+        return calls
+    return lambda: data["sales_manager"], run
+
+
+def bench_get_sales_by_date(data):
+    def run(manager):
+        for day in data["days"]:
+            manager.get_sales_by_date(day)
+        return len(data["days"])
+    return lambda: data["sales_manager"], run
+
+
+BENCHMARKS = {
+    "add_product": bench_add_product,
+    "get_product": bench_get_product,
+    "search_by_category": bench_search_by_category,
+    "add_item": bench_add_item,
+    "complete_sale": bench_complete_sale,
+    "record_sale": bench_record_sale,
+    "get_total_revenue": bench_get_total_revenue,
+    "get_sales_by_date": bench_get_sales_by_date,
+}
+
+
+def build_data(args):
+    """Generate every input up front so only the measured calls are timed"""
+    # Stock deep enough that repeated complete_sale runs never go negative
+    catalog = make_catalog(args.products, quantity=10**9, seed=args.seed)
+    products = ProductManager()
+    products.bulk_load(catalog)
+    sales = make_sales(catalog, args.days, args.sales_per_day, seed=args.seed)
+    sales_manager = SalesManager()
+    for sale in sales:
+        sales_manager.record_sale(sale)
+    sampler = ZipfSampler(args.products, seed=args.seed)
+    return {
+        "seed": args.seed,
+        "catalog": catalog,
+        "products": products,
+        "lookups": [product_id(index) for index in sampler.samples(args.lookups)],
+        "categories": sorted({product.category for product in catalog}),
+        "baskets": make_baskets(catalog, args.baskets, seed=args.seed),
+        "sales": sales,
+        "sales_manager": sales_manager,
+        "days": sorted({sale.timestamp.date() for sale in sales}),
+    }
+
+
+def get_parameters(args):
+    """Arguments that shape the workload, recorded so baselines are compared like for like"""
+    return {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "threshold", "only")}
+
+
+def measure(setup, run, repeat):
+    """Best-of-repeat time for run(setup()); setup is not timed"""
+    best, operations = None, 0
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        operations = run(state)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return {"operations": operations, "seconds": best, "us_per_op": best / operations * 10**6,
+            "ops_per_sec": operations / best if best else float("inf")}
+
+
+def compare(results, baseline, threshold):
+    """Get (name, baseline us/op, current us/op, relative change, regressed) rows"""
+    rows = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        change = result["us_per_op"] / previous["us_per_op"] - 1
+        rows.append((name, previous["us_per_op"], result["us_per_op"], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--baskets", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--sales-per-day", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run just these benchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved by an earlier --output run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default 0.10)")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    data = build_data(args)
+    print("\n" + "="*50)
+    print(f"CORE BENCHMARK ({args.products:,} products, {args.days * args.sales_per_day:,} sales)")
+    print("="*50)
+    print(f"Data generation: {time.perf_counter() - start:10.2f} s")
+    
+    results = {}
+    for name in args.only or BENCHMARKS:
+        setup, run = BENCHMARKS[name](data)
+        results[name] = measure(setup, run, args.repeat)
+        print(f"{name:<20} {results[name]['us_per_op']:12.3f} us/op {results[name]['ops_per_sec']:14,.0f} ops/s")
+    
+    if args.output:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": get_parameters(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Results written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if baseline.get("parameters") != get_parameters(args):
+            print("Warning: baseline was run with different parameters")
+        print("\n" + "-"*50)
+        print(f"{'benchmark':<20} {'baseline':>10} {'current':>10} {'change':>8}")
+        regressions = 0
+        for name, before, after, change, regressed in compare(results, baseline, args.threshold):
+            regressions += regressed
+            print(f"{name:<20} {before:10.3f} {after:10.3f} {change:+8.1%}{'  REGRESSION' if regressed else ''}")
+        if regressions:
+            print(f"{regressions} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Event Bus Benchmark
+Measures checkout cost with no bus, an unobserved bus and live subscribers
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from events import EventBus, SaleRecorded, StockChanged
+from product import ProductManager
+from sales import SalesManager
+from datagen import make_baskets, make_catalog
+
+
+def time_checkout(args, bus, subscribe=None):
+    """Time building, completing and recording a sale per basket on a managed catalog"""
+    catalog = make_catalog(args.products, quantity=10**9)
+    products = ProductManager(events=bus)
+    products.bulk_load(catalog)
+    sales = SalesManager(events=bus)
+    baskets = make_baskets(catalog, args.sales)
+    subscriptions = subscribe(bus) if subscribe else []
+    gc.collect()
+    start = time.perf_counter()
+    for basket in baskets:
+        sale = sales.create_sale()
+        for product, quantity in basket:
+            sale.add_item(product, quantity)
+        sale.complete_sale("card")
+        sales.record_sale(sale)
+    elapsed = time.perf_counter() - start
+    for subscription in subscriptions:
+        subscription.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--sales", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    cases = [
+        ("no bus", lambda: None, None),
+        ("unobserved bus", EventBus, None),
+        ("coalescing queue", EventBus,
+         lambda bus: [bus.subscribe(StockChanged, coalesce=True, maxsize=args.products)]),
+        ("sync handler", EventBus,
+         lambda bus: [bus.subscribe((StockChanged, SaleRecorded), lambda event: None)]),
+    ]
+    times = {name: [] for name, _, _ in cases}
+    # Interleave the cases so drift on the machine hits them alike
+    for _ in range(args.repeat):
+        for name, make_bus, subscribe in cases:
+            times[name].append(time_checkout(args, make_bus(), subscribe))
+    
+    print("\n" + "="*50)
+    print(f"EVENT BUS BENCHMARK ({args.sales:,} checkouts, {args.products:,} products)")
+    print("="*50)
+    baseline = min(times["no bus"])
+    for name, _, _ in cases:
+        best = min(times[name])
+        print(f"{name:<18} {best * 1000:10.1f} ms  ({best / baseline - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
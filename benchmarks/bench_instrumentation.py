@@ -0,0 +1,86 @@
+"""
+Instrumentation Overhead Benchmark
+Compares a checkout workload uninstrumented, with instrumentation disabled and enabled
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import ProductManager
+from sales import SalesManager
+from instrumentation import instrument_core
+from datagen import make_baskets, make_catalog
+
+
+def run_workload(catalog, baskets):
+    """Load the catalog, then build, complete and record a sale per basket"""
+    products = ProductManager()
+    for product in catalog:
+        products.add_product(product)
+    sales = SalesManager()
+    for basket in baskets:
+        sale = sales.create_sale()
+        for product, quantity in basket:
+            sale.add_item(products.get_product(product.product_id), quantity)
+        sale.complete_sale("card")
+        sales.record_sale(sale)
+    sales.get_total_revenue()
+
+
+def time_workload(args):
+    """Time one workload run, with fresh products and a collected heap"""
+    catalog = make_catalog(args.products, quantity=10**9)
+    baskets = make_baskets(catalog, args.sales)
+    gc.collect()
+    start = time.perf_counter()
+    run_workload(catalog, baskets)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--sales", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    instrumentation = instrument_core(slow_threshold_ms=1000)
+    before = [dict(vars(cls)) for cls in instrumentation.classes]
+    # Interleave the modes so drift on the machine hits all three alike
+    times = {"uninstrumented": [], "disabled": [], "enabled": []}
+    for _ in range(args.repeat):
+        times["uninstrumented"].append(time_workload(args))
+        instrumentation.enable()
+        try:
+            times["enabled"].append(time_workload(args))
+        finally:
+            instrumentation.disable()
+        times["disabled"].append(time_workload(args))
+    uninstrumented, disabled, enabled = (min(times[mode]) for mode in ("uninstrumented", "disabled", "enabled"))
+    
+    print("\n" + "="*50)
+    print(f"INSTRUMENTATION BENCHMARK ({args.products:,} products, {args.sales:,} sales)")
+    print("="*50)
+    print(f"Uninstrumented:  {uninstrumented * 1000:10.1f} ms")
+    print(f"Disabled:        {disabled * 1000:10.1f} ms  ({disabled / uninstrumented - 1:+.1%})")
+    print(f"Enabled:         {enabled * 1000:10.1f} ms  ({enabled / uninstrumented - 1:+.1%})")
+    # Disabling puts back the very same function objects, so the disabled
+    # path is the uninstrumented one; any difference above is timing noise
+    restored = all(vars(cls)[name] is func for cls, methods in zip(instrumentation.classes, before)
+                   for name, func in methods.items())
+    print(f"Disabled methods identical to originals: {'yes' if restored else 'NO'}")
+    calls = sum(row["calls"] for row in instrumentation.get_stats().values())
+    print(f"Instrumented calls per run: {calls // args.repeat:,}")
+    print(f"Cost per instrumented call: {(enabled - uninstrumented) / (calls / args.repeat) * 10**9:.0f} ns")
+    print()
+    print(instrumentation.get_report())
+
+
+if __name__ == "__main__":
+    main()
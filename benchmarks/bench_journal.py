@@ -0,0 +1,76 @@
+"""
+Journal Benchmark
+Measures journaled sale throughput per fsync policy and replay speed
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+from journal import SalesJournal
+
+
+def build_catalog(num_products):
+    """Build a manager with plenty of stock for every product"""
+    products = ProductManager()
+    for i in range(num_products):
+        products.add_product(Product(f"P{i:06d}", f"Item {i}", 1.00 + (i % 500) / 100, 10**9, "General"))
+    return products
+
+
+def run_sales(path, num_sales, items_per_sale, num_products, fsync_every):
+    """Record num_sales journaled sales; return (sales per second, fsyncs)"""
+    journal = SalesJournal(path, fsync_every=fsync_every)
+    products = build_catalog(num_products)
+    sales = SalesManager(journal=journal)
+    
+    start = time.perf_counter()
+    for n in range(num_sales):
+        sale = sales.create_sale()
+        for k in range(items_per_sale):
+            sale.add_item(products.get_product(f"P{(n * 7 + k * 131) % num_products:06d}"), 1)
+        sale.complete_sale("Cash")
+        sales.record_sale(sale)
+    journal.close()
+    return num_sales / (time.perf_counter() - start), journal.syncs
+
+
+def run_replay(path, num_products):
+    """Replay a journal into fresh managers; return (records per second, records)"""
+    journal = SalesJournal(path, fsync_interval=0)
+    products = build_catalog(num_products)
+    start = time.perf_counter()
+    count = journal.replay(products, SalesManager())
+    elapsed = time.perf_counter() - start
+    journal.close()
+    return count / elapsed, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sales", type=int, default=20_000)
+    parser.add_argument("--items-per-sale", type=int, default=5)
+    parser.add_argument("--products", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    print("\n" + "="*50)
+    print(f"JOURNAL BENCHMARK ({args.sales:,} sales)")
+    print("="*50)
+    with tempfile.TemporaryDirectory() as tmp:
+        for fsync_every in (1, 100, 1000):
+            path = os.path.join(tmp, f"sales-{fsync_every}.journal")
+            rate, syncs = run_sales(path, args.sales, args.items_per_sale, args.products, fsync_every)
+            print(f"fsync every {fsync_every:>4}:   {rate:10,.0f} sales/s  ({syncs:,} fsyncs)")
+        rate, count = run_replay(path, args.products)
+        print(f"Replay:             {rate:10,.0f} records/s  ({count:,} records)")
+
+
+if __name__ == "__main__":
+    main()
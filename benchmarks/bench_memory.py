@@ -0,0 +1,71 @@
+"""
+Memory Benchmark
+Compares live Sale objects against the columnar ArchivedSale form
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product
+from sales import Sale, LineItemColumns
+
+
+def build_catalog(num_products):
+    """Build a catalog with plenty of stock for every product"""
+    return [Product(f"P{i:06d}", f"Item {i}", 1.00 + (i % 500) / 100, 10**9, "General")
+            for i in range(num_products)]
+
+
+def build_sales(catalog, num_items, items_per_sale):
+    """Build completed sales totalling num_items line items"""
+    sales = []
+    for n in range(num_items // items_per_sale):
+        sale = Sale(f"SALE-{n:07d}")
+        for k in range(items_per_sale):
+            sale.add_item(catalog[(n * items_per_sale + k) % len(catalog)], 1 + k % 3)
+        sale.payment_method = "Cash"
+        sales.append(sale)
+    return sales
+
+
+def measure(build):
+    """Return (result, bytes allocated) for a build callable"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1_000_000, help="total line items")
+    parser.add_argument("--items-per-sale", type=int, default=5)
+    parser.add_argument("--products", type=int, default=10_000)
+    args = parser.parse_args()
+    
+    catalog = build_catalog(args.products)
+    
+    sales, live_bytes = measure(lambda: build_sales(catalog, args.items, args.items_per_sale))
+    
+    columns = LineItemColumns()
+    archived, archived_bytes = measure(lambda: [sale.archive(columns) for sale in sales])
+    
+    print("\n" + "="*50)
+    print(f"MEMORY BENCHMARK ({len(sales) * args.items_per_sale:,} line items)")
+    print("="*50)
+    print(f"Live Sale objects:     {live_bytes / 2**20:10.1f} MiB")
+    print(f"ArchivedSale columns:  {archived_bytes / 2**20:10.1f} MiB")
+    print(f"Reduction:             {live_bytes / archived_bytes:10.1f}x")
+    return len(archived)
+
+
+if __name__ == "__main__":
+    main()
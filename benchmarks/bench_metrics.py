@@ -0,0 +1,114 @@
+"""
+Live Sales Metrics Benchmark
+Measures ingest cost, memory and rolling-window query latency of LiveSalesMetrics
+against computing the same figures from the recorded sales
+"""
+
+import argparse
+import gc
+import heapq
+import os
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import LiveSalesMetrics
+from sales import SalesManager
+from datagen import make_catalog, make_sales
+
+
+def best_of(repeat, function):
+    """Best wall time of repeat calls, and the last result"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def scan_top_products(sales_manager, n, start, end):
+    units = {}
+    for sale in sales_manager.get_sales_between(start, end):
+        for item in sale.items:
+            units[item.product.product_id] = units.get(item.product.product_id, 0) + item.quantity
+    return heapq.nlargest(n, units.items(), key=lambda pair: pair[1])
+
+
+def scan_percentile(sales_manager, percent, start, end):
+    values = sorted(sale.total_cents for sale in sales_manager.get_sales_between(start, end))
+    return values[max(0, -(-len(values) * percent // 100) - 1)] / 100 if values else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--sales-per-day", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    sales = make_sales(make_catalog(args.products), args.days, args.sales_per_day)
+    manager = SalesManager()
+    for sale in sales:
+        manager.record_sale(sale)
+    
+    gc.collect()
+    metrics = LiveSalesMetrics()
+    start = time.perf_counter()
+    for sale in sales:
+        metrics.observe(sale)
+    ingest = time.perf_counter() - start
+    
+    # Fill a second instance under tracemalloc to show memory levels off
+    # once the horizon is full
+    tracemalloc.start()
+    traced = LiveSalesMetrics()
+    footprints = []
+    for day in range(args.days):
+        for sale in sales[day * args.sales_per_day:(day + 1) * args.sales_per_day]:
+            traced.observe(sale)
+        footprints.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+    del traced
+    
+    now = sales[-1].timestamp
+    quarter, hour, day = timedelta(minutes=15), timedelta(hours=1), timedelta(hours=24)
+    cases = [
+        ("revenue, last 15 min",
+         lambda: metrics.get_revenue(quarter, now),
+         lambda: sum(s.total_cents for s in manager.get_sales_between(now - quarter, now)) / 100),
+        ("top 20 SKUs, last hour",
+         lambda: metrics.get_top_products(20, hour, now),
+         lambda: scan_top_products(manager, 20, now - hour, now)),
+        ("top 20 SKUs, last 24 h",
+         lambda: metrics.get_top_products(20, day, now),
+         lambda: scan_top_products(manager, 20, now - day, now)),
+        ("p99 basket, last 24 h",
+         lambda: metrics.get_basket_value_percentile(99, day, now),
+         lambda: scan_percentile(manager, 99, now - day, now)),
+    ]
+    
+    print("\n" + "="*50)
+    print(f"LIVE METRICS BENCHMARK ({len(sales):,} sales over {args.days} days)")
+    print("="*50)
+    print(f"Ingest:  {ingest / len(sales) * 1e6:.2f} us per sale")
+    print("Memory after each day: " + ", ".join(f"{size / 2**20:.1f} MiB" for size in footprints))
+    for name, sketched, scanned in cases:
+        sketch_time, estimate = best_of(args.repeat, sketched)
+        scan_time, exact = best_of(args.repeat, scanned)
+        if isinstance(exact, list):
+            overlap = len({key for key, _ in estimate} & {key for key, _ in exact})
+            accuracy = f"{overlap}/{len(exact)} of exact top"
+        else:
+            accuracy = f"{estimate:.2f} vs {exact:.2f}"
+        print(f"{name:<24} {sketch_time * 1000:8.2f} ms  scan {scan_time * 1000:8.2f} ms  ({accuracy})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Money Arithmetic Benchmark
+Compares float, Decimal and integer-cent aggregation of sale totals
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product
+from sales import SalesManager
+
+
+def build_manager(num_sales, seed=7):
+    """Record num_sales single-line sales with random prices"""
+    rng = random.Random(seed)
+    manager = SalesManager()
+    for n in range(num_sales):
+        sale = manager.create_sale()
+        sale.add_item(Product(f"P{n}", "Item", rng.randrange(1, 5000) / 100, 10), rng.randrange(1, 4))
+        sale.apply_discount(rng.choice([0, 0, 5, 10]))
+        manager.record_sale(sale)
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sales", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    manager = build_manager(args.sales)
+    cents = [sale.total_cents for sale in manager.sales]
+    floats = [sale.total for sale in manager.sales]
+    decimals = [Decimal(c) / 100 for c in cents]
+    
+    cases = [
+        ("float sum + round", lambda: round(sum(floats), 2)),
+        ("Decimal sum", lambda: sum(decimals, Decimal(0))),
+        ("integer cents sum", lambda: sum(cents) / 100),
+        ("get_total_revenue (running)", manager.get_total_revenue),
+    ]
+    
+    print("\n" + "="*50)
+    print(f"MONEY BENCHMARK ({args.sales:,} sale totals)")
+    print("="*50)
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:<30} {best * 1000:10.3f} ms")
+    print(f"Float drift vs exact cents:    {abs(sum(floats) - sum(cents) / 100):.2e}")
+
+
+if __name__ == "__main__":
+    main()
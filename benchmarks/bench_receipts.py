@@ -0,0 +1,97 @@
+"""
+Receipt Benchmark
+Compares the precompiled ReceiptRenderer with the original concatenating receipt builder
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product
+from sales import Sale
+from receipts import ReceiptRenderer, HTML_TEMPLATE, ESCPOS_TEMPLATE
+
+
+def legacy_receipt(sale):
+    """The original Sale.get_receipt, kept as the baseline"""
+    receipt = f"\n{'='*50}\n"
+    receipt += f"{'SUPERMARKET RECEIPT':^50}\n"
+    receipt += f"{'='*50}\n"
+    receipt += f"Sale ID: {sale.sale_id}\n"
+    receipt += f"Date: {sale.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
+    receipt += f"{'-'*50}\n"
+    
+    for item in sale.items:
+        receipt += f"{item}\n"
+    
+    receipt += f"{'-'*50}\n"
+    
+    if sale.discount_applied > 0:
+        receipt += f"Discount: -${sale.discount_applied:.2f}\n"
+    
+    receipt += f"Total: ${sale.total:.2f}\n"
+    receipt += f"Payment Method: {sale.payment_method}\n"
+    receipt += f"{'='*50}\n"
+    receipt += f"{'Thank you for shopping with us!':^50}\n"
+    receipt += f"{'='*50}\n"
+    
+    return receipt
+
+
+def build_sales(num_sales, items_per_sale, num_products=1000):
+    """Build completed sales, every fifth one discounted"""
+    catalog = [Product(f"P{i:06d}", f"Item {i}", 1.00 + (i % 500) / 100, 10**9, "General")
+               for i in range(num_products)]
+    sales = []
+    for n in range(num_sales):
+        sale = Sale(f"SALE-{n:07d}")
+        for k in range(items_per_sale):
+            sale.add_item(catalog[(n * 7 + k * 131) % num_products], 1 + k % 3)
+        if n % 5 == 0:
+            sale.apply_discount(10)
+        sale.complete_sale("Cash")
+        sales.append(sale)
+    return sales
+
+
+def timed(run):
+    """Return seconds taken by run()"""
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--items-per-sale", type=int, default=8)
+    args = parser.parse_args()
+    
+    sales = build_sales(args.sales, args.items_per_sale)
+    assert all(legacy_receipt(sale) == sale.get_receipt() for sale in sales[:100])
+    
+    def legacy_batch():
+        sink = io.StringIO()
+        for sale in sales:
+            sink.write(legacy_receipt(sale))
+    
+    legacy_seconds = timed(legacy_batch)
+    results = [("Text renderer", timed(lambda: ReceiptRenderer().write_batch(sales, io.StringIO()))),
+               ("HTML renderer", timed(lambda: ReceiptRenderer(HTML_TEMPLATE).write_batch(sales, io.StringIO()))),
+               ("ESC/POS renderer", timed(lambda: ReceiptRenderer(ESCPOS_TEMPLATE).write_batch(sales, io.StringIO())))]
+    
+    print("\n" + "="*50)
+    print(f"RECEIPT BENCHMARK ({args.sales:,} sales x {args.items_per_sale} items)")
+    print("="*50)
+    print(f"Original get_receipt:  {args.sales / legacy_seconds:10,.0f} receipts/s")
+    for label, seconds in results:
+        print(f"{label + ':':<22} {args.sales / seconds:10,.0f} receipts/s  ({legacy_seconds / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Reorder Monitor Benchmark
+Compares per-category low-stock rescans with the incrementally maintained reorder heap
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import ProductManager
+from reorder import ReorderMonitor
+from sales import SalesManager
+from datagen import make_baskets, make_catalog
+
+
+def build(args):
+    """A catalog with scattered stock levels and a reorder point per category"""
+    rng = random.Random(5)
+    catalog = make_catalog(args.products)
+    for product in catalog:
+        product.quantity = rng.randint(0, 500)
+    products = ProductManager()
+    products.bulk_load(catalog)
+    points = {category: rng.randint(5, 30) for category in sorted({p.category for p in catalog})}
+    return catalog, products, points
+
+
+def rescan(products, points):
+    """What needs reordering, the old way: a low-stock query per category threshold"""
+    flagged = []
+    for category, point in points.items():
+        flagged.extend(p for p in products.get_low_stock_products(point + 1) if p.category == category)
+    return flagged
+
+
+def start_monitor(products, sales, points):
+    monitor = ReorderMonitor(products, sales)
+    for category, point in points.items():
+        monitor.set_category_reorder_point(category, point)
+    return monitor
+
+
+def time_checkout(args, catalog, sales):
+    baskets = make_baskets(catalog, args.sales)
+    gc.collect()
+    start = time.perf_counter()
+    for basket in baskets:
+        sale = sales.create_sale()
+        for product, quantity in basket:
+            sale.add_item(product, min(quantity, product.quantity))
+        sale.complete_sale("card")
+        sales.record_sale(sale)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--sales", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+    
+    catalog, products, points = build(args)
+    start = time.perf_counter()
+    monitor = start_monitor(products, SalesManager(), points)
+    setup = time.perf_counter() - start
+    
+    expected = {p.product_id for p in rescan(products, points)}
+    assert {p.product_id for p in monitor.get_flagged()} == expected
+    
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        rescan(products, points)
+    rescan_time = (time.perf_counter() - start) / args.queries
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        monitor.get_flagged()
+    heap_time = (time.perf_counter() - start) / args.queries
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        monitor.get_suggestions()
+    suggestion_time = (time.perf_counter() - start) / args.queries
+    
+    monitor.close()
+    plain = time_checkout(args, catalog, SalesManager())
+    sales = SalesManager()
+    monitor = start_monitor(products, sales, points)
+    watched = time_checkout(args, catalog, sales)
+    assert {p.product_id for p in monitor.get_flagged()} == {p.product_id for p in rescan(products, points)}
+    
+    print("\n" + "="*50)
+    print(f"REORDER MONITOR BENCHMARK ({args.products:,} products, {len(points)} categories)")
+    print("="*50)
+    print(f"Flagged SKUs:               {len(expected):,}")
+    print(f"Monitor setup:              {setup * 1000:10.2f} ms")
+    print(f"Per-category rescan:        {rescan_time * 1000:10.2f} ms")
+    print(f"Monitor get_flagged:        {heap_time * 1000:10.2f} ms")
+    print(f"Monitor get_suggestions:    {suggestion_time * 1000:10.2f} ms")
+    print(f"Checkout, no monitor:       {plain * 1000:10.1f} ms")
+    print(f"Checkout, monitored:        {watched * 1000:10.1f} ms  ({watched / plain - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+End-of-Day Reporting Benchmark
+Compares the consolidated close-of-day report flattening every sale per run against
+columns that follow record_sale, in-process and on 2 to N worker processes
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analytics import SalesColumns
+from product import ProductManager
+from reporting import build_end_of_day_report
+from sales import SalesManager
+from datagen import make_catalog, make_sales
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--sales-per-day", type=int, default=50_000)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    catalog = make_catalog(args.products, quantity=10**6)
+    products = ProductManager()
+    products.bulk_load(catalog)
+    day_sales = make_sales(catalog, args.days, args.sales_per_day)
+    
+    # Record the same sales with and without columns following record_sale
+    plain = SalesManager()
+    start = time.perf_counter()
+    for sale in day_sales:
+        plain.record_sale(sale)
+    record_plain = time.perf_counter() - start
+    sales = SalesManager()
+    columns = SalesColumns.from_manager(sales, products, follow=True)
+    start = time.perf_counter()
+    for sale in day_sales:
+        sales.record_sale(sale)
+    record_followed = time.perf_counter() - start
+    
+    print("\n" + "="*50)
+    print(f"REPORTING BENCHMARK ({len(columns):,} sales, {args.products:,} products, {os.cpu_count()} CPUs)")
+    print("="*50)
+    print(f"Record sales:                 {record_plain:8.2f} s")
+    print(f"Record sales, columns follow: {record_followed:8.2f} s  (+{record_followed - record_plain:.2f} s)")
+    flattening = best_time(lambda: build_end_of_day_report(sales, products, workers=1, chunk_size=args.chunk_size),
+                           args.repeat)
+    print(f"{'flatten + in-process':<24} {flattening:8.2f} s")
+    serial = best_time(lambda: build_end_of_day_report(sales, products, workers=1, chunk_size=args.chunk_size,
+                                                       sales_columns=columns), args.repeat)
+    print(f"{'in-process':<24} {serial:8.2f} s  speedup {flattening / serial:5.2f}x")
+    workers = 2
+    while workers <= args.max_workers:
+        elapsed = best_time(lambda: build_end_of_day_report(sales, products, workers=workers,
+                                                            chunk_size=args.chunk_size, sales_columns=columns),
+                            args.repeat)
+        print(f"{f'{workers} workers':<24} {elapsed:8.2f} s  speedup {flattening / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Search Benchmark
+Measures search index build time and top-K query latency on a large catalog
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import ProductManager
+from datagen import ADJECTIVES, BRANDS, NOUNS, make_catalog
+
+
+def build_queries(num_queries, seed=5):
+    """Mix word, prefix, multi-word and typo queries"""
+    rng = random.Random(seed)
+    queries = []
+    for n in range(num_queries):
+        noun = rng.choice(NOUNS)
+        kind = n % 4
+        if kind == 0:
+            queries.append(noun)
+        elif kind == 1:
+            queries.append(noun[:rng.randint(2, max(2, len(noun) - 1))])
+        elif kind == 2:
+            queries.append(f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES).split()[0]} {noun[:3]}")
+        else:
+            position = rng.randrange(len(noun))
+            queries.append(noun[:position] + noun[position + 1:])
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=10, help="top-K results per query")
+    args = parser.parse_args()
+    
+    manager = ProductManager()
+    manager.bulk_load(make_catalog(args.products))
+    
+    started = time.perf_counter()
+    manager.search("warm up")
+    build_seconds = time.perf_counter() - started
+    
+    latencies = []
+    for query in build_queries(args.queries):
+        started = time.perf_counter()
+        manager.search(query, args.limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    
+    print("\n" + "="*50)
+    print(f"SEARCH BENCHMARK ({args.products:,} products, top {args.limit})")
+    print("="*50)
+    print(f"Index build:   {build_seconds:8.2f} s")
+    print(f"Query p50:     {latencies[len(latencies) // 2]:8.3f} ms")
+    print(f"Query p99:     {latencies[int(len(latencies) * 0.99)]:8.3f} ms")
+    print(f"Query max:     {latencies[-1]:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
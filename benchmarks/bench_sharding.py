@@ -0,0 +1,71 @@
+"""
+Sharded Inventory Benchmark
+Measures batched lookup, stock update and scatter-gather throughput across 1 to N worker processes
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sharding import ShardedInventory
+from datagen import ZipfSampler, make_catalog, product_id
+
+
+def run_shards(num_shards, catalog, batches, args):
+    """Load the catalog into num_shards workers and time each workload"""
+    with ShardedInventory(num_shards) as inventory:
+        start = time.perf_counter()
+        inventory.bulk_load(catalog)
+        load = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for batch in batches:
+            inventory.get_products(batch)
+        lookups = time.perf_counter() - start
+        
+        rng = random.Random(5)
+        start = time.perf_counter()
+        for batch in batches:
+            inventory.update_stock_many({key: rng.choice((-1, 1)) for key in batch})
+        updates = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(args.reports):
+            inventory.get_total_inventory_value()
+            inventory.get_low_stock_products(threshold=5)
+        reports = time.perf_counter() - start
+    operations = args.batches * args.batch_size
+    return load, operations / lookups, operations / updates, reports / args.reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--reports", type=int, default=5)
+    args = parser.parse_args()
+    
+    catalog = make_catalog(args.products, quantity=50)
+    sampler = ZipfSampler(args.products)
+    batches = [[product_id(index) for index in sampler.samples(args.batch_size)] for _ in range(args.batches)]
+    
+    print("\n" + "="*50)
+    print(f"SHARDING BENCHMARK ({args.products:,} products, batches of {args.batch_size:,}, "
+          f"{os.cpu_count()} CPUs)")
+    print("="*50)
+    print(f"{'shards':>6} {'load s':>8} {'lookups/s':>12} {'updates/s':>12} {'report ms':>10}")
+    shard_counts = sorted({1, 2, 4, 8, args.max_shards} & set(range(1, args.max_shards + 1)))
+    for num_shards in shard_counts:
+        load, lookups, updates, report = run_shards(num_shards, catalog, batches, args)
+        print(f"{num_shards:>6} {load:8.2f} {lookups:12,.0f} {updates:12,.0f} {report * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Storage Benchmark
+Measures sustained completed-sale throughput and cold start on SQLiteStorage
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+from storage import SQLiteStorage
+
+
+def populate(path, num_products):
+    """Create a database holding num_products products"""
+    storage = SQLiteStorage(path, batch_size=10_000)
+    products = ProductManager(storage)
+    for i in range(num_products):
+        products.add_product(Product(f"P{i:06d}", f"Item {i}", 1.00 + (i % 500) / 100, 10**9, f"Cat{i % 50}"))
+    storage.close()
+
+
+def run_sales(path, num_sales, items_per_sale, num_products, batch_size):
+    """Complete and record num_sales sales; return sales per second"""
+    storage = SQLiteStorage(path, batch_size=batch_size)
+    products = ProductManager(storage)
+    sales = SalesManager(storage=storage)
+    
+    start = time.perf_counter()
+    for n in range(num_sales):
+        sale = sales.create_sale()
+        for k in range(items_per_sale):
+            sale.add_item(products.get_product(f"P{(n * 7 + k * 131) % num_products:06d}"), 1)
+        sale.complete_sale("Cash")
+        sales.record_sale(sale)
+    storage.close()
+    return num_sales / (time.perf_counter() - start)
+
+
+def cold_start(path):
+    """Return seconds to open the store and serve one product lookup"""
+    start = time.perf_counter()
+    storage = SQLiteStorage(path)
+    ProductManager(storage).get_product("P000000")
+    elapsed = time.perf_counter() - start
+    storage.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--sales", type=int, default=50_000)
+    parser.add_argument("--items-per-sale", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        populate(path, args.products)
+        startup = cold_start(path)
+        rate = run_sales(path, args.sales, args.items_per_sale, args.products, args.batch_size)
+    
+    print("\n" + "="*50)
+    print("STORAGE BENCHMARK (SQLite, WAL, group commit)")
+    print("="*50)
+    print(f"Cold start + first lookup ({args.products:,} products): {startup * 1000:.1f} ms")
+    print(f"Completed sales/second ({args.items_per_sale} items each): {rate:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
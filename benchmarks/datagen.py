@@ -0,0 +1,102 @@
+"""
+Benchmark Data Generators
+Reproducible synthetic catalogs, Zipf-distributed baskets and multi-day sale streams
+"""
+
+import bisect
+import itertools
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product
+from sales import Sale
+
+
+BRANDS = ["Acme", "Hearty", "Golden", "Valley", "Northern", "Farmhouse", "Sunrise", "Coastal", "Orchard", "Prairie",
+          "Alpine", "Harvest", "Meadow", "Riverside", "Summit", "Village", "Urban", "Classic", "Select", "Premium"]
+ADJECTIVES = ["organic", "smoked", "roasted", "fresh", "frozen", "sparkling", "salted", "unsalted", "spicy", "sweet",
+              "wholegrain", "lowfat", "creamy", "crunchy", "mild", "mature", "free range", "vegan", "honey", "garlic"]
+NOUNS = ["milk", "cheese", "yogurt", "butter", "bread", "bagels", "cereal", "granola", "coffee", "tea", "juice",
+         "water", "cola", "chips", "crackers", "cookies", "chocolate", "almonds", "peanuts", "pasta", "rice",
+         "noodles", "soup", "beans", "tomatoes", "salsa", "ketchup", "mustard", "mayonnaise", "olives", "tuna",
+         "salmon", "chicken", "sausages", "bacon", "ham", "eggs", "apples", "bananas", "grapes", "lettuce",
+         "spinach", "carrots", "onions", "potatoes", "shampoo", "toothpaste", "detergent", "sponges", "napkins"]
+SIZES = ["100g", "250g", "500g", "1kg", "330ml", "500ml", "1L", "2L", "6 pack", "12 pack"]
+
+PAYMENT_METHODS = ["card", "cash", "mobile"]
+
+
+def product_id(index):
+    """ID of the index-th generated product"""
+    return f"P{index:07d}"
+
+
+def make_catalog(num_products, quantity=100, seed=3):
+    """Generate num_products grocery-style products, one category per noun"""
+    rng = random.Random(seed)
+    return [Product(product_id(i), f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(SIZES)}",
+                    1.00 + i % 500 / 100, quantity, rng.choice(NOUNS).title())
+            for i in range(num_products)]
+
+
+class ZipfSampler:
+    """Draws indexes below size with Zipf-distributed popularity
+    
+    The most popular indexes are spread over the range by a seeded shuffle,
+    so popularity does not follow catalog order.
+    """
+    
+    def __init__(self, size, exponent=1.1, seed=11):
+        self._rng = random.Random(seed)
+        self._cumulative = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+        self._ranked = list(range(size))
+        self._rng.shuffle(self._ranked)
+    
+    def sample(self):
+        """Draw one index"""
+        position = bisect.bisect_left(self._cumulative, self._rng.random() * self._cumulative[-1])
+        return self._ranked[position]
+    
+    def samples(self, count):
+        """Draw count indexes"""
+        return [self.sample() for _ in range(count)]
+
+
+def make_baskets(products, num_baskets, mean_items=8, exponent=1.1, seed=13):
+    """Generate num_baskets lists of (product, quantity) with Zipf-popular products"""
+    rng = random.Random(seed)
+    sampler = ZipfSampler(len(products), exponent, seed)
+    baskets = []
+    for _ in range(num_baskets):
+        size = 1 + int(rng.expovariate(1 / max(mean_items - 1, 1e-9)))
+        baskets.append([(products[sampler.sample()], rng.choice((1, 1, 1, 2, 2, 3))) for _ in range(size)])
+    return baskets
+
+
+def make_sales(products, num_days, sales_per_day, start=date(2024, 1, 1), mean_items=8, seed=17):
+    """Generate completed sales spread over num_days trading days, in time order
+    
+    Sales fall between 08:00 and 22:00; about one in ten gets a 5 or 10 %
+    discount. Stock is not touched, so the products can be reused freely.
+    """
+    rng = random.Random(seed)
+    baskets = make_baskets(products, num_days * sales_per_day, mean_items, seed=seed)
+    sales = []
+    for day in range(num_days):
+        opening = datetime.combine(start + timedelta(days=day), datetime.min.time()) + timedelta(hours=8)
+        offsets = sorted(rng.randrange(14 * 3600 * 10**6) for _ in range(sales_per_day))
+        for offset in offsets:
+            sale = Sale(f"SALE-{len(sales) + 1:08d}")
+            for product, quantity in baskets[len(sales)]:
+                sale.add_item(product, quantity)
+            if rng.random() < 0.1:
+                sale.apply_discount(rng.choice((5, 10)))
+            sale.payment_method = rng.choice(PAYMENT_METHODS)
+            sale.timestamp = opening + timedelta(microseconds=offset)
+            sales.append(sale)
+    return sales
@@ -0,0 +1,389 @@
+"""
+Sales Analytics Module
+Column-oriented sales analytics, vectorized with NumPy when it is installed
+"""
+
+import functools
+import heapq
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+from events import EventBus, SaleRecorded
+from sales import Sale
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python backend is used instead
+    np = None
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_HOUR = 3600 * 10**6
+_DAY = 24 * _HOUR
+
+UNKNOWN_CATEGORY = "Unknown"
+
+
+class _Codes:
+    """Assigns dense integer codes to values in first-seen order"""
+    
+    def __init__(self):
+        self.values = []
+        self._positions = {}
+    
+    def get_code(self, value):
+        code = self._positions.get(value)
+        if code is None:
+            code = self._positions[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class SalesColumns:
+    """Flat per-sale and per-line-item arrays built from recorded sales
+    
+    Columns that follow a SalesManager append each sale it records; lock
+    is held while they do, so readers can take a consistent cut.
+    """
+    
+    def __init__(self):
+        # One entry per sale
+        self.timestamps = array("q")
+        self.total_cents = array("q")
+        self.discount_cents = array("q")
+        self.payment_codes = array("i")
+        # One entry per line item; item_sales holds the position of the owning sale
+        self.item_sales = array("i")
+        self.item_products = array("i")
+        self.quantities = array("i")
+        self.unit_prices = array("q")
+        self.payment_methods = _Codes()
+        self.products = _Codes()
+        self.categories = _Codes()
+        # Category code of each product, indexed by product code
+        self.product_categories = array("i")
+        self.lock = threading.Lock()
+        self._subscription = None
+        # Sequence of the last recorded sale included when the columns were built
+        self._followed_from = 0
+    
+    def __len__(self):
+        return len(self.total_cents)
+    
+    def _get_product_code(self, product_id, category):
+        code = self.products.get_code(product_id)
+        if code == len(self.product_categories):
+            self.product_categories.append(self.categories.get_code(category))
+        return code
+    
+    def _add_header(self, timestamp_micros, total_cents, discount_cents, payment_method):
+        self.timestamps.append(timestamp_micros)
+        self.total_cents.append(total_cents)
+        self.discount_cents.append(discount_cents)
+        self.payment_codes.append(self.payment_methods.get_code(payment_method))
+        return len(self.total_cents) - 1
+    
+    def add_sale(self, sale, category_of=None):
+        """Append a Sale or ArchivedSale
+        
+        category_of maps a product ID to its category for line items that
+        carry no Product object; it defaults to UNKNOWN_CATEGORY.
+        """
+        position = self._add_header((sale.timestamp - _EPOCH) // _MICROSECOND, sale.total_cents,
+                                    sale.discount_cents, sale.payment_method)
+        if isinstance(sale, Sale):
+            rows = ((item.product.product_id, item.product.category, item.quantity, item.product.price_cents)
+                    for item in sale.items)
+        else:
+            columns = sale.columns
+            rows = ((product_id, category_of(product_id) if category_of else UNKNOWN_CATEGORY, quantity, cents)
+                    for product_id, quantity, cents in
+                    ((columns.product_ids[columns.product_indexes[i]], columns.quantities[i], columns.unit_prices[i])
+                     for i in range(sale.start, sale.start + sale.count)))
+        for product_id, category, quantity, price_cents in rows:
+            self.item_sales.append(position)
+            self.item_products.append(self._get_product_code(product_id, category))
+            self.quantities.append(quantity)
+            self.unit_prices.append(price_cents)
+    
+    def add_archived_day(self, day, category_of=None):
+        """Append every sale of an ArchivedDay straight from its mapped columns"""
+        first = len(self.total_cents)
+        self.timestamps.extend(day.timestamps)
+        self.total_cents.extend(day.total_cents)
+        self.discount_cents.extend(day.discount_cents)
+        payment_codes = [self.payment_methods.get_code(method) for method in day.payment_methods]
+        self.payment_codes.extend(payment_codes[code] for code in day.payment_codes)
+        product_codes = [self._get_product_code(product_id, category_of(product_id) if category_of else UNKNOWN_CATEGORY)
+                         for product_id in day.product_ids]
+        self.item_products.extend(product_codes[index] for index in day.product_indexes)
+        self.quantities.extend(day.quantities)
+        self.unit_prices.extend(day.unit_prices)
+        starts = day.item_starts
+        for index in range(len(day)):
+            self.item_sales.extend([first + index] * (starts[index + 1] - starts[index]))
+    
+    @classmethod
+    def from_manager(cls, sales_manager, product_manager=None, follow=False):
+        """Build columns over a SalesManager's live and archived sales
+        
+        product_manager supplies categories for archived line items. With
+        follow, sales the manager records from now on are appended as they
+        are recorded, through its EventBus (one is attached if it has none),
+        so reports reuse the columns instead of flattening every sale again.
+        """
+        category_of = _category_lookup(product_manager) if product_manager is not None else None
+        columns = cls()
+        if not follow:
+            columns._add_history(sales_manager, category_of)
+            return columns
+        if sales_manager.events is None:
+            sales_manager.events = EventBus()
+        # Copy and subscribe under both locks: no sale is recorded between
+        # the two, and none is appended while the copy is being made
+        with sales_manager._lock, columns.lock:
+            columns._subscription = sales_manager.events.subscribe(
+                SaleRecorded, lambda event: columns._on_sale_recorded(event, category_of))
+            columns._add_history(sales_manager, category_of)
+            columns._followed_from = sales_manager._totals.count
+        return columns
+    
+    def _add_history(self, sales_manager, category_of):
+        """Append a SalesManager's archived and in-memory sales"""
+        archive = sales_manager.sales_archive
+        if archive is not None:
+            for day in archive.get_days():
+                self.add_archived_day(archive.get_day(day), category_of)
+        for sale in sales_manager.sales:
+            self.add_sale(sale, category_of)
+    
+    def _on_sale_recorded(self, event, category_of):
+        with self.lock:
+            # Sales recorded before the copy may still be publishing
+            if event.sequence is None or event.sequence > self._followed_from:
+                self.add_sale(event.sale, category_of)
+    
+    def close(self):
+        """Stop following recorded sales"""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+
+
+def _category_lookup(product_manager):
+    """Map product IDs to categories through a ProductManager"""
+    def category_of(product_id):
+        product = product_manager.get_product(product_id)
+        return product.category if product is not None else UNKNOWN_CATEGORY
+    return category_of
+
+
+def _holding_columns_lock(query):
+    """Run an analytics query under its columns' lock, so following columns cannot grow under it"""
+    @functools.wraps(query)
+    def locked(self, *args, **kwargs):
+        with self.columns.lock:
+            return query(self, *args, **kwargs)
+    return locked
+
+
+def _to_list(values):
+    return values.tolist() if np is not None and isinstance(values, np.ndarray) else values
+
+
+def _to_dollars(cents_by_key):
+    return {key: cents / 100 for key, cents in cents_by_key.items()}
+
+
+class SalesAnalytics:
+    """Revenue, product and basket analytics over SalesColumns
+    
+    The "numpy" backend works on zero-copy views of the column arrays; the
+    "python" backend gives the same answers with plain loops. Line-item
+    revenue (category and product figures) is gross, before sale discounts.
+    """
+    
+    def __init__(self, columns, backend=None):
+        if backend is None:
+            backend = "numpy" if np is not None else "python"
+        if backend == "numpy" and np is None:
+            raise ValueError("The numpy backend needs NumPy installed")
+        if backend not in ("numpy", "python"):
+            raise ValueError(f"Unknown analytics backend: {backend}")
+        self.columns = columns
+        self.backend = backend
+    
+    def _np(self, name):
+        """Get a zero-copy NumPy view of a column
+        
+        Views are not cached: an array exporting its buffer cannot grow, and
+        the columns may still be appended to between queries, which hold
+        columns.lock while views exist. The dtype is
+        named by size because typecode "q" maps to longlong, which misses
+        the fast int64 loops of np.add.at.
+        """
+        column = getattr(self.columns, name)
+        return np.frombuffer(column, dtype=f"i{column.itemsize}")
+    
+    def _line_revenue(self):
+        """Gross revenue of each line item in cents"""
+        if self.backend == "numpy":
+            return self._np("quantities").astype(np.int64) * self._np("unit_prices")
+        return [quantity * cents for quantity, cents in zip(self.columns.quantities, self.columns.unit_prices)]
+    
+    def _sum_by_code(self, codes, weights, size):
+        """Sum integer weights into size buckets by code
+        
+        The numpy backend accumulates into an int64 array, so cent totals
+        stay exact instead of passing through bincount's float weights.
+        """
+        if self.backend == "numpy":
+            sums = np.zeros(size, dtype=np.int64)
+            np.add.at(sums, codes, np.asarray(weights, dtype=np.int64))
+            return sums
+        sums = [0] * size
+        for code, weight in zip(codes, weights):
+            sums[code] += weight
+        return sums
+    
+    @_holding_columns_lock
+    def get_revenue_by_day(self):
+        """Get net revenue per date"""
+        columns = self.columns
+        if self.backend == "numpy":
+            if not len(columns):
+                return {}
+            offsets = self._np("timestamps") // _DAY
+            first = int(offsets.min())
+            offsets -= first
+            span = int(offsets.max()) + 1
+            present = np.zeros(span, dtype=bool)
+            present[offsets] = True
+            days = np.flatnonzero(present)
+            sums = self._sum_by_code(offsets, self._np("total_cents"), span)[days].tolist()
+            days = (days + first).tolist()
+        else:
+            by_day = {}
+            for micros, cents in zip(columns.timestamps, columns.total_cents):
+                day = micros // _DAY
+                by_day[day] = by_day.get(day, 0) + cents
+            days = sorted(by_day)
+            sums = [by_day[day] for day in days]
+        return {(_EPOCH + timedelta(days=day)).date(): cents / 100 for day, cents in zip(days, sums)}
+    
+    @_holding_columns_lock
+    def get_revenue_by_hour(self):
+        """Get net revenue in each hour of the day as a 24-item list"""
+        if self.backend == "numpy":
+            hours = self._np("timestamps") // _HOUR % 24
+            cents = self._sum_by_code(hours, self._np("total_cents"), 24).tolist()
+        else:
+            cents = self._sum_by_code((micros // _HOUR % 24 for micros in self.columns.timestamps),
+                                      self.columns.total_cents, 24)
+        return [value / 100 for value in cents]
+    
+    @_holding_columns_lock
+    def get_revenue_by_payment_method(self):
+        """Get net revenue per payment method"""
+        columns = self.columns
+        codes = self._np("payment_codes") if self.backend == "numpy" else columns.payment_codes
+        weights = self._np("total_cents") if self.backend == "numpy" else columns.total_cents
+        cents = _to_list(self._sum_by_code(codes, weights, len(columns.payment_methods.values)))
+        return _to_dollars(dict(zip(columns.payment_methods.values, cents)))
+    
+    @_holding_columns_lock
+    def get_revenue_by_category(self):
+        """Get gross line-item revenue per product category"""
+        columns = self.columns
+        # Total by product first, then fold the much shorter product totals into categories
+        if self.backend == "numpy":
+            products, categories = self._np("item_products"), self._np("product_categories")
+        else:
+            products, categories = columns.item_products, columns.product_categories
+        product_cents = self._sum_by_code(products, self._line_revenue(), len(columns.products.values))
+        cents = _to_list(self._sum_by_code(categories, product_cents, len(columns.categories.values)))
+        return _to_dollars(dict(zip(columns.categories.values, cents)))
+    
+    @_holding_columns_lock
+    def get_top_products(self, n=10, by="units"):
+        """Get the top n (product_id, units or gross revenue) pairs, best first"""
+        columns = self.columns
+        if by == "units":
+            weights = self._np("quantities") if self.backend == "numpy" else columns.quantities
+        elif by == "revenue":
+            weights = self._line_revenue()
+        else:
+            raise ValueError("by must be 'units' or 'revenue'")
+        codes = self._np("item_products") if self.backend == "numpy" else columns.item_products
+        totals = self._sum_by_code(codes, weights, len(columns.products.values))
+        # Ties go to the product seen first, on both backends
+        if self.backend == "numpy":
+            ranked = self._rank_top(totals, n)
+            totals = totals.tolist()
+        else:
+            ranked = heapq.nsmallest(n, range(len(totals)), key=lambda code: -totals[code])
+        return [(columns.products.values[code], totals[code] / 100 if by == "revenue" else totals[code])
+                for code in ranked]
+    
+    @staticmethod
+    def _rank_top(totals, n):
+        """Codes of the n largest totals, best first, lowest code first among ties"""
+        n = min(max(n, 0), len(totals))
+        if not n:
+            return []
+        # Partition to the n largest, widened to every code tied with the
+        # smallest of them, then sort just those stably
+        candidates = np.argpartition(-totals, n - 1)[:n]
+        candidates = np.flatnonzero(totals >= totals[candidates].min())
+        return candidates[np.argsort(-totals[candidates], kind="stable")[:n]].tolist()
+    
+    @_holding_columns_lock
+    def get_basket_size_histogram(self):
+        """Get {units in basket: number of sales}"""
+        columns = self.columns
+        if self.backend == "numpy":
+            counts = np.bincount(self._sum_by_code(self._np("item_sales"), self._np("quantities"), len(columns)))
+            values = np.flatnonzero(counts)
+            return dict(zip(values.tolist(), counts[values].tolist()))
+        sizes = self._sum_by_code(columns.item_sales, columns.quantities, len(columns))
+        histogram = {}
+        for size in sizes:
+            histogram[size] = histogram.get(size, 0) + 1
+        return dict(sorted(histogram.items()))
+    
+    @_holding_columns_lock
+    def get_discount_impact(self):
+        """Compare discounted and full-price sales
+        
+        Returns the number of discounted sales, the discount given, the share
+        of gross revenue it represents, and the average net sale value with
+        and without a discount.
+        """
+        columns = self.columns
+        if self.backend == "numpy":
+            discounts = self._np("discount_cents")
+            totals = self._np("total_cents")
+            mask = discounts > 0
+            discounted = int(mask.sum())
+            discount_cents = int(discounts.sum())
+            discounted_revenue = int(totals[mask].sum())
+            revenue = int(totals.sum())
+        else:
+            discounted = discount_cents = discounted_revenue = revenue = 0
+            for total, discount in zip(columns.total_cents, columns.discount_cents):
+                revenue += total
+                if discount > 0:
+                    discounted += 1
+                    discount_cents += discount
+                    discounted_revenue += total
+        full_price = len(columns) - discounted
+        gross = revenue + discount_cents
+        return {
+            "discounted_sales": discounted,
+            "discount_total": discount_cents / 100,
+            "discount_share": discount_cents / gross if gross else 0,
+            "average_discounted_sale": discounted_revenue / discounted / 100 if discounted else 0,
+            "average_full_price_sale": (revenue - discounted_revenue) / full_price / 100 if full_price else 0,
+        }
@@ -0,0 +1,158 @@
+"""
+Async Sales Module
+Asyncio facade over SalesManager with batched, backpressured persistence
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sales import SalesManager
+
+
+class AsyncSaleSink:
+    """Base async persistence hook; receives recorded sales in batches"""
+    
+    async def write_sales(self, sales):
+        """Persist a batch of recorded sales"""
+    
+    async def close(self):
+        """Release resources"""
+
+
+class StorageSink(AsyncSaleSink):
+    """Adapts a synchronous Storage backend with one executor hop per batch"""
+    
+    def __init__(self, storage, executor=None):
+        self.storage = storage
+        self.executor = executor
+    
+    def _write(self, sales):
+        for sale in sales:
+            self.storage.save_sale(sale)
+        self.storage.flush()
+    
+    async def write_sales(self, sales):
+        """Persist a batch of recorded sales"""
+        await asyncio.get_running_loop().run_in_executor(self.executor, self._write, sales)
+
+
+class AsyncSalesManager:
+    """Async POS entry point sharing state with a SalesManager
+    
+    Sales are recorded in memory immediately and queued for the sink. A
+    single writer task drains the queue in batches of up to batch_size;
+    once max_pending sales are waiting, record_sale blocks until the sink
+    catches up. The synchronous SalesManager work, which may write a
+    journal or storage, runs off the loop so it never stalls other
+    coroutines. Sales settling stock through a ProductManager in
+    concurrent mode run on executor (the loop's default if None); any
+    other checkout goes through one private worker thread, because the
+    plain ProductManager indexes are not safe to update from two threads.
+    
+    Persist sales either through the SalesManager's own storage or
+    through a StorageSink, not both; the two together would save every
+    sale twice, so that combination is refused.
+    """
+    
+    def __init__(self, sales_manager=None, sink=None, batch_size=100, max_pending=1000, executor=None):
+        self.sales_manager = sales_manager if sales_manager is not None else SalesManager()
+        self.sink = sink if sink is not None else AsyncSaleSink()
+        if isinstance(self.sink, StorageSink) and self.sales_manager.storage is not None:
+            raise ValueError("The SalesManager already has storage; a StorageSink would save each sale twice")
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.batches_written = 0
+        # Sales from batches the sink rejected, kept so callers can retry
+        self.failed_sales = []
+        self._queue = None
+        self._writer = None
+        # Single worker serializing work on inventories without locks
+        self._serial = None
+    
+    async def start(self):
+        """Start the background writer task"""
+        if self._writer is None:
+            self._queue = asyncio.Queue(self.max_pending)
+            self._writer = asyncio.create_task(self._write_loop())
+        return self
+    
+    async def close(self):
+        """Write every queued sale, stop the writer and close the sink"""
+        if self._writer is not None:
+            await self._queue.join()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self._serial is not None:
+            self._serial.shutdown()
+            self._serial = None
+        await self.sink.close()
+    
+    async def __aenter__(self):
+        return await self.start()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _write_loop(self):
+        """Drain the queue into sink batches"""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self.sink.write_sales(batch)
+                self.batches_written += 1
+            except Exception:  # pylint: disable=broad-except
+                self.failed_sales.extend(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def get_pending_count(self):
+        """Number of recorded sales not yet handed to the sink"""
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    def create_sale(self):
+        """Create a new sale; numbering is shared with the SalesManager"""
+        return self.sales_manager.create_sale()
+    
+    def _executor_for(self, sale):
+        """The shared executor if every inventory the sale touches is concurrent, else the serial worker"""
+        if sale.inventory is not None:
+            inventories = (sale.inventory,)
+        else:
+            inventories = {id(item.product._manager): item.product._manager for item in sale.items}.values()
+        if all(inventory is None or inventory.concurrent for inventory in inventories):
+            return self.executor
+        if self._serial is None:
+            self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-sales")
+        return self._serial
+    
+    async def _run_blocking(self, sale, function, *args):
+        """Run synchronous manager work for a sale off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor_for(sale), function, *args)
+    
+    async def record_sale(self, sale):
+        """Record a completed sale, waiting if the sink has fallen behind"""
+        if self._writer is None:
+            await self.start()
+        await self._run_blocking(sale, self.sales_manager.record_sale, sale)
+        await self._queue.put(sale)
+        return True
+    
+    def _complete_and_record(self, sale, payment_method):
+        sale.complete_sale(payment_method)
+        return self.sales_manager.record_sale(sale)
+    
+    async def checkout(self, sale, payment_method):
+        """Complete a sale and record it, in one trip to the executor"""
+        if self._writer is None:
+            await self.start()
+        await self._run_blocking(sale, self._complete_and_record, sale, payment_method)
+        await self._queue.put(sale)
+        return True
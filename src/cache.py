@@ -0,0 +1,61 @@
+"""
+Cache Module
+Bounded LRU cache with hit, miss and eviction counters
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Least-recently-used cache holding at most capacity entries
+    
+    Not thread-safe on its own; callers serialize access.
+    """
+    
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def get(self, key):
+        """Get a cached value and mark it most recently used, or None on a miss"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        """Cache a value as most recently used; returns the values evicted to make room"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        evicted = []
+        while len(self._entries) > self.capacity:
+            evicted.append(self._entries.popitem(last=False)[1])
+            self.evictions += 1
+        return evicted
+    
+    def pop(self, key):
+        """Drop an entry, returning its value or None"""
+        return self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every entry, keeping the counters"""
+        self._entries.clear()
+    
+    def get_hit_rate(self):
+        """Fraction of lookups served from the cache, or 0 before any lookup"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
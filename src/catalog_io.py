@@ -0,0 +1,116 @@
+"""
+Catalog Import/Export Module
+Streams product catalogs between ProductManager and CSV / JSON Lines files
+"""
+
+import contextlib
+import csv
+import json
+import math
+import os
+
+from product import Product, ImportReport
+
+
+CSV_FIELDS = ["product_id", "name", "price", "quantity", "category"]
+
+
+@contextlib.contextmanager
+def _open(target, mode):
+    """Open a path, or pass an already open file object through"""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, mode, newline="", encoding="utf-8") as handle:
+            yield handle
+    else:
+        yield target
+
+
+def _product_from_fields(product_id, name, price, quantity, category):
+    """Build a Product from raw field values"""
+    if not product_id or not name:
+        raise ValueError("product_id and name are required")
+    price, quantity = float(price), int(quantity or 0)
+    if not math.isfinite(price) or price < 0:
+        raise ValueError(f"price must be a finite, non-negative number, got {price}")
+    if quantity < 0:
+        raise ValueError(f"quantity must not be negative, got {quantity}")
+    return Product(product_id, name, price, quantity, category or "General")
+
+
+def _finish(report):
+    """Put parse and load errors, recorded at different times, in line order"""
+    report.errors.sort()
+    return report
+
+
+def import_csv(manager, source, chunk_size=10000):
+    """Load products from a CSV file with a header row; returns an ImportReport"""
+    report = ImportReport()
+    with _open(source, "r") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        missing = [name for name in CSV_FIELDS[:3] if name not in header]
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+        id_col, name_col, price_col = (header.index(name) for name in CSV_FIELDS[:3])
+        quantity_col = header.index("quantity") if "quantity" in header else None
+        category_col = header.index("category") if "category" in header else None
+        
+        def numbered_products():
+            for row in reader:
+                try:
+                    yield reader.line_num, _product_from_fields(
+                        row[id_col], row[name_col], row[price_col],
+                        row[quantity_col] if quantity_col is not None and quantity_col < len(row) else 0,
+                        row[category_col] if category_col is not None and category_col < len(row) else None)
+                except (IndexError, OverflowError, ValueError) as e:
+                    # line_num is the file line on which the current row ends
+                    report.add_error(reader.line_num, f"Invalid row: {e}")
+        
+        manager.bulk_load_rows(numbered_products(), report, chunk_size)
+    return _finish(report)
+
+
+def import_jsonl(manager, source, chunk_size=10000):
+    """Load products from a JSON Lines file; returns an ImportReport"""
+    report = ImportReport()
+    
+    def numbered_products(handle):
+        for line, text in enumerate(handle, 1):
+            if not text.strip():
+                continue
+            try:
+                fields = json.loads(text)
+                yield line, _product_from_fields(*(fields.get(name) for name in CSV_FIELDS))
+            except (AttributeError, OverflowError, TypeError, ValueError) as e:
+                report.add_error(line, f"Invalid row: {e}")
+    
+    with _open(source, "r") as handle:
+        manager.bulk_load_rows(numbered_products(handle), report, chunk_size)
+    return _finish(report)
+
+
+def export_csv(manager, target):
+    """Write every product to a CSV file; returns the number of rows written"""
+    count = 0
+    with _open(target, "w") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_FIELDS)
+        for product in manager.iter_products():
+            writer.writerow((product.product_id, product.name, f"{product.price:.2f}",
+                             product.quantity, product.category))
+            count += 1
+    return count
+
+
+def export_jsonl(manager, target):
+    """Write every product to a JSON Lines file; returns the number of rows written"""
+    count = 0
+    with _open(target, "w") as handle:
+        for product in manager.iter_products():
+            handle.write(json.dumps({"product_id": product.product_id, "name": product.name,
+                                     "price": product.price, "quantity": product.quantity,
+                                     "category": product.category}))
+            handle.write("\n")
+            count += 1
+    return count
@@ -0,0 +1,281 @@
+"""
+Events Module
+Typed inventory and sale events with a publish/subscribe bus
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+
+
+logger = logging.getLogger("supermarket.events")
+
+
+class Event:
+    """Base class for published events"""
+    
+    __slots__ = ()
+    
+    # Events sharing a non-None key may be coalesced into the latest one
+    key = None
+    
+    def merge(self, newer):
+        """Combine this pending event with a newer one of the same key"""
+        return newer
+
+
+class StockChanged(Event):
+    """A product's stock level changed"""
+    
+    __slots__ = ("product_id", "quantity", "old_quantity")
+    
+    def __init__(self, product_id, quantity, old_quantity):
+        self.product_id = product_id
+        self.quantity = quantity
+        self.old_quantity = old_quantity
+    
+    @property
+    def key(self):
+        return self.product_id
+    
+    def merge(self, newer):
+        # Latest level, but the change is measured from the first pending level
+        return StockChanged(self.product_id, newer.quantity, self.old_quantity)
+
+
+class CategoryChanged(Event):
+    """A product moved to another category"""
+    
+    __slots__ = ("product_id", "category", "old_category")
+    
+    def __init__(self, product_id, category, old_category):
+        self.product_id = product_id
+        self.category = category
+        self.old_category = old_category
+
+
+class ProductAdded(Event):
+    """A product was added to the catalog"""
+    
+    __slots__ = ("product",)
+    
+    def __init__(self, product):
+        self.product = product
+
+
+class ProductRemoved(Event):
+    """A product was removed from the catalog"""
+    
+    __slots__ = ("product_id",)
+    
+    def __init__(self, product_id):
+        self.product_id = product_id
+
+
+class SaleCompleted(Event):
+    """A sale was paid and its stock taken"""
+    
+    __slots__ = ("sale",)
+    
+    def __init__(self, sale):
+        self.sale = sale
+
+
+class SaleRecorded(Event):
+    """A completed sale was added to the sales history
+    
+    sequence is the manager's sale count once the sale was added, so a
+    reader that copied the history under the manager's lock can skip
+    events for sales its copy already holds.
+    """
+    
+    __slots__ = ("sale", "sequence")
+    
+    def __init__(self, sale, sequence=None):
+        self.sale = sale
+        self.sequence = sequence
+
+
+class Subscription:
+    """One subscriber's view of the bus
+    
+    "sync" delivery calls the handler inside publish(). "queue" delivery
+    buffers events for the subscriber to take with get(), drain() or
+    get_async(); "thread" delivery does the same with a worker thread
+    calling the handler. Buffers hold at most maxsize events, dropping the
+    oldest (counted in dropped) rather than ever blocking the publisher.
+    With coalesce set, a buffered event is replaced by a newer one with the
+    same key, so a slow consumer sees only the latest stock level per SKU.
+    """
+    
+    def __init__(self, bus, event_types, handler=None, delivery="sync", maxsize=1024, coalesce=False):
+        if delivery not in ("sync", "queue", "thread"):
+            raise ValueError(f"Unknown delivery mode: {delivery}")
+        if delivery != "queue" and handler is None:
+            raise ValueError(f"{delivery} delivery needs a handler")
+        self.bus = bus
+        self.event_types = tuple(event_types)
+        self.handler = handler
+        self.delivery = delivery
+        self.maxsize = maxsize
+        self.coalesce = coalesce
+        self.dropped = 0
+        self.closed = False
+        self._pending = OrderedDict()
+        self._sequence = itertools.count()
+        # Publishers take the bare lock and only notify when a consumer is
+        # blocked in get(), keeping the publish path short
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._blocked = 0
+        # asyncio.Event and loop of a consumer waiting in get_async()
+        self._waiter = None
+        self._worker = None
+        if delivery == "thread":
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+    
+    def __len__(self):
+        return len(self._pending)
+    
+    def _deliver(self, event):
+        if self.delivery == "sync":
+            try:
+                self.handler(event)
+            except Exception:
+                logger.exception("Event handler failed for %s", type(event).__name__)
+            return
+        with self._lock:
+            key = event.key if self.coalesce else None
+            if key is not None and key in self._pending:
+                self._pending[key] = self._pending[key].merge(event)
+            else:
+                if len(self._pending) >= self.maxsize:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                # Uncoalesced events get a unique key of their own
+                self._pending[("event", next(self._sequence)) if key is None else key] = event
+            if self._blocked:
+                self._ready.notify()
+            waiter = self._waiter
+        if waiter is not None:
+            event_flag, loop = waiter
+            loop.call_soon_threadsafe(event_flag.set)
+    
+    def get(self, timeout=None):
+        """Take the oldest buffered event, waiting up to timeout seconds; None if there is none"""
+        with self._ready:
+            self._blocked += 1
+            try:
+                if not self._ready.wait_for(lambda: self._pending or self.closed, timeout):
+                    return None
+            finally:
+                self._blocked -= 1
+            if not self._pending:
+                return None
+            return self._pending.popitem(last=False)[1]
+    
+    def drain(self):
+        """Take every buffered event, oldest first"""
+        with self._ready:
+            events = list(self._pending.values())
+            self._pending.clear()
+        return events
+    
+    async def get_async(self):
+        """Wait on the running event loop for the next buffered event; None once closed"""
+        flag = asyncio.Event()
+        self._waiter = (flag, asyncio.get_running_loop())
+        try:
+            while True:
+                with self._ready:
+                    if self._pending:
+                        return self._pending.popitem(last=False)[1]
+                    if self.closed:
+                        return None
+                    flag.clear()
+                await flag.wait()
+        finally:
+            self._waiter = None
+    
+    def _run(self):
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            try:
+                self.handler(event)
+            except Exception:
+                logger.exception("Event handler failed for %s", type(event).__name__)
+    
+    def close(self):
+        """Unsubscribe; a thread-delivery worker finishes the buffered events first"""
+        self.bus.unsubscribe(self)
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+            waiter = self._waiter
+        if waiter is not None:
+            event_flag, loop = waiter
+            loop.call_soon_threadsafe(event_flag.set)
+        if self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join()
+
+
+class EventBus:
+    """Routes published events to the subscriptions for their type
+    
+    Publishers go through publish_if_subscribed, which checks
+    `event_type in bus.subscribed` before building an event, so an
+    unobserved bus costs one set lookup per change.
+    """
+    
+    def __init__(self):
+        self.subscribed = frozenset()
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+    
+    def subscribe(self, event_types, handler=None, delivery=None, maxsize=1024, coalesce=False):
+        """Subscribe to one event type or a tuple of them; returns the Subscription
+        
+        delivery defaults to "sync" with a handler and "queue" without.
+        """
+        if isinstance(event_types, type):
+            event_types = (event_types,)
+        if delivery is None:
+            delivery = "sync" if handler is not None else "queue"
+        subscription = Subscription(self, event_types, handler, delivery, maxsize, coalesce)
+        with self._lock:
+            for event_type in subscription.event_types:
+                self._subscriptions[event_type] = self._subscriptions.get(event_type, ()) + (subscription,)
+            self.subscribed = frozenset(self._subscriptions)
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        """Stop delivering events to a subscription"""
+        with self._lock:
+            for event_type in subscription.event_types:
+                remaining = tuple(s for s in self._subscriptions.get(event_type, ()) if s is not subscription)
+                if remaining:
+                    self._subscriptions[event_type] = remaining
+                else:
+                    self._subscriptions.pop(event_type, None)
+            self.subscribed = frozenset(self._subscriptions)
+    
+    def publish(self, event):
+        """Deliver an event to every subscription for its type"""
+        for subscription in self._subscriptions.get(type(event), ()):
+            subscription._deliver(event)
+
+
+def is_subscribed(bus, event_type):
+    """Whether bus is set and has a subscription for event_type"""
+    return bus is not None and event_type in bus.subscribed
+
+
+def publish_if_subscribed(bus, event_type, *args):
+    """Publish event_type(*args) on bus, building the event only when it has a subscriber"""
+    if bus is not None and event_type in bus.subscribed:
+        bus.publish(event_type(*args))
@@ -0,0 +1,284 @@
+"""
+Instrumentation Module
+Opt-in call counts, latency histograms, slow-call logging and profiling windows
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from product import ProductManager
+from sales import Sale, SalesManager
+
+
+logger = logging.getLogger("supermarket.instrumentation")
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram
+    
+    Values are integer nanoseconds. Each power-of-two range is split into
+    2 ** (precision_bits - 1) equal buckets, so a reported percentile is
+    within 1 / 2 ** (precision_bits - 1) of the true value while recording
+    stays a couple of integer operations and one list increment.
+    """
+    
+    def __init__(self, precision_bits=6):
+        self.precision_bits = precision_bits
+        self._half = 1 << (precision_bits - 1)
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+    
+    def _index(self, value):
+        shift = value.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+    
+    def _upper_bound(self, index):
+        """Largest value that falls in a bucket"""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return ((index - shift * self._half + 1) << shift) - 1
+    
+    def record(self, value):
+        """Add one value"""
+        index = self._index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def get_percentile(self, percent):
+        """Get the value at or below which percent of recorded values fall, or 0 when empty"""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+    
+    def get_mean(self):
+        """Average recorded value, or 0 when empty"""
+        return self.total / self.count if self.count else 0
+    
+    def clear(self):
+        """Drop every recorded value"""
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+
+def _public_methods(cls):
+    """Yield (name, function) for the plain public methods a class defines"""
+    for name, attribute in vars(cls).items():
+        if not name.startswith("_") and inspect.isfunction(attribute):
+            yield name, attribute
+
+
+class Instrumentation:
+    """Times every public method of the given classes while enabled
+    
+    enable() swaps each public method for a timing wrapper on the class and
+    disable() puts the originals back, so a disabled instance costs nothing
+    at all on the hot path. Histograms are updated without locking; under
+    heavy threading an occasional count may be lost, which is acceptable
+    for monitoring. Generator methods are timed up to creating the
+    generator, not while it is consumed. Several instances may cover the
+    same class and be enabled and disabled in any order.
+    """
+    
+    # (class, method name) -> (original function, enabled instances), shared
+    # by every instance so the method is rebuilt from the real original
+    _targets = {}
+    _targets_lock = threading.Lock()
+    
+    def __init__(self, classes, slow_threshold_ms=50, slow_log_size=100):
+        self.classes = tuple(classes)
+        self.slow_threshold_ms = slow_threshold_ms
+        self._slow_threshold_ns = slow_threshold_ms * 10**6
+        self.histograms = {}
+        # Most recent slow calls as (method, milliseconds, wall-clock time)
+        self.slow_calls = deque(maxlen=slow_log_size)
+        self._wrapped = []
+    
+    @property
+    def enabled(self):
+        return bool(self._wrapped)
+    
+    def _wrap(self, qualified_name, func):
+        histogram = self.histograms.setdefault(qualified_name, LatencyHistogram())
+        record = histogram.record
+        clock = time.perf_counter_ns
+        instrumentation = self
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                record(elapsed)
+                if elapsed >= instrumentation._slow_threshold_ns:
+                    instrumentation._log_slow_call(qualified_name, elapsed)
+        return timed
+    
+    def _log_slow_call(self, qualified_name, elapsed):
+        milliseconds = elapsed / 10**6
+        self.slow_calls.append((qualified_name, milliseconds, time.time()))
+        logger.warning("Slow call: %s took %.2f ms", qualified_name, milliseconds)
+    
+    def enable(self):
+        """Start timing the public methods of every class"""
+        if self.enabled:
+            return
+        self._slow_threshold_ns = self.slow_threshold_ms * 10**6
+        with self._targets_lock:
+            for cls in self.classes:
+                for name, func in list(_public_methods(cls)):
+                    _, owners = self._targets.setdefault((cls, name), (func, []))
+                    owners.append(self)
+                    self._wrapped.append((cls, name))
+                    self._install(cls, name)
+    
+    def disable(self):
+        """Restore the original methods; recorded statistics are kept"""
+        with self._targets_lock:
+            for cls, name in self._wrapped:
+                self._targets[(cls, name)][1].remove(self)
+                self._install(cls, name)
+            self._wrapped.clear()
+    
+    @classmethod
+    def _install(cls, target, name):
+        """Set a method to its original wrapped once per enabled instance"""
+        func, owners = cls._targets[(target, name)]
+        for owner in owners:
+            func = owner._wrap(f"{target.__name__}.{name}", func)
+        if not owners:
+            del cls._targets[(target, name)]
+        setattr(target, name, func)
+    
+    def reset(self):
+        """Drop recorded statistics and slow calls"""
+        for histogram in self.histograms.values():
+            histogram.clear()
+        self.slow_calls.clear()
+    
+    def get_stats(self):
+        """Get {method: stats} for every method called at least once
+        
+        Latencies are in milliseconds.
+        """
+        stats = {}
+        for name, histogram in sorted(self.histograms.items()):
+            if histogram.count:
+                stats[name] = {
+                    "calls": histogram.count,
+                    "mean_ms": histogram.get_mean() / 10**6,
+                    "p50_ms": histogram.get_percentile(50) / 10**6,
+                    "p99_ms": histogram.get_percentile(99) / 10**6,
+                    "max_ms": histogram.max / 10**6,
+                }
+        return stats
+    
+    def get_report(self):
+        """Format the statistics as a text table, slowest p99 first"""
+        lines = [f"{'method':<40} {'calls':>10} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}"]
+        stats = self.get_stats()
+        for name in sorted(stats, key=lambda name: -stats[name]["p99_ms"]):
+            row = stats[name]
+            lines.append(f"{name:<40} {row['calls']:>10,} {row['mean_ms']:>10.4f} {row['p50_ms']:>10.4f} "
+                         f"{row['p99_ms']:>10.4f} {row['max_ms']:>10.4f}")
+        return "\n".join(lines)
+    
+    @contextmanager
+    def profile(self, sort="cumulative", limit=30, stream=None):
+        """Run cProfile over a block on the calling thread and print the top entries
+        
+        Yields the cProfile.Profile so callers can dump or inspect it.
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+            (stream or sys.stdout).write(output.getvalue())
+
+
+def instrument_core(slow_threshold_ms=50):
+    """Get a disabled Instrumentation over ProductManager, Sale and SalesManager"""
+    return Instrumentation((ProductManager, Sale, SalesManager), slow_threshold_ms)
+
+
+class SamplingProfiler:
+    """Samples the innermost frame of every thread from a background thread
+    
+    Costs the profiled threads nothing beyond the sampler holding the GIL
+    briefly every interval, so it is safe to run for a time window in
+    production.
+    """
+    
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self, duration=None):
+        """Start sampling, stopping by itself after duration seconds if given"""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Sampling profiler is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(duration,), daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+    
+    def _run(self, duration):
+        deadline = None if duration is None else time.monotonic() + duration
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    code = frame.f_code
+                    self.samples[(code.co_filename, frame.f_lineno, code.co_name)] += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    
+    def get_top(self, n=20):
+        """Get the n most sampled (filename, line, function) locations with their counts"""
+        return self.samples.most_common(n)
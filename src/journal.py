@@ -0,0 +1,251 @@
+"""
+Sales Journal Module
+Append-only write-ahead journal of sale and inventory events with replay
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from product import Product
+from sales import Sale, SaleItem
+
+
+# Record framing: payload length and CRC32, then the payload itself
+_HEADER = struct.Struct("<II")
+_SALE = struct.Struct("<qqqI")
+_ITEM = struct.Struct("<qi")
+_STOCK = struct.Struct("<q")
+_PRODUCT = struct.Struct("<qq")
+_STRING = struct.Struct("<H")
+
+EVENT_SALE = 1
+EVENT_STOCK = 2
+EVENT_ADD_PRODUCT = 3
+EVENT_REMOVE_PRODUCT = 4
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _pack_string(value):
+    data = (value or "").encode("utf-8")
+    return _STRING.pack(len(data)) + data
+
+
+def _unpack_string(payload, offset):
+    (length,) = _STRING.unpack_from(payload, offset)
+    offset += _STRING.size
+    return payload[offset:offset + length].decode("utf-8"), offset + length
+
+
+def encode_sale(sale):
+    """Encode a recorded sale and its line items as a journal payload"""
+    micros = (sale.timestamp - _EPOCH) // _MICROSECOND
+    parts = [bytes([EVENT_SALE]), _pack_string(sale.sale_id), _pack_string(sale.payment_method),
+             _SALE.pack(micros, sale.total_cents, sale.discount_cents, len(sale.items))]
+    for item in sale.items:
+        parts.append(_pack_string(item.product.product_id))
+        parts.append(_pack_string(item.product.name))
+        parts.append(_ITEM.pack(item.product.price_cents, item.quantity))
+    return b"".join(parts)
+
+
+def decode_sale(payload, products=None):
+    """Decode a sale payload; line items reuse products from the manager when known"""
+    sale_id, offset = _unpack_string(payload, 1)
+    payment_method, offset = _unpack_string(payload, offset)
+    micros, total_cents, discount_cents, count = _SALE.unpack_from(payload, offset)
+    offset += _SALE.size
+    sale = Sale(sale_id)
+    sale.timestamp = _EPOCH + timedelta(microseconds=micros)
+    sale.payment_method = payment_method or None
+    sale.total_cents = total_cents
+    sale.discount_cents = discount_cents
+    for _ in range(count):
+        product_id, offset = _unpack_string(payload, offset)
+        name, offset = _unpack_string(payload, offset)
+        price_cents, quantity = _ITEM.unpack_from(payload, offset)
+        offset += _ITEM.size
+        product = products.get_product(product_id) if products is not None else None
+        if product is None:
+            # Detached snapshot of the product as sold
+            product = Product(product_id, name, 0, 0)
+            product.price_cents = price_cents
+        sale.items.append(SaleItem(product, quantity))
+    return sale
+
+
+class SalesJournal:
+    """Append-only journal of length-prefixed, checksummed event records
+    
+    Records are written through a buffer and fsynced once fsync_every
+    records are pending or fsync_interval seconds have passed since the
+    last sync, whichever comes first; an interval of 0 syncs on count
+    alone. A background thread covers the interval when appends stop.
+    A torn record at the tail (from a crash mid-write) ends replay and is
+    truncated away when the journal reopens.
+    """
+    
+    def __init__(self, path, fsync_every=100, fsync_interval=0.05):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.syncs = 0
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        valid_length = self._scan_valid_length()
+        self._file = open(path, "ab")
+        if self._file.tell() > valid_length:
+            self._file.truncate(valid_length)
+        self._closed = threading.Event()
+        self._syncer = None
+        if fsync_interval:
+            self._syncer = threading.Thread(target=self._sync_loop, name="sales-journal-sync", daemon=True)
+            self._syncer.start()
+    
+    def _scan_valid_length(self):
+        """Get the length of the intact record prefix of an existing journal"""
+        length = 0
+        for _, end in self._iter_records():
+            length = end
+        return length
+    
+    def _iter_records(self):
+        """Yield (payload, end offset) for each intact record, reading one record at a time"""
+        if not os.path.exists(self.path):
+            return
+        offset = 0
+        with open(self.path, "rb") as handle:
+            while True:
+                header = handle.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, checksum = _HEADER.unpack(header)
+                payload = handle.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                offset += _HEADER.size + length
+                yield payload, offset
+    
+    def _append(self, payload):
+        with self._lock:
+            self._file.write(_HEADER.pack(len(payload), zlib.crc32(payload)))
+            self._file.write(payload)
+            self._pending += 1
+            if self._pending >= self.fsync_every or (
+                    self.fsync_interval and time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync_locked()
+    
+    def _sync_locked(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+    
+    def _sync_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            with self._lock:
+                if self._pending and not self._file.closed:
+                    self._sync_locked()
+    
+    def append_sale(self, sale):
+        """Journal a recorded sale"""
+        self._append(encode_sale(sale))
+    
+    def append_stock(self, product_id, delta):
+        """Journal a stock adjustment made outside a sale"""
+        self._append(bytes([EVENT_STOCK]) + _pack_string(product_id) + _STOCK.pack(delta))
+    
+    def append_product(self, product):
+        """Journal a product added to the catalog"""
+        self._append(bytes([EVENT_ADD_PRODUCT]) + _pack_string(product.product_id) + _pack_string(product.name)
+                     + _pack_string(product.category) + _PRODUCT.pack(product.price_cents, product.quantity))
+    
+    def append_remove_product(self, product_id):
+        """Journal a product removed from the catalog"""
+        self._append(bytes([EVENT_REMOVE_PRODUCT]) + _pack_string(product_id))
+    
+    def sync(self):
+        """Force buffered records to disk"""
+        with self._lock:
+            if self._pending:
+                self._sync_locked()
+    
+    def close(self):
+        """Sync and close the journal"""
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._lock:
+            if self._pending:
+                self._sync_locked()
+            self._file.close()
+    
+    def replay(self, product_manager=None, sales_manager=None):
+        """Rebuild catalog, stock levels and sales history; returns the number of records applied
+        
+        Replay applies events on top of the catalog as it stood when the
+        journal was started, and must run before new events are appended.
+        """
+        attached = [m for m in (product_manager, sales_manager) if m is not None and m.journal is self]
+        for manager in attached:
+            manager.journal = None
+        try:
+            return self._apply_records(product_manager, sales_manager)
+        finally:
+            for manager in attached:
+                manager.journal = self
+    
+    def _apply_records(self, product_manager, sales_manager):
+        count = 0
+        for payload, _ in self._iter_records():
+            event = payload[0]
+            if event == EVENT_SALE:
+                self._apply_sale(payload, product_manager, sales_manager)
+            elif product_manager is not None and event in _APPLY_PRODUCT_EVENT:
+                product_id, offset = _unpack_string(payload, 1)
+                _APPLY_PRODUCT_EVENT[event](product_manager, product_id, payload, offset)
+            count += 1
+        return count
+    
+    @staticmethod
+    def _apply_sale(payload, product_manager, sales_manager):
+        sale = decode_sale(payload, product_manager)
+        if product_manager is not None:
+            for item in sale.items:
+                if item.product._manager is product_manager:
+                    item.product.update_quantity(-item.quantity)
+        if sales_manager is not None:
+            sales_manager.restore_sale(sale)
+
+
+def _apply_stock(product_manager, product_id, payload, offset):
+    product_manager.update_stock(product_id, _STOCK.unpack_from(payload, offset)[0])
+
+
+def _apply_add_product(product_manager, product_id, payload, offset):
+    name, offset = _unpack_string(payload, offset)
+    category, offset = _unpack_string(payload, offset)
+    price_cents, quantity = _PRODUCT.unpack_from(payload, offset)
+    if product_manager.get_product(product_id) is None:
+        product = Product(product_id, name, 0, quantity, category)
+        product.price_cents = price_cents
+        product_manager.add_product(product)
+
+
+def _apply_remove_product(product_manager, product_id, payload, offset):
+    product_manager.remove_product(product_id)
+
+
+# Catalog events, keyed by record type, replayed against the product manager
+_APPLY_PRODUCT_EVENT = {
+    EVENT_STOCK: _apply_stock,
+    EVENT_ADD_PRODUCT: _apply_add_product,
+    EVENT_REMOVE_PRODUCT: _apply_remove_product,
+}
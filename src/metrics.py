@@ -0,0 +1,358 @@
+"""
+Live Sales Metrics Module
+Rolling-window sales figures kept in constant memory from the stream of recorded sales
+"""
+
+import heapq
+import itertools
+import math
+import threading
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+from events import EventBus, SaleRecorded
+from sales import Sale
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SpaceSaving:
+    """Heavy-hitter counts for a stream of keys, in at most 2 * capacity counters
+    
+    When the counters fill up, all but the capacity largest are dropped at
+    once, and floor rises to the largest count dropped. A new key starts
+    from floor, the most it could have been counted before, and records
+    that as its error. Every count is then an upper bound that is at most
+    error above the true total, and pruning a batch at a time keeps the
+    cost of add() constant on average.
+    """
+    
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.floor = 0
+        self.total = 0
+    
+    def add(self, key, weight=1):
+        """Count weight more occurrences of key"""
+        self.total += weight
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+            return
+        if len(counts) >= 2 * self.capacity:
+            self._prune()
+        counts[key] = self.floor + weight
+        self.errors[key] = self.floor
+    
+    def update(self, pairs):
+        """Count (key, weight) pairs, as add() would one by one"""
+        counts = self.counts
+        for key, weight in pairs:
+            self.total += weight
+            if key in counts:
+                counts[key] += weight
+                continue
+            if len(counts) >= 2 * self.capacity:
+                self._prune()
+                counts = self.counts
+            counts[key] = self.floor + weight
+            self.errors[key] = self.floor
+    
+    def _prune(self):
+        ranked = heapq.nlargest(self.capacity + 1, self.counts.items(), key=itemgetter(1))
+        self.floor = max(self.floor, ranked.pop()[1])
+        self.counts = dict(ranked)
+        self.errors = {key: self.errors[key] for key in self.counts}
+    
+    def top(self, n=10):
+        """Get the n (key, estimated count) pairs with the highest counts, highest first"""
+        return heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+
+
+class TDigest:
+    """Streaming quantile estimates from a bounded set of weighted centroids
+    
+    A merging t-digest: values are buffered, then sorted into the
+    centroids and re-clustered so that no centroid spans more than one
+    unit of the arcsine scale function. Centroids stay small near the
+    tails, so high and low percentiles stay accurate while the digest
+    holds on the order of compression centroids however many values it
+    has seen. Digests merge, so per-interval digests combine into one.
+    """
+    
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._buffer = []
+    
+    def add(self, value, weight=1):
+        """Record a value"""
+        self._buffer.append((value, weight))
+        self.count += weight
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if len(self._buffer) >= 4 * self.compression:
+            self._compress()
+    
+    def merge(self, *others):
+        """Fold other digests' values into this one, re-clustering once"""
+        for other in others:
+            if not other.count:
+                continue
+            self._buffer.extend(zip(other.means, other.weights))
+            self._buffer.extend(other._buffer)
+            self.count += other.count
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+    
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+        total = self.count
+        scale = self.compression / (2 * math.pi)
+        means = []
+        weights = []
+        mean, weight = points[0]
+        so_far = 0
+        limit = self._quantile_limit(0, scale, total)
+        for value, value_weight in points[1:]:
+            if so_far + weight + value_weight <= limit:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                so_far += weight
+                limit = self._quantile_limit(so_far, scale, total)
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means = means
+        self.weights = weights
+    
+    @staticmethod
+    def _quantile_limit(so_far, scale, total):
+        """Weight up to which a centroid starting after so_far may grow: one unit further along the scale"""
+        k = scale * math.asin(2 * so_far / total - 1) + 1
+        if k >= scale * math.pi / 2:
+            return total
+        return (math.sin(k / scale) + 1) / 2 * total
+    
+    def get_percentile(self, percent):
+        """Estimate the value at or below which percent of recorded values fall, or 0 when empty"""
+        if not self.count:
+            return 0
+        self._compress()
+        target = self.count * percent / 100
+        if target <= 0:
+            return self.min
+        if target >= self.count:
+            return self.max
+        # Each centroid's mean sits at the middle of its weight; interpolate
+        # between neighbouring middles, and out to min and max at the ends
+        previous_mean, previous_middle = self.min, 0
+        cumulative = 0
+        for mean, weight in zip(self.means, self.weights):
+            if weight == 1 and cumulative < target <= cumulative + 1:
+                # A single value is exact, as a nearest-rank percentile
+                return mean
+            middle = cumulative + weight / 2
+            if target < middle:
+                fraction = (target - previous_middle) / (middle - previous_middle)
+                return previous_mean + (mean - previous_mean) * fraction
+            previous_mean, previous_middle = mean, middle
+            cumulative += weight
+        fraction = (target - previous_middle) / (self.count - previous_middle)
+        return previous_mean + (self.max - previous_mean) * fraction
+
+
+class _Bucket:
+    """Running figures for one interval of a ring"""
+    
+    __slots__ = ("number", "sales", "revenue_cents", "units", "top", "basket_values")
+    
+    def __init__(self, number, top_capacity, compression):
+        self.number = number
+        self.sales = 0
+        self.revenue_cents = 0
+        self.units = 0
+        self.top = SpaceSaving(top_capacity)
+        self.basket_values = TDigest(compression)
+
+
+class _Ring:
+    """Fixed slots for the intervals of one width spanning the horizon"""
+    
+    def __init__(self, width, horizon):
+        self.width = width
+        # One spare slot so a full-horizon window still fits
+        self.size = -(-horizon // width) + 1
+        self.slots = [None] * self.size
+    
+    def get(self, number):
+        bucket = self.slots[number % self.size]
+        return bucket if bucket is not None and bucket.number == number else None
+    
+    def claim(self, number, top_capacity, compression):
+        """The bucket for interval number, reusing its slot if that has left the horizon"""
+        bucket = self.slots[number % self.size]
+        if bucket is None or bucket.number < number:
+            bucket = self.slots[number % self.size] = _Bucket(number, top_capacity, compression)
+        return bucket
+
+
+class LiveSalesMetrics:
+    """Sales count, revenue, basket sizes, top products and basket-value
+    percentiles over any trailing window up to horizon
+    
+    Recorded sales land in two rings of time buckets, one bucket_seconds
+    wide and one coarse_seconds wide, each bucket holding running sums, a
+    SpaceSaving summary of units per product and a TDigest of basket
+    values. A slot is reused once its bucket falls out of the horizon, so
+    memory is fixed by the horizon and bucket widths however many sales
+    arrive. A window covers the fine buckets that start inside it; a
+    query takes whole coarse buckets where it can and fine buckets at the
+    edges, so even a 24 hour window merges only a few hundred sketches.
+    
+    Pass a SalesManager to be fed from its record_sale through its
+    EventBus (one is attached if it has none), or call observe() directly.
+    """
+    
+    def __init__(self, sales_manager=None, bucket_seconds=60, coarse_seconds=3600, horizon=timedelta(hours=24),
+                 top_capacity=64, compression=100):
+        if coarse_seconds % bucket_seconds:
+            raise ValueError("coarse_seconds must be a multiple of bucket_seconds")
+        self.horizon = horizon
+        self.top_capacity = top_capacity
+        self.compression = compression
+        self._fine = _Ring(timedelta(seconds=bucket_seconds), horizon)
+        self._coarse = _Ring(timedelta(seconds=coarse_seconds), horizon)
+        self._ratio = coarse_seconds // bucket_seconds
+        self._latest = None
+        # Sales older than the horizon when they arrived
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._subscription = None
+        if sales_manager is not None:
+            if sales_manager.events is None:
+                sales_manager.events = EventBus()
+            self._subscription = sales_manager.events.subscribe(SaleRecorded, self._on_sale_recorded)
+    
+    def close(self):
+        """Stop following recorded sales"""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+    
+    def _on_sale_recorded(self, event):
+        self.observe(event.sale)
+    
+    def observe(self, sale):
+        """Count a recorded sale into the buckets for its timestamp"""
+        if isinstance(sale, Sale):
+            lines = [(item.product.product_id, item.quantity) for item in sale.items]
+        else:
+            lines = [(product_id, quantity) for product_id, quantity, _ in sale.get_line_items()]
+        number = (sale.timestamp - _EPOCH) // self._fine.width
+        units = sum(quantity for _, quantity in lines)
+        with self._lock:
+            if self._latest is not None and number <= self._latest - self._fine.size:
+                self.dropped += 1
+                return
+            if self._latest is None or number > self._latest:
+                self._latest = number
+            for ring, ring_number in ((self._fine, number), (self._coarse, number // self._ratio)):
+                bucket = ring.claim(ring_number, self.top_capacity, self.compression)
+                bucket.sales += 1
+                bucket.revenue_cents += sale.total_cents
+                bucket.units += units
+                bucket.top.update(lines)
+                bucket.basket_values.add(sale.total_cents)
+    
+    def _buckets(self, window, now):
+        """The live buckets covering the window ending at now (lock held)"""
+        if window > self.horizon:
+            raise ValueError(f"Window {window} is longer than the {self.horizon} horizon")
+        if now is None:
+            now = datetime.now()
+        width = self._fine.width
+        first = -(-(now - window - _EPOCH) // width)
+        last = (now - _EPOCH) // width
+        ratio = self._ratio
+        # Whole coarse buckets inside [first, last], and fine ones either side
+        coarse_first = -(-first // ratio)
+        coarse_last = (last + 1) // ratio - 1
+        if coarse_first > coarse_last:
+            fine_numbers = range(first, last + 1)
+            coarse_numbers = ()
+        else:
+            fine_numbers = itertools.chain(range(first, coarse_first * ratio),
+                                           range((coarse_last + 1) * ratio, last + 1))
+            coarse_numbers = range(coarse_first, coarse_last + 1)
+        buckets = [self._fine.get(number) for number in fine_numbers]
+        buckets += [self._coarse.get(number) for number in coarse_numbers]
+        return [bucket for bucket in buckets if bucket is not None]
+    
+    def get_sales_count(self, window=timedelta(minutes=15), now=None):
+        """Number of sales in the window ending at now (default: the current time)"""
+        with self._lock:
+            return sum(bucket.sales for bucket in self._buckets(window, now))
+    
+    def get_revenue(self, window=timedelta(minutes=15), now=None):
+        """Revenue of the sales in the window"""
+        with self._lock:
+            return sum(bucket.revenue_cents for bucket in self._buckets(window, now)) / 100
+    
+    def get_items_per_basket(self, window=timedelta(minutes=15), now=None):
+        """Average units per sale in the window, or 0 when there were none"""
+        with self._lock:
+            buckets = self._buckets(window, now)
+            sales = sum(bucket.sales for bucket in buckets)
+            return sum(bucket.units for bucket in buckets) / sales if sales else 0
+    
+    def get_top_products(self, n=20, window=timedelta(hours=1), now=None):
+        """Estimated (product_id, units sold) pairs for the n best sellers in the window, best first
+        
+        Counts are exact while no bucket has seen more than 2 * top_capacity
+        products, and otherwise may overstate a product's units.
+        """
+        with self._lock:
+            counts = {}
+            for bucket in self._buckets(window, now):
+                for product_id, units in bucket.top.counts.items():
+                    counts[product_id] = counts.get(product_id, 0) + units
+        return heapq.nlargest(n, counts.items(), key=itemgetter(1))
+    
+    def get_basket_value_percentile(self, percent, window=timedelta(hours=1), now=None):
+        """Estimated basket value at or below which percent of the window's sales fall"""
+        with self._lock:
+            digest = TDigest(self.compression).merge(*[bucket.basket_values
+                                                       for bucket in self._buckets(window, now)])
+        return digest.get_percentile(percent) / 100
+    
+    def get_summary(self, window=timedelta(minutes=15), now=None, top_n=20):
+        """All of the live figures for one window as a dict"""
+        if now is None:
+            now = datetime.now()
+        return {
+            "sales_count": self.get_sales_count(window, now),
+            "revenue": self.get_revenue(window, now),
+            "items_per_basket": self.get_items_per_basket(window, now),
+            "basket_value_p50": self.get_basket_value_percentile(50, window, now),
+            "basket_value_p90": self.get_basket_value_percentile(90, window, now),
+            "basket_value_p99": self.get_basket_value_percentile(99, window, now),
+            "top_products": self.get_top_products(top_n, window, now),
+        }
@@ -3,15 +3,71 @@ Product Management Module
 Handles product CRUD operations for supermarket inventory
 """
 
+import bisect
+import contextlib
+import heapq
+import itertools
+import threading
+import time
+
+from cache import LRUCache
+from events import CategoryChanged, ProductAdded, ProductRemoved, StockChanged, is_subscribed, publish_if_subscribed
+from search import ProductSearchIndex
+
+
+def to_cents(amount):
+    """Convert a money amount in dollars to integer cents, rounding to the nearest cent"""
+    return round(amount * 100)
+
+
 class Product:
     """Product class representing a supermarket item"""
     
+    __slots__ = ("product_id", "name", "price_cents", "_quantity", "_category", "_manager")
+    
     def __init__(self, product_id, name, price, quantity, category="General"):
         self.product_id = product_id
         self.name = name
-        self.price = price
-        self.quantity = quantity
-        self.category = category
+        # Money is held as integer cents; price is the dollar view of it
+        self.price_cents = to_cents(price)
+        self._quantity = quantity
+        self._category = category
+        self._manager = None
+    
+    @property
+    def price(self):
+        """Unit price in dollars"""
+        return self.price_cents / 100
+    
+    @price.setter
+    def price(self, value):
+        self.price_cents = to_cents(value)
+    
+    @property
+    def quantity(self):
+        """Current stock level"""
+        return self._quantity
+    
+    @quantity.setter
+    def quantity(self, value):
+        """Set stock level and keep the owning manager's indexes in sync"""
+        old_quantity = self._quantity
+        self._quantity = value
+        if self._manager is not None and value != old_quantity:
+            self._manager._on_quantity_changed(self, old_quantity)
+    
+    @property
+    def category(self):
+        """Category the product is filed under"""
+        return self._category
+    
+    @category.setter
+    def category(self, value):
+        """Set the category and move the product in the owning manager's index"""
+        old_category = self._category
+        self._category = value
+        if self._manager is not None and value != old_category:
+            self._manager._on_category_changed(self, old_category)
     
     def __str__(self):
         return f"Product(ID: {self.product_id}, Name: {self.name}, Price: ${self.price}, Qty: {self.quantity})"
@@ -27,53 +83,582 @@ class Product:
     
     def calculate_total_value(self):
         """Calculate total value of product in stock"""
-        return self.price * self.quantity
+        return self.price_cents * self.quantity / 100
+
+
+class Reservation:
+    """Stock held for a cart until it is committed, released or expires"""
+    
+    __slots__ = ("reservation_id", "product_id", "quantity", "expires_at")
+    
+    def __init__(self, reservation_id, product_id, quantity, expires_at):
+        self.reservation_id = reservation_id
+        self.product_id = product_id
+        self.quantity = quantity
+        self.expires_at = expires_at
+
+
+class ImportReport:
+    """Outcome of a bulk load: rows loaded and per-row errors"""
+    
+    def __init__(self):
+        self.loaded = 0
+        self.errors = []
+    
+    def add_error(self, row, message):
+        """Record a rejected row"""
+        self.errors.append((row, message))
+    
+    def is_clean(self):
+        """Check that every row was loaded"""
+        return not self.errors
+
+
+def product_filter(category=None, min_price=None, max_price=None, min_quantity=None, max_quantity=None):
+    """Build a predicate matching products on every given criterion (bounds are inclusive)"""
+    min_cents = None if min_price is None else to_cents(min_price)
+    max_cents = None if max_price is None else to_cents(max_price)
+    
+    def matches(product):
+        return ((category is None or product.category == category)
+                and (min_cents is None or product.price_cents >= min_cents)
+                and (max_cents is None or product.price_cents <= max_cents)
+                and (min_quantity is None or product.quantity >= min_quantity)
+                and (max_quantity is None or product.quantity <= max_quantity))
+    return matches
 
 
 class ProductManager:
     """Manager class for handling multiple products"""
     
-    def __init__(self):
+    def __init__(self, storage=None, concurrent=False, lock_stripes=64, reservation_ttl=900, journal=None,
+                 cache_size=None, events=None):
         self.products = {}
+        # Optional SalesJournal that catalog changes and restocks are written ahead to
+        self.journal = journal
+        # Optional EventBus told about stock and category changes and catalog
+        # additions and removals; events are only built for types with subscribers
+        self.events = events
+        # In concurrent mode stock changes on a SKU are serialized by one of
+        # lock_stripes locks, while a short re-entrant lock guards the shared
+        # indexes; otherwise both are no-ops
+        self.concurrent = concurrent
+        if concurrent:
+            self._stock_locks = [threading.Lock() for _ in range(lock_stripes)]
+            self._index_lock = threading.RLock()
+        else:
+            self._stock_locks = None
+            self._index_lock = contextlib.nullcontext()
+        # Optional persistence backend; products are loaded from it lazily,
+        # and self.products holds those loaded so far
+        self.storage = storage
+        self._fully_loaded = storage is None
+        # With cache_size set, at most that many lazily loaded products stay
+        # in memory, least recently used first out, until a catalog-wide
+        # query loads everything
+        self.cache = LRUCache(cache_size) if storage is not None and cache_size else None
+        # Secondary indexes, maintained incrementally so that catalog
+        # queries cost the size of the result rather than the catalog
+        self._by_category = {}
+        self._by_quantity = {}
+        self._quantity_levels = []
+        # Product IDs in sorted order for keyset pagination; None until a
+        # page is requested, and again after a bulk load
+        self._sorted_ids = None
+        # Word index for search(), built on first use
+        self._search_index = None
+        # Reservation ledger: live reservations, units held per product and
+        # a min-heap of (expires_at, reservation_id) for the TTL sweep
+        self.reservation_ttl = reservation_ttl
+        self._reservations = {}
+        self._reserved = {}
+        self._expiry_heap = []
+        self._reservation_ids = itertools.count(1)
+    
+    def _index_quantity(self, product, quantity):
+        """Add product to the bucket for its stock level"""
+        bucket = self._by_quantity.get(quantity)
+        if bucket is None:
+            bucket = self._by_quantity[quantity] = {}
+            bisect.insort(self._quantity_levels, quantity)
+        bucket[product.product_id] = product
+    
+    def _unindex_quantity(self, product, quantity):
+        """Remove product from the bucket for a stock level"""
+        bucket = self._by_quantity[quantity]
+        del bucket[product.product_id]
+        if not bucket:
+            del self._by_quantity[quantity]
+            del self._quantity_levels[bisect.bisect_left(self._quantity_levels, quantity)]
+    
+    def _on_quantity_changed(self, product, old_quantity):
+        """Reindex and persist a product after its quantity changed"""
+        with self._index_lock:
+            resident = self.products.get(product.product_id)
+            if resident is product:
+                self._unindex_quantity(product, old_quantity)
+                self._index_quantity(product, product.quantity)
+            elif resident is not None:
+                self._replace_stale_copy(resident, product)
+            if self.storage is not None:
+                self.storage.save_stock(product.product_id, product.quantity)
+        publish_if_subscribed(self.events, StockChanged, product.product_id, product.quantity, old_quantity)
+    
+    def _on_category_changed(self, product, old_category):
+        """Refile and persist a product after its category changed"""
+        with self._index_lock:
+            product_id = product.product_id
+            resident = self.products.get(product_id)
+            if resident is product:
+                self._unindex_category(product_id, old_category)
+                self._by_category.setdefault(product.category, {})[product_id] = product
+                if self._search_index is not None:
+                    self._search_index.remove(product_id)
+                    self._search_index.add(product)
+            elif resident is not None:
+                self._replace_stale_copy(resident, product)
+            if self.storage is not None:
+                self.storage.save_product(product)
+        publish_if_subscribed(self.events, CategoryChanged, product_id, product.category, old_category)
+    
+    def _replace_stale_copy(self, resident, product):
+        """Stop serving a reloaded copy after an evicted copy of the same product changed
+        
+        While the cache is in use the next lookup reads the change back from
+        storage; once everything is loaded nothing reloads, so the changed
+        copy takes the resident one's place.
+        """
+        self._unload(resident)
+        if self._fully_loaded:
+            self._attach(product)
+        else:
+            self.cache.pop(product.product_id)
+    
+    def _check_unowned(self, product):
+        """Refuse a product whose stock and category changes are already reported to another manager"""
+        if product._manager is not None and product._manager is not self:
+            raise ValueError(f"Product ID {product.product_id} already belongs to another ProductManager")
+    
+    def _unindex_category(self, product_id, category):
+        """Remove a product from the bucket for a category"""
+        bucket = self._by_category[category]
+        del bucket[product_id]
+        if not bucket:
+            del self._by_category[category]
+    
+    def _attach(self, product):
+        """Track a product in memory and in the secondary indexes"""
+        self.products[product.product_id] = product
+        self._by_category.setdefault(product.category, {})[product.product_id] = product
+        self._index_quantity(product, product.quantity)
+        if self._sorted_ids is not None:
+            bisect.insort(self._sorted_ids, product.product_id)
+        if self._search_index is not None:
+            self._search_index.add(product)
+        product._manager = self
+    
+    def _detach(self, product):
+        """Drop a product from memory and the secondary indexes"""
+        product_id = product.product_id
+        del self.products[product_id]
+        self._unindex_category(product_id, product.category)
+        self._unindex_quantity(product, product.quantity)
+        if self._sorted_ids is not None:
+            del self._sorted_ids[bisect.bisect_left(self._sorted_ids, product_id)]
+        if self._search_index is not None:
+            self._search_index.remove(product_id)
+        product._manager = None
+    
+    def _unload(self, product):
+        """Evict a product from memory; later stock changes to it still reach storage"""
+        self._detach(product)
+        product._manager = self
+    
+    def _cache_product(self, product):
+        """Track a resident product in the cache, unloading whatever it evicts"""
+        if self.cache is not None and not self._fully_loaded:
+            for evicted in self.cache.put(product.product_id, product):
+                self._unload(evicted)
+    
+    def _ensure_loaded(self):
+        """Load every stored product before a catalog-wide query"""
+        if self._fully_loaded:
+            return
+        with self._index_lock:
+            for product in self.storage.iter_products():
+                if product.product_id not in self.products:
+                    self._attach(product)
+            self._fully_loaded = True
+            if self.cache is not None:
+                # Everything is resident from here on
+                self.cache.clear()
+    
+    @contextlib.contextmanager
+    def _stock_locked(self, product_ids):
+        """Hold the stripe locks covering product_ids, taken in a deadlock-free order"""
+        if self._stock_locks is None:
+            yield
+            return
+        stripes = sorted({hash(product_id) % len(self._stock_locks) for product_id in product_ids})
+        locks = [self._stock_locks[stripe] for stripe in stripes]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
     
     def add_product(self, product):
         """Add a new product to inventory"""
-        if product.product_id in self.products:
-            raise ValueError(f"Product ID {product.product_id} already exists")
-        self.products[product.product_id] = product
+        self._check_unowned(product)
+        with self._index_lock:
+            if self.get_product(product.product_id) is not None:
+                raise ValueError(f"Product ID {product.product_id} already exists")
+            if self.journal is not None:
+                self.journal.append_product(product)
+            self._attach(product)
+            if self.storage is not None:
+                self.storage.save_product(product)
+            self._cache_product(product)
+        publish_if_subscribed(self.events, ProductAdded, product)
         return True
     
+    def bulk_load(self, products, chunk_size=10000):
+        """Add many products from any iterable, numbering rows from 1"""
+        return self.bulk_load_rows(enumerate(products, 1), chunk_size=chunk_size)
+    
+    def bulk_load_rows(self, numbered_products, report=None, chunk_size=10000):
+        """Add products from (row_number, product) pairs, consuming them chunk by chunk
+        
+        Duplicate IDs, whether already in the catalog or repeated in the
+        input, are recorded in the ImportReport instead of aborting the load.
+        """
+        if report is None:
+            report = ImportReport()
+        self._ensure_loaded()
+        # Re-sorting once on the next page request beats an insort per row
+        self._sorted_ids = None
+        while True:
+            chunk = list(itertools.islice(numbered_products, chunk_size))
+            if not chunk:
+                return report
+            added = [] if is_subscribed(self.events, ProductAdded) else None
+            with self._index_lock:
+                report.loaded += self._load_chunk(chunk, report, added)
+            for product in added or ():
+                self.events.publish(ProductAdded(product))
+    
+    def _load_chunk(self, chunk, report, added):
+        """Add one chunk of bulk-loaded rows; returns how many were loaded
+        
+        Called with the index lock held. Loaded products are appended to
+        added unless it is None.
+        """
+        catalog = self.products
+        by_category = self._by_category
+        storage = self.storage
+        search_index = self._search_index
+        loaded = 0
+        for row, product in chunk:
+            product_id = product.product_id
+            if product_id in catalog:
+                report.add_error(row, f"Product ID {product_id} already exists")
+                continue
+            if product._manager is not None:
+                report.add_error(row, f"Product ID {product_id} already belongs to another ProductManager")
+                continue
+            if self.journal is not None:
+                self.journal.append_product(product)
+            catalog[product_id] = product
+            bucket = by_category.get(product.category)
+            if bucket is None:
+                bucket = by_category[product.category] = {}
+            bucket[product_id] = product
+            self._index_quantity(product, product.quantity)
+            if search_index is not None:
+                search_index.add(product)
+            product._manager = self
+            if storage is not None:
+                storage.save_product(product)
+            if added is not None:
+                added.append(product)
+            loaded += 1
+        return loaded
+    
     def get_product(self, product_id):
         """Retrieve a product by ID"""
-        return self.products.get(product_id)
+        if self.cache is not None and not self._fully_loaded:
+            return self._get_cached_product(product_id)
+        product = self.products.get(product_id)
+        if product is None and not self._fully_loaded:
+            with self._index_lock:
+                product = self.products.get(product_id)
+                if product is None:
+                    product = self.storage.load_product(product_id)
+                    if product is not None:
+                        self._attach(product)
+        return product
+    
+    def _get_cached_product(self, product_id):
+        """Read-through lookup via the LRU cache"""
+        with self._index_lock:
+            product = self.cache.get(product_id)
+            if product is None:
+                product = self.products.get(product_id)
+                if product is None:
+                    product = self.storage.load_product(product_id)
+                    if product is not None:
+                        self._attach(product)
+                if product is not None:
+                    self._cache_product(product)
+            return product
+    
+    def warm_cache(self, sales_manager, limit=None):
+        """Preload the best sellers in a SalesManager's history into the cache
+        
+        Loads up to limit products (default: the cache capacity), leaving
+        the best seller most recently used. Returns the number loaded.
+        """
+        if self.cache is None or self._fully_loaded:
+            return 0
+        limit = self.cache.capacity if limit is None else min(limit, self.cache.capacity)
+        loaded = 0
+        with self._index_lock:
+            for product_id, _ in reversed(sales_manager.get_best_sellers(limit)):
+                product = self.products.get(product_id)
+                if product is None:
+                    product = self.storage.load_product(product_id)
+                    if product is None:
+                        continue
+                    self._attach(product)
+                self._cache_product(product)
+                loaded += 1
+        return loaded
     
     def remove_product(self, product_id):
         """Remove a product from inventory"""
-        if product_id in self.products:
-            del self.products[product_id]
-            return True
-        return False
+        with self._index_lock:
+            if self.get_product(product_id) is None:
+                return False
+            if self.journal is not None:
+                self.journal.append_remove_product(product_id)
+            if self.storage is not None:
+                self.storage.delete_product(product_id)
+            if self.cache is not None:
+                self.cache.pop(product_id)
+            self._detach(self.products[product_id])
+        publish_if_subscribed(self.events, ProductRemoved, product_id)
+        return True
     
     def update_stock(self, product_id, quantity):
         """Update product stock level"""
         product = self.get_product(product_id)
         if product:
-            product.update_quantity(quantity)
+            with self._stock_locked([product_id]):
+                if self.journal is not None:
+                    self.journal.append_stock(product_id, quantity)
+                product.update_quantity(quantity)
             return True
         return False
     
+    def get_available_quantity(self, product_id):
+        """Get stock not held by reservations, or 0 for an unknown product"""
+        product = self.get_product(product_id)
+        if product is None:
+            return 0
+        return product.quantity - self._reserved.get(product_id, 0)
+    
+    def reserve(self, product_id, quantity, ttl=None):
+        """Hold stock for a cart and return the Reservation"""
+        now = time.monotonic()
+        if self._expiry_heap and self._expiry_heap[0][0] <= now:
+            self.sweep_expired(now)
+        product = self.get_product(product_id)
+        if product is None:
+            raise ValueError(f"Product ID {product_id} not found")
+        
+        with self._stock_locked([product_id]):
+            if quantity > product.quantity - self._reserved.get(product_id, 0):
+                raise ValueError(f"Insufficient stock for {product.name}")
+            expires_at = now + (self.reservation_ttl if ttl is None else ttl)
+            reservation = Reservation(next(self._reservation_ids), product_id, quantity, expires_at)
+            self._reservations[reservation.reservation_id] = reservation
+            self._reserved[product_id] = self._reserved.get(product_id, 0) + quantity
+        with self._index_lock:
+            heapq.heappush(self._expiry_heap, (expires_at, reservation.reservation_id))
+        return reservation
+    
+    def _drop_reservation(self, reservation):
+        """Remove a live reservation from the ledger (stripe lock held)"""
+        del self._reservations[reservation.reservation_id]
+        held = self._reserved[reservation.product_id] - reservation.quantity
+        if held:
+            self._reserved[reservation.product_id] = held
+        else:
+            del self._reserved[reservation.product_id]
+    
+    def release_reservation(self, reservation):
+        """Give reserved stock back; returns False if it was no longer live"""
+        with self._stock_locked([reservation.product_id]):
+            if self._reservations.get(reservation.reservation_id) is not reservation:
+                return False
+            self._drop_reservation(reservation)
+        return True
+    
+    def sweep_expired(self, now=None):
+        """Release reservations whose TTL has passed; returns how many were released"""
+        if now is None:
+            now = time.monotonic()
+        expired = []
+        with self._index_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expired.append(heapq.heappop(self._expiry_heap)[1])
+        released = 0
+        for reservation_id in expired:
+            # Committed or released reservations leave stale heap entries behind
+            reservation = self._reservations.get(reservation_id)
+            if reservation is not None and self.release_reservation(reservation):
+                released += 1
+        return released
+    
+    def _take_stock(self, totals, reservations=()):
+        """Check and apply per-product decrements, consuming live reservations"""
+        products = []
+        for product_id, quantity in totals.items():
+            product = self.get_product(product_id)
+            if product is None:
+                raise ValueError(f"Product ID {product_id} not found")
+            products.append((product, quantity))
+        
+        with self._stock_locked(totals):
+            live = [r for r in reservations if self._reservations.get(r.reservation_id) is r]
+            held = {}
+            for reservation in live:
+                held[reservation.product_id] = held.get(reservation.product_id, 0) + reservation.quantity
+            for product, quantity in products:
+                available = product.quantity - self._reserved.get(product.product_id, 0)
+                if quantity - held.get(product.product_id, 0) > available:
+                    raise ValueError(f"Insufficient stock for {product.name}")
+            for reservation in live:
+                self._drop_reservation(reservation)
+            for product, quantity in products:
+                product.update_quantity(-quantity)
+        return True
+    
+    def decrement_stock(self, quantities):
+        """Atomically check and take stock for (product_id, quantity) pairs
+        
+        Either every decrement is applied or, if any product is unknown or
+        short of unreserved stock, none are and ValueError is raised.
+        """
+        totals = {}
+        for product_id, quantity in quantities:
+            totals[product_id] = totals.get(product_id, 0) + quantity
+        return self._take_stock(totals)
+    
+    def return_stock(self, quantities):
+        """Give back stock taken by decrement_stock or commit_reservations
+        
+        Undoes a checkout that could not be recorded, for (product_id,
+        quantity) pairs. Like the decrement it undoes, it is not journaled.
+        """
+        totals = {}
+        for product_id, quantity in quantities:
+            totals[product_id] = totals.get(product_id, 0) + quantity
+        products = [(self.get_product(product_id), quantity) for product_id, quantity in totals.items()]
+        with self._stock_locked(totals):
+            for product, quantity in products:
+                product.update_quantity(quantity)
+    
+    def commit_reservations(self, reservations):
+        """Atomically turn reservations into stock decrements
+        
+        Reservations that expired in the meantime are re-checked against
+        unreserved stock; if any falls short nothing is applied.
+        """
+        totals = {}
+        for reservation in reservations:
+            totals[reservation.product_id] = totals.get(reservation.product_id, 0) + reservation.quantity
+        return self._take_stock(totals, reservations)
+    
     def get_all_products(self):
         """Get list of all products"""
-        return list(self.products.values())
+        self._ensure_loaded()
+        with self._index_lock:
+            return list(self.products.values())
     
     def search_by_category(self, category):
         """Search products by category"""
-        return [p for p in self.products.values() if p.category == category]
+        self._ensure_loaded()
+        with self._index_lock:
+            return list(self._by_category.get(category, {}).values())
     
     def get_low_stock_products(self, threshold=10):
-        """Get products with stock below threshold"""
-        return [p for p in self.products.values() if p.quantity < threshold]
+        """Get products with stock below threshold, lowest stock first"""
+        self._ensure_loaded()
+        with self._index_lock:
+            end = bisect.bisect_left(self._quantity_levels, threshold)
+            return [p for level in self._quantity_levels[:end] for p in self._by_quantity[level].values()]
+    
+    def get_products_by_stock_range(self, min_quantity=None, max_quantity=None):
+        """Get products with min_quantity <= stock <= max_quantity, lowest stock first"""
+        self._ensure_loaded()
+        with self._index_lock:
+            levels = self._quantity_levels
+            start = 0 if min_quantity is None else bisect.bisect_left(levels, min_quantity)
+            end = len(levels) if max_quantity is None else bisect.bisect_right(levels, max_quantity)
+            return [p for level in levels[start:end] for p in self._by_quantity[level].values()]
+    
+    def search(self, query, limit=10):
+        """Find products by the words of their name or category, best matches first
+        
+        The last query word also matches as a prefix, and words one typo
+        away (one inserted, deleted or changed character) still match.
+        """
+        self._ensure_loaded()
+        with self._index_lock:
+            if self._search_index is None:
+                self._search_index = ProductSearchIndex()
+                for product in self.products.values():
+                    self._search_index.add(product)
+            return [self.products[product_id] for product_id, _ in self._search_index.search(query, limit)]
+    
+    def get_products_page(self, cursor=None, limit=100, **filters):
+        """Get up to limit matching products after cursor, in product ID order
+        
+        Returns (products, next_cursor); next_cursor is None once the
+        catalog is exhausted. A cursor is a product ID, so pages stay
+        consistent when products are added or removed between requests.
+        Filters are those accepted by product_filter().
+        """
+        matches = product_filter(**filters)
+        self._ensure_loaded()
+        with self._index_lock:
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self.products)
+            ids = self._sorted_ids
+            catalog = self.products
+            position = 0 if cursor is None else bisect.bisect_right(ids, cursor)
+            page = []
+            while position < len(ids) and len(page) < limit:
+                product = catalog[ids[position]]
+                position += 1
+                if matches(product):
+                    page.append(product)
+            return page, (ids[position - 1] if position < len(ids) else None)
+    
+    def iter_products(self, page_size=1000, **filters):
+        """Lazily iterate over matching products in product ID order, a page at a time"""
+        cursor = None
+        while True:
+            page, cursor = self.get_products_page(cursor, page_size, **filters)
+            yield from page
+            if cursor is None:
+                return
     
     def get_total_inventory_value(self):
         """Calculate total value of all inventory"""
-        return sum(p.calculate_total_value() for p in self.products.values())
+        self._ensure_loaded()
+        with self._index_lock:
+            return sum(p.price_cents * p.quantity for p in self.products.values()) / 100
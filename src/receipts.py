@@ -0,0 +1,158 @@
+"""
+Receipt Rendering Module
+Precompiled receipt templates (text, HTML, ESC/POS) with streaming batch output
+"""
+
+import html
+
+from product import to_cents
+
+
+class ReceiptTemplate:
+    """Precompiled receipt layout
+    
+    header, items_end and footer are static segments written as-is. The
+    per-sale segments are %-format strings taking, in order:
+    sale_info (sale_id, date), item (name, quantity, subtotal),
+    discount (discount) and total (total, payment_method).
+    escape, when set, is applied to names, sale IDs and payment methods.
+    """
+    
+    def __init__(self, header, sale_info, item, items_end, discount, total, footer, escape=None):
+        self.header = header
+        self.sale_info = sale_info
+        self.item = item
+        self.items_end = items_end
+        self.discount = discount
+        self.total = total
+        self.footer = footer
+        self.escape = escape
+
+
+_RULE = "=" * 50
+_LINE = "-" * 50
+
+TEXT_TEMPLATE = ReceiptTemplate(
+    header=f"\n{_RULE}\n{'SUPERMARKET RECEIPT':^50}\n{_RULE}\n",
+    sale_info=f"Sale ID: %s\nDate: %s\n{_LINE}\n",
+    item="%s x%s = $%.2f\n",
+    items_end=f"{_LINE}\n",
+    discount="Discount: -$%.2f\n",
+    total="Total: $%.2f\nPayment Method: %s\n",
+    footer=f"{_RULE}\n{'Thank you for shopping with us!':^50}\n{_RULE}\n",
+)
+
+HTML_TEMPLATE = ReceiptTemplate(
+    header='<div class="receipt">\n<h1>SUPERMARKET RECEIPT</h1>\n',
+    sale_info='<p class="sale">Sale ID: %s<br>Date: %s</p>\n<table class="items">\n',
+    item="<tr><td>%s</td><td>x%s</td><td>$%.2f</td></tr>\n",
+    items_end="</table>\n",
+    discount='<p class="discount">Discount: -$%.2f</p>\n',
+    total='<p class="total">Total: $%.2f</p>\n<p class="payment">Payment Method: %s</p>\n',
+    footer='<p class="thanks">Thank you for shopping with us!</p>\n</div>\n',
+    escape=html.escape,
+)
+
+# ESC/POS control sequences for 80 mm thermal printers (48 columns); encode
+# the rendered text with the printer's code page, e.g. "cp437"
+_ESC = "\x1b"
+_GS = "\x1d"
+_CENTER = _ESC + "a\x01"
+_LEFT = _ESC + "a\x00"
+_BOLD = _ESC + "E\x01"
+_PLAIN = _ESC + "E\x00"
+
+ESCPOS_TEMPLATE = ReceiptTemplate(
+    header=f"{_ESC}@{_CENTER}{_BOLD}SUPERMARKET RECEIPT\n{_PLAIN}{_LEFT}",
+    sale_info="Sale ID: %s\nDate: %s\n" + "-" * 48 + "\n",
+    item="%s x%s = $%.2f\n",
+    items_end="-" * 48 + "\n",
+    discount="Discount: -$%.2f\n",
+    total=f"{_BOLD}Total: $%.2f\n{_PLAIN}Payment Method: %s\n",
+    footer=f"{_CENTER}Thank you for shopping with us!\n{_LEFT}{_ESC}d\x03{_GS}V\x00",
+)
+
+
+class ReceiptRenderer:
+    """Renders sales through a ReceiptTemplate into strings or a text sink
+    
+    Rendered item lines are memoized by (name, quantity, subtotal), as the
+    same products sell in the same quantities over and over; the cache is
+    cleared once it holds line_cache_size lines.
+    
+    Archived sales keep only product IDs for their line items; products,
+    a ProductManager, names them, and unknown IDs are printed as-is.
+    """
+    
+    def __init__(self, template=TEXT_TEMPLATE, line_cache_size=65536, products=None):
+        self.template = template
+        self.line_cache_size = line_cache_size
+        self.products = products
+        self._lines = {}
+    
+    def _get_name(self, product_id):
+        product = self.products.get_product(product_id) if self.products is not None else None
+        return product.name if product is not None else product_id
+    
+    def _line_keys(self, sale):
+        """Get (name, quantity, subtotal cents) for each line of a Sale or ArchivedSale"""
+        if hasattr(sale, "get_line_items"):
+            return [(self._get_name(product_id), quantity, to_cents(unit_price) * quantity)
+                    for product_id, quantity, unit_price in sale.get_line_items()]
+        return [(item.product.name, item.quantity, item.subtotal_cents) for item in sale.items]
+    
+    def render(self, sale):
+        """Render one sale's receipt as a string"""
+        template = self.template
+        escape = template.escape
+        sale_id, payment_method = sale.sale_id, sale.payment_method
+        if escape is not None:
+            sale_id, payment_method = escape(str(sale_id)), escape(str(payment_method))
+        parts = [template.header, template.sale_info % (sale_id, sale.timestamp.isoformat(" ", "seconds"))]
+        lines = self._lines
+        for key in self._line_keys(sale):
+            line = lines.get(key)
+            if line is None:
+                if len(lines) >= self.line_cache_size:
+                    lines.clear()
+                name, quantity, subtotal_cents = key
+                if escape is not None:
+                    name = escape(name)
+                line = lines[key] = template.item % (name, quantity, subtotal_cents / 100)
+            parts.append(line)
+        parts.append(template.items_end)
+        if sale.discount_cents > 0:
+            parts.append(template.discount % (sale.discount_cents / 100))
+        parts.append(template.total % (sale.total_cents / 100, payment_method))
+        parts.append(template.footer)
+        return "".join(parts)
+    
+    def write(self, sale, sink):
+        """Write one sale's receipt to a text sink such as an io.TextIOBase"""
+        sink.write(self.render(sale))
+    
+    def iter_receipts(self, sales):
+        """Lazily render receipts for an iterable of sales"""
+        render = self.render
+        for sale in sales:
+            yield render(sale)
+    
+    def write_batch(self, sales, sink, separator="", buffer_receipts=256):
+        """Stream receipts for an iterable of sales to a text sink
+        
+        Receipts are joined and written buffer_receipts at a time, so large
+        batches make few sink calls without holding every receipt in
+        memory. Returns the number of receipts written.
+        """
+        render = self.render
+        buffered = []
+        count = 0
+        for sale in sales:
+            buffered.append(render(sale))
+            count += 1
+            if len(buffered) >= buffer_receipts:
+                sink.write(separator.join(buffered) + separator)
+                buffered.clear()
+        if buffered:
+            sink.write(separator.join(buffered) + separator)
+        return count
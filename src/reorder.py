@@ -0,0 +1,281 @@
+"""
+Reorder Monitor Module
+Per-SKU reorder points tracked incrementally from stock events, with
+order suggestions from recent sales velocity
+"""
+
+import bisect
+import heapq
+import itertools
+import math
+import threading
+from datetime import date, datetime, time, timedelta
+
+from events import CategoryChanged, EventBus, ProductAdded, ProductRemoved, SaleRecorded, StockChanged
+from sales import Sale
+
+
+class ReorderSuggestion:
+    """How much of one product to order, and why"""
+    
+    __slots__ = ("product_id", "name", "quantity", "reorder_point", "daily_velocity", "days_of_stock",
+                 "order_quantity")
+    
+    def __init__(self, product_id, name, quantity, reorder_point, daily_velocity, days_of_stock, order_quantity):
+        self.product_id = product_id
+        self.name = name
+        self.quantity = quantity
+        self.reorder_point = reorder_point
+        self.daily_velocity = daily_velocity
+        # None when the product has not sold in the lookback window
+        self.days_of_stock = days_of_stock
+        self.order_quantity = order_quantity
+
+
+class ReorderMonitor:
+    """Keeps the SKUs at or near their reorder point ranked by shortfall, updated as stock changes
+    
+    A product needs reordering once its stock is at or below its reorder
+    point: its own, else its category's, else reorder_point. Products
+    within margin units above the point are tracked as near. The monitor
+    subscribes to the managers' EventBus (attaching one to a manager that
+    has none), so every update_stock, update_quantity and checkout moves
+    a SKU in or out of the ranking as it happens, and listing the k flagged
+    SKUs never rescans the catalog.
+    
+    Units sold per SKU are summed per day over the last lookback_days from
+    recorded sales; a suggestion orders enough to cover cover_days of that
+    velocity on top of the reorder point.
+    """
+    
+    def __init__(self, product_manager, sales_manager=None, reorder_point=10, margin=0, lookback_days=28,
+                 cover_days=14, today=None):
+        self.product_manager = product_manager
+        self.sales_manager = sales_manager
+        self.default_reorder_point = reorder_point
+        self.margin = margin
+        self.lookback_days = lookback_days
+        self.cover_days = cover_days
+        self._points = {}
+        self._category_points = {}
+        # Tracked products bucketed by stock minus reorder point, with the
+        # levels kept sorted, so the flagged list comes out most short first
+        # without a sort or a scan of the catalog
+        self._by_shortfall = {}
+        self._shortfall_levels = []
+        self._shortfall = {}
+        # Day -> {product_id: units} for the lookback window, and the
+        # window's running total per product
+        self._day_units = {}
+        self._window_units = {}
+        self._today = None
+        self._lock = threading.Lock()
+        
+        with self._lock:
+            for product in product_manager.get_all_products():
+                self._evaluate(product, product.quantity)
+        if product_manager.events is None:
+            product_manager.events = EventBus()
+        self._subscriptions = [
+            # A new category can bring a new reorder point, so it re-evaluates like a stock change
+            product_manager.events.subscribe((StockChanged, CategoryChanged), self._on_stock_changed),
+            product_manager.events.subscribe((ProductAdded, ProductRemoved), self._on_catalog_changed),
+        ]
+        if sales_manager is not None:
+            if sales_manager.events is None:
+                sales_manager.events = EventBus()
+            self._subscriptions.append(sales_manager.events.subscribe(SaleRecorded, self._on_sale_recorded))
+            today = today or date.today()
+            start = datetime.combine(today - timedelta(days=lookback_days - 1), time())
+            with self._lock:
+                self._advance(today)
+                for sale in sales_manager.iter_sales(start):
+                    self._add_sale(sale)
+    
+    def close(self):
+        """Stop following stock and sale events"""
+        for subscription in self._subscriptions:
+            subscription.close()
+        self._subscriptions = []
+    
+    def _on_stock_changed(self, event):
+        product = self.product_manager.get_product(event.product_id)
+        if product is None:
+            return
+        # Most changes leave a well stocked SKU well stocked; settle those
+        # without the lock. Point changes re-evaluate under the lock, so a
+        # racing point update is never missed
+        if event.product_id not in self._shortfall and product.quantity - self._point_for(product) > self.margin:
+            return
+        with self._lock:
+            # Read the level now rather than trusting the event, as events
+            # from concurrent lanes may arrive out of order
+            self._evaluate(product, product.quantity)
+    
+    def _on_catalog_changed(self, event):
+        with self._lock:
+            if type(event) is ProductAdded:
+                self._evaluate(event.product, event.product.quantity)
+            else:
+                self._untrack(event.product_id)
+    
+    def _on_sale_recorded(self, event):
+        with self._lock:
+            self._add_sale(event.sale)
+    
+    # -- reorder points ----------------------------------------------------
+    
+    def _point_for(self, product):
+        point = self._points.get(product.product_id)
+        if point is None:
+            point = self._category_points.get(product.category, self.default_reorder_point)
+        return point
+    
+    def get_reorder_point(self, product_id):
+        """Get the reorder point that applies to a product, or None if it is unknown"""
+        product = self.product_manager.get_product(product_id)
+        return self._point_for(product) if product is not None else None
+    
+    def set_reorder_point(self, product_id, point):
+        """Set a product's own reorder point; None falls back to its category's"""
+        product = self.product_manager.get_product(product_id)
+        if product is None:
+            raise ValueError(f"Product ID {product_id} not found")
+        with self._lock:
+            if point is None:
+                self._points.pop(product_id, None)
+            else:
+                self._points[product_id] = point
+            self._evaluate(product, product.quantity)
+    
+    def set_category_reorder_point(self, category, point):
+        """Set the reorder point for a category's products without one of their own"""
+        products = self.product_manager.search_by_category(category)
+        with self._lock:
+            if point is None:
+                self._category_points.pop(category, None)
+            else:
+                self._category_points[category] = point
+            for product in products:
+                self._evaluate(product, product.quantity)
+    
+    # -- the flagged levels -----------------------------------------------
+    
+    def _evaluate(self, product, quantity):
+        """File a product under its shortfall level, or drop it once well stocked (lock held)"""
+        product_id = product.product_id
+        shortfall = quantity - self._point_for(product)
+        tracked = self._shortfall.get(product_id)
+        if tracked is not None:
+            if tracked == shortfall:
+                # Keep the resident copy, which may have been reloaded
+                self._by_shortfall[shortfall][product_id] = product
+                return
+            self._untrack(product_id)
+        if shortfall <= self.margin:
+            bucket = self._by_shortfall.get(shortfall)
+            if bucket is None:
+                bucket = self._by_shortfall[shortfall] = {}
+                bisect.insort(self._shortfall_levels, shortfall)
+            bucket[product_id] = product
+            self._shortfall[product_id] = shortfall
+    
+    def _untrack(self, product_id):
+        shortfall = self._shortfall.pop(product_id, None)
+        if shortfall is None:
+            return
+        bucket = self._by_shortfall[shortfall]
+        del bucket[product_id]
+        if not bucket:
+            del self._by_shortfall[shortfall]
+            del self._shortfall_levels[bisect.bisect_left(self._shortfall_levels, shortfall)]
+    
+    def _tracked_levels(self, include_near):
+        """Shortfall levels to list, most short first (lock held)"""
+        levels = self._shortfall_levels
+        return levels if include_near else levels[:bisect.bisect_right(levels, 0)]
+    
+    def get_flagged(self, include_near=False, limit=None):
+        """Get products at or below their reorder point, furthest below first
+        
+        With include_near, products within margin above their point are
+        included too. Costs O(k) in the k products returned.
+        """
+        with self._lock:
+            products = (p for level in self._tracked_levels(include_near)
+                        for p in self._by_shortfall[level].values())
+            return list(itertools.islice(products, limit))
+    
+    def get_flagged_count(self, include_near=False):
+        """Count the products at (or, with include_near, near) their reorder point"""
+        with self._lock:
+            return sum(len(self._by_shortfall[level]) for level in self._tracked_levels(include_near))
+    
+    # -- sales velocity ----------------------------------------------------
+    
+    def _advance(self, today):
+        """Slide the velocity window forward to end on today (lock held)"""
+        if self._today is not None and today <= self._today:
+            return
+        self._today = today
+        first = today - timedelta(days=self.lookback_days - 1)
+        for day in [day for day in self._day_units if day < first]:
+            for product_id, units in self._day_units.pop(day).items():
+                remaining = self._window_units[product_id] - units
+                if remaining:
+                    self._window_units[product_id] = remaining
+                else:
+                    del self._window_units[product_id]
+    
+    def _add_sale(self, sale):
+        """Count a recorded sale's units into its day of the window (lock held)"""
+        day = sale.timestamp.date()
+        self._advance(day)
+        if day <= self._today - timedelta(days=self.lookback_days):
+            return
+        if isinstance(sale, Sale):
+            lines = ((item.product.product_id, item.quantity) for item in sale.items)
+        else:
+            lines = ((product_id, quantity) for product_id, quantity, _ in sale.get_line_items())
+        day_units = self._day_units.setdefault(day, {})
+        window_units = self._window_units
+        for product_id, quantity in lines:
+            day_units[product_id] = day_units.get(product_id, 0) + quantity
+            window_units[product_id] = window_units.get(product_id, 0) + quantity
+    
+    def get_daily_velocity(self, product_id, today=None):
+        """Average units of a product sold per day over the lookback window"""
+        with self._lock:
+            if today is not None:
+                self._advance(today)
+            return self._window_units.get(product_id, 0) / self.lookback_days
+    
+    def get_suggestions(self, today=None, include_near=False, limit=None):
+        """Get ReorderSuggestions for the flagged products, fewest days of stock first
+        
+        Products that have not sold in the window come last, most short
+        of their reorder point first.
+        """
+        with self._lock:
+            if today is not None:
+                self._advance(today)
+            flagged = [(p, self._window_units.get(p.product_id, 0)) for level in self._tracked_levels(include_near)
+                       for p in self._by_shortfall[level].values()]
+        suggestions = []
+        for product, units in flagged:
+            point = self._point_for(product)
+            quantity = product.quantity
+            velocity = units / self.lookback_days
+            days_of_stock = quantity / velocity if velocity else None
+            order_quantity = max(0, point + math.ceil(velocity * self.cover_days) - quantity)
+            suggestions.append(ReorderSuggestion(product.product_id, product.name, quantity, point, velocity,
+                                                 days_of_stock, order_quantity))
+        
+        def urgency(suggestion):
+            if suggestion.days_of_stock is None:
+                return (1, suggestion.quantity - suggestion.reorder_point)
+            return (0, suggestion.days_of_stock)
+        
+        if limit is None:
+            return sorted(suggestions, key=urgency)
+        return heapq.nsmallest(limit, suggestions, key=urgency)
@@ -0,0 +1,194 @@
+"""
+End-of-Day Reporting Module
+Consolidated close-of-day report computed in parallel over compact column chunks
+"""
+
+import bisect
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from analytics import SalesColumns
+from sales import SalesSummary
+
+
+_DAY = 24 * 3600 * 10**6
+# date.fromordinal(_EPOCH_ORDINAL + n) is n days after 1970-01-01
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class ReportPartial:
+    """Mergeable aggregates over one chunk of sales or products
+    
+    Money stays in integer cents and every field is a sum or a count keyed
+    by a code, so partials merge exactly in any order.
+    """
+    
+    def __init__(self):
+        self.totals = SalesSummary()
+        # Day number since 1970-01-01 or payment method code -> SalesSummary
+        self.by_day = {}
+        self.by_payment = {}
+        # Product code -> units sold
+        self.units = {}
+        self.product_count = 0
+        self.low_stock_count = 0
+        self.inventory_cents = 0
+        # Category code -> stock value in cents
+        self.inventory_by_category = {}
+    
+    def merge(self, other):
+        """Fold another partial into this one"""
+        self.totals.add_totals(other.totals.count, other.totals.revenue_cents, other.totals.discount_cents)
+        for mine, theirs in ((self.by_day, other.by_day), (self.by_payment, other.by_payment)):
+            for key, summary in theirs.items():
+                mine.setdefault(key, SalesSummary()).add_totals(summary.count, summary.revenue_cents,
+                                                                summary.discount_cents)
+        for code, units in other.units.items():
+            self.units[code] = self.units.get(code, 0) + units
+        self.product_count += other.product_count
+        self.low_stock_count += other.low_stock_count
+        self.inventory_cents += other.inventory_cents
+        for code, cents in other.inventory_by_category.items():
+            self.inventory_by_category[code] = self.inventory_by_category.get(code, 0) + cents
+        return self
+
+
+def aggregate_sales(timestamps, total_cents, discount_cents, payment_codes, item_products, quantities):
+    """Aggregate one chunk of sale and line-item columns into a ReportPartial"""
+    partial = ReportPartial()
+    by_day = partial.by_day
+    by_payment = partial.by_payment
+    for micros, total, discount, payment in zip(timestamps, total_cents, discount_cents, payment_codes):
+        day = micros // _DAY
+        summary = by_day.get(day)
+        if summary is None:
+            summary = by_day[day] = SalesSummary()
+        summary.add_totals(1, total, discount)
+        summary = by_payment.get(payment)
+        if summary is None:
+            summary = by_payment[payment] = SalesSummary()
+        summary.add_totals(1, total, discount)
+    for summary in by_day.values():
+        partial.totals.add_totals(summary.count, summary.revenue_cents, summary.discount_cents)
+    units = partial.units
+    for product, quantity in zip(item_products, quantities):
+        units[product] = units.get(product, 0) + quantity
+    return partial
+
+
+def aggregate_products(price_cents, quantities, category_codes, low_stock_threshold):
+    """Aggregate one chunk of product columns into a ReportPartial"""
+    partial = ReportPartial()
+    by_category = partial.inventory_by_category
+    for price, quantity, category in zip(price_cents, quantities, category_codes):
+        value = price * quantity
+        partial.inventory_cents += value
+        by_category[category] = by_category.get(category, 0) + value
+        if quantity < low_stock_threshold:
+            partial.low_stock_count += 1
+    partial.product_count = len(price_cents)
+    return partial
+
+
+class ProductColumns:
+    """Flat price, stock and category-code arrays over a ProductManager's catalog"""
+    
+    def __init__(self, product_manager):
+        self.price_cents = array("q")
+        self.quantities = array("q")
+        self.category_codes = array("i")
+        self.categories = []
+        positions = {}
+        for product in product_manager.get_all_products():
+            code = positions.get(product.category)
+            if code is None:
+                code = positions[product.category] = len(self.categories)
+                self.categories.append(product.category)
+            self.price_cents.append(product.price_cents)
+            self.quantities.append(product.quantity)
+            self.category_codes.append(code)
+    
+    def __len__(self):
+        return len(self.price_cents)
+
+
+def _sales_chunks(columns, chunk_size):
+    """Yield aggregate_sales arguments for consecutive runs of chunk_size sales"""
+    for lo in range(0, len(columns), chunk_size):
+        hi = min(lo + chunk_size, len(columns))
+        # Line items are stored in sale order, so each chunk's items are contiguous
+        item_lo = bisect.bisect_left(columns.item_sales, lo)
+        item_hi = bisect.bisect_left(columns.item_sales, hi)
+        yield (columns.timestamps[lo:hi], columns.total_cents[lo:hi], columns.discount_cents[lo:hi],
+               columns.payment_codes[lo:hi], columns.item_products[item_lo:item_hi],
+               columns.quantities[item_lo:item_hi])
+
+
+def _product_chunks(columns, chunk_size, low_stock_threshold):
+    for lo in range(0, len(columns), chunk_size):
+        hi = lo + chunk_size
+        yield (columns.price_cents[lo:hi], columns.quantities[lo:hi], columns.category_codes[lo:hi],
+               low_stock_threshold)
+
+
+def build_end_of_day_report(sales_manager, product_manager=None, workers=None, chunk_size=50_000, top_n=10,
+                            low_stock_threshold=10, sales_columns=None, executor=None):
+    """Compute the consolidated close-of-day report
+    
+    Sales and products are flattened into array columns and cut into
+    chunks of chunk_size rows; the chunks are pickled to a process pool of
+    workers processes (or to executor, if given) as compact arrays rather
+    than Sale objects, aggregated into ReportPartials, and merged. With
+    workers=1 everything runs in this process. Pass sales_columns, e.g.
+    from SalesColumns.from_manager(..., follow=True), to skip flattening
+    every sale for each report.
+    """
+    if sales_columns is None:
+        sales_columns = SalesColumns.from_manager(sales_manager, product_manager)
+    product_columns = ProductColumns(product_manager) if product_manager is not None else None
+    with sales_columns.lock:
+        jobs = [(aggregate_sales, chunk) for chunk in _sales_chunks(sales_columns, chunk_size)]
+    if product_columns is not None:
+        jobs += [(aggregate_products, chunk)
+                 for chunk in _product_chunks(product_columns, chunk_size, low_stock_threshold)]
+    
+    report = ReportPartial()
+    if executor is None and workers == 1:
+        for function, chunk in jobs:
+            report.merge(function(*chunk))
+    else:
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(function, *chunk) for function, chunk in jobs]
+            for future in futures:
+                report.merge(future.result())
+        finally:
+            if executor is None:
+                pool.shutdown()
+    
+    payment_methods = sales_columns.payment_methods.values
+    product_ids = sales_columns.products.values
+    days = sorted(report.by_day)
+    result = {
+        "sales_count": report.totals.count,
+        "total_revenue": report.totals.revenue,
+        "total_discounts": report.totals.discounts,
+        "average_sale_value": report.totals.get_average(),
+        "revenue_by_date": {date.fromordinal(_EPOCH_ORDINAL + day): report.by_day[day].revenue for day in days},
+        "sales_count_by_date": {date.fromordinal(_EPOCH_ORDINAL + day): report.by_day[day].count for day in days},
+        "revenue_by_payment_method": {payment_methods[code]: summary.revenue
+                                      for code, summary in report.by_payment.items()},
+        "top_products": [(product_ids[code], units) for code, units in
+                         heapq.nlargest(top_n, report.units.items(), key=lambda pair: pair[1])],
+    }
+    if product_columns is not None:
+        result.update({
+            "product_count": report.product_count,
+            "low_stock_count": report.low_stock_count,
+            "inventory_value": report.inventory_cents / 100,
+            "inventory_value_by_category": {product_columns.categories[code]: cents / 100
+                                            for code, cents in report.inventory_by_category.items()},
+        })
+    return result
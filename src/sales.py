@@ -3,16 +3,35 @@ Sales Management Module
 Handles point-of-sale transactions and sales records
 """
 
-from datetime import datetime
+import bisect
+import heapq
+import threading
+from array import array
+from datetime import datetime, time, timedelta
+
+from events import SaleCompleted, SaleRecorded, publish_if_subscribed
+from product import to_cents
+from receipts import ReceiptRenderer
+
+
+# Shared renderer behind Sale.get_receipt
+_TEXT_RECEIPTS = ReceiptRenderer()
 
 
 class SaleItem:
     """Individual item in a sale transaction"""
     
+    __slots__ = ("product", "quantity", "subtotal_cents")
+    
     def __init__(self, product, quantity):
         self.product = product
         self.quantity = quantity
-        self.subtotal = product.price * quantity
+        self.subtotal_cents = product.price_cents * quantity
+    
+    @property
+    def subtotal(self):
+        """Line subtotal in dollars"""
+        return self.subtotal_cents / 100
     
     def __str__(self):
         return f"{self.product.name} x{self.quantity} = ${self.subtotal:.2f}"
@@ -21,108 +40,644 @@ class SaleItem:
 class Sale:
     """Sale transaction"""
     
-    def __init__(self, sale_id):
+    __slots__ = ("sale_id", "items", "timestamp", "total_cents", "payment_method", "discount_cents",
+                 "inventory", "reservations", "events", "completed")
+    
+    def __init__(self, sale_id, inventory=None, events=None):
         self.sale_id = sale_id
         self.items = []
         self.timestamp = datetime.now()
-        self.total = 0
+        self.total_cents = 0
         self.payment_method = None
-        self.discount_applied = 0
+        self.discount_cents = 0
+        # ProductManager that holds stock for this cart from add_item until
+        # complete_sale commits or cancel_sale releases it
+        self.inventory = inventory
+        self.reservations = []
+        # Optional EventBus told when the sale completes
+        self.events = events
+        # Set once the sale's stock has been taken
+        self.completed = False
+    
+    @property
+    def total(self):
+        """Sale total in dollars"""
+        return self.total_cents / 100
+    
+    @total.setter
+    def total(self, value):
+        self.total_cents = to_cents(value)
+    
+    @property
+    def discount_applied(self):
+        """Discount given on this sale in dollars"""
+        return self.discount_cents / 100
+    
+    @discount_applied.setter
+    def discount_applied(self, value):
+        self.discount_cents = to_cents(value)
     
     def add_item(self, product, quantity):
         """Add item to shopping cart"""
-        if quantity > product.quantity:
+        if self.inventory is not None:
+            self.reservations.append(self.inventory.reserve(product.product_id, quantity))
+        elif quantity > product.quantity:
             raise ValueError(f"Insufficient stock for {product.name}")
         
         item = SaleItem(product, quantity)
         self.items.append(item)
-        self.total += item.subtotal
+        self.total_cents += item.subtotal_cents
         return item
     
     def apply_discount(self, discount_percent):
-        """Apply percentage discount to total"""
+        """Apply percentage discount to total
+        
+        The percentage is taken to basis points and the discount is rounded
+        half up to a whole cent, so the total stays an exact cent amount.
+        """
         if not 0 <= discount_percent <= 100:
             raise ValueError("Discount must be between 0 and 100")
         
-        discount_amount = self.total * (discount_percent / 100)
-        self.total -= discount_amount
-        self.discount_applied = discount_amount
-        return discount_amount
+        basis_points = int(round(discount_percent * 100))
+        discount_cents = (self.total_cents * basis_points + 5000) // 10000
+        self.total_cents -= discount_cents
+        self.discount_cents = discount_cents
+        return discount_cents / 100
     
     def complete_sale(self, payment_method):
         """Complete the sale and update inventory"""
-        self.payment_method = payment_method
-        
-        for item in self.items:
-            item.product.update_quantity(-item.quantity)
+        if self.inventory is not None:
+            self.inventory.commit_reservations(self.reservations)
+            self.reservations.clear()
+        else:
+            for item in self.items:
+                item.product.update_quantity(-item.quantity)
         
+        self.completed = True
+        self.payment_method = payment_method
+        publish_if_subscribed(self.events, SaleCompleted, self)
         return True
     
     def cancel_sale(self):
         """Cancel the sale"""
+        for reservation in self.reservations:
+            self.inventory.release_reservation(reservation)
+        self.reservations.clear()
         self.items.clear()
-        self.total = 0
-        self.discount_applied = 0
+        self.total_cents = 0
+        self.discount_cents = 0
         return True
     
     def get_receipt(self):
         """Generate a receipt string"""
-        receipt = f"\n{'='*50}\n"
-        receipt += f"{'SUPERMARKET RECEIPT':^50}\n"
-        receipt += f"{'='*50}\n"
-        receipt += f"Sale ID: {self.sale_id}\n"
-        receipt += f"Date: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        receipt += f"{'-'*50}\n"
-        
-        for item in self.items:
-            receipt += f"{item}\n"
-        
-        receipt += f"{'-'*50}\n"
-        
-        if self.discount_applied > 0:
-            receipt += f"Discount: -${self.discount_applied:.2f}\n"
-        
-        receipt += f"Total: ${self.total:.2f}\n"
-        receipt += f"Payment Method: {self.payment_method}\n"
-        receipt += f"{'='*50}\n"
-        receipt += f"{'Thank you for shopping with us!':^50}\n"
-        receipt += f"{'='*50}\n"
-        
-        return receipt
+        return _TEXT_RECEIPTS.render(self)
+    
+    def archive(self, columns):
+        """Convert a completed sale into its compact ArchivedSale form"""
+        return ArchivedSale(self, columns)
+
+
+class LineItemColumns:
+    """Parallel array columns holding the line items of archived sales"""
+    
+    __slots__ = ("product_ids", "_positions", "product_indexes", "quantities", "unit_prices")
+    
+    def __init__(self):
+        self.product_ids = []
+        self._positions = {}
+        self.product_indexes = array("i")
+        self.quantities = array("i")
+        # Unit prices in integer cents
+        self.unit_prices = array("q")
+    
+    def __len__(self):
+        return len(self.quantities)
+    
+    def get_product_index(self, product_id):
+        """Get the integer index for a product ID, assigning one if new"""
+        index = self._positions.get(product_id)
+        if index is None:
+            index = self._positions[product_id] = len(self.product_ids)
+            self.product_ids.append(product_id)
+        return index
+    
+    def append_items(self, items):
+        """Append sale items to the columns and return the start offset"""
+        start = len(self.quantities)
+        for item in items:
+            self.product_indexes.append(self.get_product_index(item.product.product_id))
+            self.quantities.append(item.quantity)
+            self.unit_prices.append(item.product.price_cents)
+        return start
+
+
+class ArchivedSale:
+    """Completed sale whose line items live in shared LineItemColumns"""
+    
+    __slots__ = ("sale_id", "timestamp", "total_cents", "payment_method", "discount_cents",
+                 "columns", "start", "count")
+    
+    def __init__(self, sale, columns):
+        self.sale_id = sale.sale_id
+        self.timestamp = sale.timestamp
+        self.total_cents = sale.total_cents
+        self.payment_method = sale.payment_method
+        self.discount_cents = sale.discount_cents
+        self.columns = columns
+        self.start = columns.append_items(sale.items)
+        self.count = len(sale.items)
+    
+    @classmethod
+    def from_fields(cls, sale_id, timestamp, total_cents, payment_method, discount_cents, columns, start, count):
+        """Build an archived sale over line items already stored in columns"""
+        sale = cls.__new__(cls)
+        sale.sale_id = sale_id
+        sale.timestamp = timestamp
+        sale.total_cents = total_cents
+        sale.payment_method = payment_method
+        sale.discount_cents = discount_cents
+        sale.columns = columns
+        sale.start = start
+        sale.count = count
+        return sale
+    
+    @property
+    def total(self):
+        """Sale total in dollars"""
+        return self.total_cents / 100
+    
+    @property
+    def discount_applied(self):
+        """Discount given on this sale in dollars"""
+        return self.discount_cents / 100
+    
+    def __len__(self):
+        return self.count
+    
+    def get_line_items(self):
+        """Get (product_id, quantity, unit_price) tuples for each line item"""
+        columns = self.columns
+        ids = columns.product_ids
+        window = slice(self.start, self.start + self.count)
+        return [(ids[index], quantity, cents / 100)
+                for index, quantity, cents in zip(columns.product_indexes[window],
+                                                  columns.quantities[window],
+                                                  columns.unit_prices[window])]
+    
+    def move_to(self, columns):
+        """Copy this sale's line items into other LineItemColumns and point at them"""
+        old = self.columns
+        start = len(columns)
+        for index in range(self.start, self.start + self.count):
+            columns.product_indexes.append(columns.get_product_index(old.product_ids[old.product_indexes[index]]))
+            columns.quantities.append(old.quantities[index])
+            columns.unit_prices.append(old.unit_prices[index])
+        self.columns = columns
+        self.start = start
+
+
+class SalesSummary:
+    """Running totals for a group of recorded sales"""
+    
+    def __init__(self):
+        self.count = 0
+        self.revenue_cents = 0
+        self.discount_cents = 0
+    
+    def add(self, sale):
+        """Fold a sale into the totals"""
+        self.count += 1
+        self.revenue_cents += sale.total_cents
+        self.discount_cents += sale.discount_cents
+    
+    def add_totals(self, count, revenue_cents, discount_cents):
+        """Fold in totals summarised elsewhere"""
+        self.count += count
+        self.revenue_cents += revenue_cents
+        self.discount_cents += discount_cents
+    
+    @property
+    def revenue(self):
+        """Revenue in dollars"""
+        return self.revenue_cents / 100
+    
+    @property
+    def discounts(self):
+        """Discounts given in dollars"""
+        return self.discount_cents / 100
+    
+    def get_average(self):
+        """Average sale value in dollars, or 0 when empty"""
+        if not self.count:
+            return 0
+        return self.revenue_cents / self.count / 100
+
+
+class SalesPartition:
+    """Sales recorded for a single day, kept sorted by timestamp"""
+    
+    def __init__(self, day):
+        self.day = day
+        self.timestamps = []
+        self.sales = []
+        self.totals = SalesSummary()
+    
+    def add(self, sale):
+        """Insert a sale in timestamp order (late arrivals land in place)"""
+        index = bisect.bisect_right(self.timestamps, sale.timestamp)
+        self.timestamps.insert(index, sale.timestamp)
+        self.sales.insert(index, sale)
+        self.totals.add(sale)
+    
+    def get_sales(self, lo=0, hi=None):
+        """Get the sales at positions lo to hi"""
+        return self.sales[lo:hi]
+    
+    def get_bounds(self, start=None, end=None):
+        """Get the (lo, hi) positions of sales with start <= timestamp < end"""
+        lo = 0 if start is None else bisect.bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect.bisect_left(self.timestamps, end)
+        return lo, hi
+    
+    def get_between(self, start=None, end=None):
+        """Get sales with start <= timestamp < end"""
+        return self.get_sales(*self.get_bounds(start, end))
+    
+    def get_hour_bounds(self):
+        """Get the index of the first sale in each hour, plus the end index"""
+        midnight = datetime.combine(self.day, time())
+        bounds = [bisect.bisect_left(self.timestamps, midnight + timedelta(hours=hour)) for hour in range(24)]
+        bounds.append(len(self.timestamps))
+        return bounds
+    
+    def get_revenue_cents(self, lo=0, hi=None):
+        """Sum the totals of the sales at positions lo to hi"""
+        return sum(sale.total_cents for sale in self.sales[lo:hi])
 
 
 class SalesManager:
     """Sales Manager for handling multiple transactions"""
     
-    def __init__(self):
+    def __init__(self, archive_sales=False, storage=None, inventory=None, journal=None, sales_archive=None,
+                 events=None):
         self.sales = []
         self.next_sale_id = 1
+        self.storage = storage
+        # Optional SalesJournal that recorded sales are written ahead to
+        self.journal = journal
+        # Optional EventBus told about completed and recorded sales; sales
+        # created here publish to it too
+        self.events = events
+        # Sales created here settle stock through this ProductManager, if set
+        self.inventory = inventory
+        # Serializes sale numbering and recording across POS lane threads
+        self._lock = threading.Lock()
+        # When enabled, recorded sales are kept in the compact ArchivedSale form
+        self.archive_sales = archive_sales
+        self.line_items = LineItemColumns()
+        # Aggregates maintained by record_sale so analytics never rescan history
+        self._totals = SalesSummary()
+        self._payment_totals = {}
+        # Day partitions, with the partition dates kept sorted for range scans
+        self._partitions = {}
+        self._partition_days = []
+        # Optional SalesArchive holding closed days moved out of memory
+        self.sales_archive = sales_archive
+        if sales_archive is not None:
+            for day in sales_archive.get_days():
+                for method, count, revenue_cents, discount_cents in sales_archive.get_payment_totals(day):
+                    self._totals.add_totals(count, revenue_cents, discount_cents)
+                    payment = self._payment_totals.get(method)
+                    if payment is None:
+                        payment = self._payment_totals[method] = SalesSummary()
+                    payment.add_totals(count, revenue_cents, discount_cents)
+        if storage is not None:
+            self.next_sale_id = storage.load_counter("next_sale_id", 1)
+            for sale in storage.load_sales():
+                if not self._is_archived(sale.timestamp.date()):
+                    self._add_sale(sale)
     
     def create_sale(self):
         """Create a new sale transaction"""
-        sale = Sale(f"SALE-{self.next_sale_id:04d}")
-        self.next_sale_id += 1
-        return sale
+        with self._lock:
+            sale_number = self.next_sale_id
+            self.next_sale_id += 1
+        return Sale(f"SALE-{sale_number:04d}", self.inventory, self.events)
     
     def record_sale(self, sale):
         """Record a completed sale"""
+        with self._lock:
+            if self._is_archived(sale.timestamp.date()):
+                raise ValueError(f"Sales for {sale.timestamp.date()} are already archived")
+            if self.journal is not None:
+                self.journal.append_sale(sale)
+            if self.storage is not None:
+                self.storage.save_sale(sale)
+                self.storage.save_counter("next_sale_id", self.next_sale_id)
+            self._add_sale(sale)
+            sequence = self._totals.count
+        publish_if_subscribed(self.events, SaleRecorded, sale, sequence)
+        return True
+    
+    def restore_sale(self, sale):
+        """Add a previously recorded sale (e.g. on replay) without persisting it again"""
+        with self._lock:
+            prefix, _, number = sale.sale_id.rpartition("-")
+            if prefix == "SALE" and number.isdigit():
+                self.next_sale_id = max(self.next_sale_id, int(number) + 1)
+            if self._is_archived(sale.timestamp.date()):
+                return False
+            return self._add_sale(sale)
+    
+    def complete_and_record_batch(self, sales, payment_method=None):
+        """Complete and record many sales with one stock change per SKU
+        
+        The whole batch is checked first: every sale needs a payment method
+        (its own, or payment_method), a day that is not archived and an ID
+        used once in the batch, no sale may be completed already, and the
+        combined quantity of each SKU must be in stock. If any check fails,
+        ValueError is raised and no stock or sale is touched. If recording
+        fails after that, the stock is given back before the error is
+        raised. Returns the number of sales recorded.
+        """
+        sales = list(sales)
+        inventory = self._check_batch(sales, payment_method)
+        self._take_batch_stock(sales, inventory)
+        filled = [sale for sale in sales if sale.payment_method is None]
+        try:
+            for sale in filled:
+                sale.payment_method = payment_method
+            sequences = self._record_batch(sales)
+        except Exception:
+            for sale in filled:
+                sale.payment_method = None
+            self._return_batch_stock(sales, inventory)
+            raise
+        for sale in sales:
+            sale.completed = True
+            sale.reservations.clear()
+        for sale, sequence in zip(sales, sequences):
+            publish_if_subscribed(sale.events, SaleCompleted, sale)
+            publish_if_subscribed(self.events, SaleRecorded, sale, sequence)
+        return len(sales)
+    
+    def _check_batch(self, sales, payment_method):
+        """Validate a batch before any stock moves; returns the inventory it settles through, or None"""
+        sale_ids = set()
+        for sale in sales:
+            if sale.sale_id in sale_ids:
+                raise ValueError(f"Sale {sale.sale_id} appears more than once in the batch")
+            sale_ids.add(sale.sale_id)
+            if sale.completed:
+                raise ValueError(f"Sale {sale.sale_id} is already completed")
+            if sale.payment_method is None and payment_method is None:
+                raise ValueError(f"Sale {sale.sale_id} has no payment method")
+            if self._is_archived(sale.timestamp.date()):
+                raise ValueError(f"Sales for {sale.timestamp.date()} are already archived")
+        inventories = {id(sale.inventory): sale.inventory for sale in sales}
+        if len(inventories) > 1:
+            raise ValueError("A batch must settle stock through a single inventory")
+        return next(iter(inventories.values()), None)
+    
+    def _take_batch_stock(self, sales, inventory):
+        """Settle the stock for a whole batch, or raise with none of it taken
+        
+        Reservations stay on their sales until the batch is recorded, so a
+        batch given its stock back can be retried.
+        """
+        if inventory is None:
+            self._take_item_stock(sales)
+            return
+        # One atomic commit of every reservation in the batch
+        inventory.commit_reservations([r for sale in sales for r in sale.reservations])
+    
+    def _return_batch_stock(self, sales, inventory):
+        """Give back the stock taken for a batch that could not be recorded"""
+        if inventory is None:
+            self._return_item_stock(self._item_totals(sales).items())
+        else:
+            inventory.return_stock((r.product_id, r.quantity) for sale in sales for r in sale.reservations)
+    
+    @staticmethod
+    def _item_totals(sales):
+        """Get {product: combined quantity} over the sales' items"""
+        totals = {}
+        for sale in sales:
+            for item in sale.items:
+                totals[item.product] = totals.get(item.product, 0) + item.quantity
+        return totals
+    
+    @staticmethod
+    def _take_item_stock(sales):
+        """Check, then apply, the net decrement of each product held by the sales' items"""
+        totals = SalesManager._item_totals(sales)
+        for product, quantity in totals.items():
+            if quantity > product.quantity:
+                raise ValueError(f"Insufficient stock for {product.name}")
+        applied = []
+        try:
+            for product, quantity in totals.items():
+                product.update_quantity(-quantity)
+                applied.append((product, quantity))
+        except Exception:
+            SalesManager._return_item_stock(applied)
+            raise
+    
+    @staticmethod
+    def _return_item_stock(applied):
+        """Roll back (product, quantity) decrements already applied"""
+        for product, quantity in applied:
+            product.update_quantity(quantity)
+    
+    def _record_batch(self, sales):
+        """Persist and add completed sales under one hold of the lock; returns their sequence numbers"""
+        with self._lock:
+            for sale in sales:
+                if self.journal is not None:
+                    self.journal.append_sale(sale)
+                if self.storage is not None:
+                    self.storage.save_sale(sale)
+            if self.storage is not None and sales:
+                self.storage.save_counter("next_sale_id", self.next_sale_id)
+            sequences = []
+            for sale in sales:
+                self._add_sale(sale)
+                sequences.append(self._totals.count)
+        return sequences
+    
+    def _add_sale(self, sale):
+        """Add a sale to the in-memory history and aggregates"""
+        if self.archive_sales and isinstance(sale, Sale):
+            sale = sale.archive(self.line_items)
         self.sales.append(sale)
+        self._totals.add(sale)
+        day = sale.timestamp.date()
+        partition = self._partitions.get(day)
+        if partition is None:
+            partition = self._partitions[day] = SalesPartition(day)
+            bisect.insort(self._partition_days, day)
+        partition.add(sale)
+        payment = self._payment_totals.get(sale.payment_method)
+        if payment is None:
+            payment = self._payment_totals[sale.payment_method] = SalesSummary()
+        payment.add(sale)
         return True
     
+    def _is_archived(self, day):
+        return self.sales_archive is not None and self.sales_archive.has_day(day)
+    
+    def _get_day(self, day):
+        """Get the in-memory partition or the archived day for a date, or None"""
+        partition = self._partitions.get(day)
+        if partition is None and self.sales_archive is not None:
+            partition = self.sales_archive.get_day(day)
+        return partition
+    
+    def archive_closed_days(self, before=None):
+        """Move every day before `before` (default today) into the sales archive
+        
+        Archived sales leave the in-memory history but still count towards
+        revenue, payment and per-date analytics. Returns the archived dates.
+        """
+        if self.sales_archive is None:
+            raise ValueError("No sales archive configured")
+        if before is None:
+            before = datetime.now().date()
+        with self._lock:
+            days = self._partition_days[:bisect.bisect_left(self._partition_days, before)]
+            archived = []
+            try:
+                for day in days:
+                    self.sales_archive.write_day(day, self._partitions[day].sales)
+                    # Only a day safely on disk leaves memory
+                    del self._partitions[day]
+                    archived.append(day)
+            finally:
+                if archived:
+                    self._forget_days(archived)
+        return days
+    
+    def _forget_days(self, days):
+        """Drop the oldest in-memory days, now archived, from the history"""
+        del self._partition_days[:len(days)]
+        closed = set(days)
+        self.sales = [sale for sale in self.sales if sale.timestamp.date() not in closed]
+        if self.archive_sales:
+            # Drop the archived days' line items from the shared columns
+            columns = LineItemColumns()
+            for sale in self.sales:
+                sale.move_to(columns)
+            self.line_items = columns
+    
     def get_total_revenue(self):
         """Calculate total revenue from all sales"""
-        return sum(sale.total for sale in self.sales)
+        return self._totals.revenue
     
     def get_sales_count(self):
         """Get total number of sales"""
-        return len(self.sales)
+        return self._totals.count
+    
+    def get_total_discounts(self):
+        """Get total discount amount given across all sales"""
+        return self._totals.discounts
+    
+    def get_revenue_by_date(self, date):
+        """Get revenue for a specific date"""
+        partition = self._get_day(date)
+        return partition.totals.revenue if partition else 0
+    
+    def get_sales_count_by_date(self, date):
+        """Get number of sales for a specific date"""
+        partition = self._get_day(date)
+        return partition.totals.count if partition else 0
+    
+    def get_revenue_by_payment_method(self):
+        """Get revenue per payment method"""
+        return {method: totals.revenue for method, totals in self._payment_totals.items()}
     
     def get_sales_by_date(self, date):
-        """Get all sales for a specific date"""
-        return [s for s in self.sales if s.timestamp.date() == date]
+        """Get all sales for a specific date, in time order"""
+        partition = self._get_day(date)
+        return list(partition.get_sales()) if partition else []
+    
+    def _get_days(self, first=None, last=None):
+        """Get the live and archived dates with first <= date <= last, in order"""
+        lo = 0 if first is None else bisect.bisect_left(self._partition_days, first)
+        hi = len(self._partition_days) if last is None else bisect.bisect_right(self._partition_days, last)
+        days = self._partition_days[lo:hi]
+        if self.sales_archive is not None:
+            days = sorted(days + self.sales_archive.get_days(first, last))
+        return days
+    
+    def get_sales_between(self, start, end):
+        """Get sales with start <= timestamp < end, in time order"""
+        result = []
+        for day in self._get_days(start.date(), end.date()):
+            result.extend(self._get_day(day).get_between(start, end))
+        return result
+    
+    def iter_sales(self, start=None, end=None, payment_method=None, chunk_size=1000):
+        """Lazily iterate over sales with start <= timestamp < end, in time order
+        
+        Sales are fetched chunk_size at a time, so memory stays bounded
+        however long the range. Optionally only sales paid with
+        payment_method are yielded.
+        """
+        with self._lock:
+            days = self._get_days(start.date() if start else None, end.date() if end else None)
+        for day in days:
+            with self._lock:
+                partition = self._get_day(day)
+                lo, hi = partition.get_bounds(start, end) if partition else (0, 0)
+            while lo < hi:
+                with self._lock:
+                    chunk = partition.get_sales(lo, min(lo + chunk_size, hi))
+                lo += chunk_size
+                for sale in chunk:
+                    if payment_method is None or sale.payment_method == payment_method:
+                        yield sale
+    
+    def iter_sales_by_date(self, date, chunk_size=1000):
+        """Lazily iterate over the sales of one date, in time order"""
+        midnight = datetime.combine(date, time())
+        return self.iter_sales(midnight, midnight + timedelta(days=1), chunk_size=chunk_size)
+    
+    def get_sales_by_hour(self, date, hour):
+        """Get sales recorded during one hour (0-23) of a date"""
+        partition = self._get_day(date)
+        if not partition:
+            return []
+        bounds = partition.get_hour_bounds()
+        return partition.get_sales(bounds[hour], bounds[hour + 1])
+    
+    def get_hourly_sales_counts(self, date):
+        """Get the number of sales in each hour of a date as a 24-item list"""
+        partition = self._get_day(date)
+        if not partition:
+            return [0] * 24
+        bounds = partition.get_hour_bounds()
+        return [bounds[hour + 1] - bounds[hour] for hour in range(24)]
+    
+    def get_hourly_revenue(self, date):
+        """Get revenue in each hour of a date as a 24-item list"""
+        partition = self._get_day(date)
+        if not partition:
+            return [0] * 24
+        bounds = partition.get_hour_bounds()
+        return [partition.get_revenue_cents(bounds[hour], bounds[hour + 1]) / 100 for hour in range(24)]
+    
+    def get_best_sellers(self, n=10):
+        """Get the n (product_id, units sold) pairs with the most units sold, best first"""
+        units = {}
+        for sale in self.iter_sales():
+            if isinstance(sale, Sale):
+                lines = ((item.product.product_id, item.quantity) for item in sale.items)
+            else:
+                lines = ((product_id, quantity) for product_id, quantity, _ in sale.get_line_items())
+            for product_id, quantity in lines:
+                units[product_id] = units.get(product_id, 0) + quantity
+        return heapq.nlargest(n, units.items(), key=lambda pair: pair[1])
     
     def get_average_sale_value(self):
         """Calculate average sale value"""
-        if not self.sales:
-            return 0
-        return self.get_total_revenue() / len(self.sales)
+        return self._totals.get_average()
@@ -0,0 +1,258 @@
+"""
+Sales Archive Module
+Fixed-width columnar files for closed sales days, read back through mmap
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from datetime import date, datetime, time, timedelta
+
+from sales import Sale, ArchivedSale, SalesSummary
+
+
+_MAGIC = b"SALECOL1"
+# magic, sales, line items, sale id width, revenue cents, discount cents, metadata length
+_HEADER = struct.Struct("<8sqqqqqq")
+
+# Column attribute, typecode and what it is sized by, in file order
+_COLUMNS = (
+    ("timestamps", "q", "sales"),
+    ("total_cents", "q", "sales"),
+    ("discount_cents", "q", "sales"),
+    ("item_starts", "q", "starts"),
+    ("unit_prices", "q", "items"),
+    ("product_indexes", "i", "items"),
+    ("quantities", "i", "items"),
+    ("payment_codes", "B", "sales"),
+    ("sale_ids", "B", "ids"),
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(timestamp):
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _padding(size):
+    """Bytes needed to keep the next column 8-byte aligned"""
+    return -size % 8
+
+
+def _line_items_cents(sale):
+    """Yield (product_id, quantity, unit price cents) for a Sale or ArchivedSale"""
+    if isinstance(sale, Sale):
+        for item in sale.items:
+            yield item.product.product_id, item.quantity, item.product.price_cents
+        return
+    columns = sale.columns
+    for i in range(sale.start, sale.start + sale.count):
+        yield columns.product_ids[columns.product_indexes[i]], columns.quantities[i], columns.unit_prices[i]
+
+
+def write_day(path, sales):
+    """Write a day's sales, in time order, to a columnar day file; returns its SalesSummary"""
+    columns = {name: array(typecode) for name, typecode, _ in _COLUMNS}
+    columns["item_starts"].append(0)
+    payment_methods, payment_codes = [], {}
+    product_ids, product_positions = [], {}
+    sale_ids = [sale.sale_id.encode("utf-8") for sale in sales]
+    id_width = max(map(len, sale_ids), default=0)
+    totals = SalesSummary()
+    for sale, sale_id in zip(sales, sale_ids):
+        totals.add(sale)
+        columns["timestamps"].append(_to_micros(sale.timestamp))
+        columns["total_cents"].append(sale.total_cents)
+        columns["discount_cents"].append(sale.discount_cents)
+        code = payment_codes.get(sale.payment_method)
+        if code is None:
+            if len(payment_methods) == 256:
+                raise ValueError("a day file holds at most 256 payment methods")
+            code = payment_codes[sale.payment_method] = len(payment_methods)
+            payment_methods.append(sale.payment_method)
+        columns["payment_codes"].append(code)
+        columns["sale_ids"].frombytes(sale_id.ljust(id_width, b"\0"))
+        for product_id, quantity, price_cents in _line_items_cents(sale):
+            index = product_positions.get(product_id)
+            if index is None:
+                index = product_positions[product_id] = len(product_ids)
+                product_ids.append(product_id)
+            columns["product_indexes"].append(index)
+            columns["quantities"].append(quantity)
+            columns["unit_prices"].append(price_cents)
+        columns["item_starts"].append(len(columns["quantities"]))
+    
+    meta = json.dumps({"payment_methods": payment_methods, "product_ids": product_ids}).encode("utf-8")
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(_HEADER.pack(_MAGIC, len(sales), len(columns["quantities"]), id_width,
+                                  totals.revenue_cents, totals.discount_cents, len(meta)))
+        for name, _, _ in _COLUMNS:
+            data = columns[name].tobytes()
+            handle.write(data + b"\0" * _padding(len(data)))
+        handle.write(meta)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+    return totals
+
+
+class ArchivedDay:
+    """Read-only view of one archived day backed by a memory-mapped file
+    
+    Columns are memoryviews cast straight over the mapping, so scans never
+    copy the file into the heap. The object also serves as the line-item
+    columns of the ArchivedSale objects it hands out, and offers the same
+    query methods as SalesPartition.
+    """
+    
+    def __init__(self, day, path):
+        self.day = day
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, sales, items, id_width, revenue_cents, discount_cents, meta_length = _HEADER.unpack_from(self._view)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a sales archive day file")
+        self.id_width = id_width
+        self.totals = SalesSummary()
+        self.totals.add_totals(sales, revenue_cents, discount_cents)
+        counts = {"sales": sales, "starts": sales + 1, "items": items, "ids": sales * id_width}
+        offset = _HEADER.size
+        self._columns = []
+        for name, typecode, sized_by in _COLUMNS:
+            size = counts[sized_by] * array(typecode).itemsize
+            column = self._view[offset:offset + size].cast(typecode)
+            setattr(self, name, column)
+            self._columns.append(column)
+            offset += size + _padding(size)
+        meta = json.loads(bytes(self._view[offset:offset + meta_length]))
+        self.payment_methods = meta["payment_methods"]
+        self.product_ids = meta["product_ids"]
+    
+    def __len__(self):
+        return len(self.total_cents)
+    
+    def close(self):
+        """Release the column views and unmap the file"""
+        for column in getattr(self, "_columns", ()):
+            column.release()
+        self._view.release()
+        self._mmap.close()
+    
+    def get_sale(self, index):
+        """Get one archived sale by its position in time order"""
+        width = self.id_width
+        sale_id = bytes(self.sale_ids[index * width:(index + 1) * width]).rstrip(b"\0").decode("utf-8")
+        start = self.item_starts[index]
+        return ArchivedSale.from_fields(
+            sale_id, _EPOCH + timedelta(microseconds=self.timestamps[index]), self.total_cents[index],
+            self.payment_methods[self.payment_codes[index]], self.discount_cents[index],
+            self, start, self.item_starts[index + 1] - start)
+    
+    def get_sales(self, lo=0, hi=None):
+        """Get the sales at positions lo to hi as ArchivedSale objects"""
+        hi = len(self) if hi is None else hi
+        return [self.get_sale(index) for index in range(lo, hi)]
+    
+    def get_bounds(self, start=None, end=None):
+        """Get the (lo, hi) positions of sales with start <= timestamp < end"""
+        lo = 0 if start is None else bisect.bisect_left(self.timestamps, _to_micros(start))
+        hi = len(self) if end is None else bisect.bisect_left(self.timestamps, _to_micros(end))
+        return lo, hi
+    
+    def get_between(self, start=None, end=None):
+        """Get sales with start <= timestamp < end"""
+        return self.get_sales(*self.get_bounds(start, end))
+    
+    def get_hour_bounds(self):
+        """Get the index of the first sale in each hour, plus the end index"""
+        midnight = _to_micros(datetime.combine(self.day, time()))
+        hour = 3600 * 10**6
+        bounds = [bisect.bisect_left(self.timestamps, midnight + n * hour) for n in range(24)]
+        bounds.append(len(self))
+        return bounds
+    
+    def get_revenue_cents(self, lo=0, hi=None):
+        """Sum the totals of the sales at positions lo to hi"""
+        return sum(self.total_cents[lo:hi])
+
+
+class SalesArchive:
+    """Directory of closed sales days, one columnar file per day
+    
+    Per-day totals are kept in a small JSON index so a SalesManager can
+    account for archived revenue at start-up without mapping any day file;
+    day files are mapped on first access.
+    """
+    
+    INDEX_NAME = "index.json"
+    
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index = {}
+        index_path = os.path.join(directory, self.INDEX_NAME)
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as handle:
+                self._index = {date.fromisoformat(day): entry for day, entry in json.load(handle).items()}
+        self._days = sorted(self._index)
+        self._open_days = {}
+    
+    def _day_path(self, day):
+        return os.path.join(self.directory, f"sales-{day.isoformat()}.col")
+    
+    def _save_index(self):
+        index_path = os.path.join(self.directory, self.INDEX_NAME)
+        with open(index_path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump({day.isoformat(): entry for day, entry in self._index.items()}, handle)
+        os.replace(index_path + ".tmp", index_path)
+    
+    def has_day(self, day):
+        """Check whether a day has been archived"""
+        return day in self._index
+    
+    def get_days(self, first=None, last=None):
+        """Get archived days with first <= day <= last, in order"""
+        lo = 0 if first is None else bisect.bisect_left(self._days, first)
+        hi = len(self._days) if last is None else bisect.bisect_right(self._days, last)
+        return self._days[lo:hi]
+    
+    def get_day(self, day):
+        """Get the ArchivedDay for a day, or None if it is not archived"""
+        if day not in self._index:
+            return None
+        archived = self._open_days.get(day)
+        if archived is None:
+            archived = self._open_days[day] = ArchivedDay(day, self._day_path(day))
+        return archived
+    
+    def get_payment_totals(self, day):
+        """Get (payment_method, count, revenue cents, discount cents) rows for a day"""
+        return [tuple(row) for row in self._index[day]["payments"]]
+    
+    def write_day(self, day, sales):
+        """Archive a closed day's sales, given in time order"""
+        if day in self._index:
+            raise ValueError(f"{day} is already archived")
+        write_day(self._day_path(day), sales)
+        payments = {}
+        for sale in sales:
+            payments.setdefault(sale.payment_method, SalesSummary()).add(sale)
+        self._index[day] = {"payments": [[method, totals.count, totals.revenue_cents, totals.discount_cents]
+                                         for method, totals in payments.items()]}
+        self._save_index()
+        bisect.insort(self._days, day)
+    
+    def close(self):
+        """Unmap every open day file"""
+        for archived in self._open_days.values():
+            archived.close()
+        self._open_days.clear()
@@ -0,0 +1,309 @@
+"""
+Product Search Module
+Inverted index over product names and categories with prefix and typo-tolerant matching
+"""
+
+import bisect
+import heapq
+import re
+
+
+_WORD = re.compile(r"\w+")
+_NONZERO = re.compile(rb"[^\x00]")
+
+# Match weights: a query word matching a product word exactly beats a
+# prefix match, which beats a one-edit typo match
+EXACT, PREFIX, FUZZY = 3, 2, 1
+
+
+def tokenize(text):
+    """Split text into case-folded words"""
+    return _WORD.findall(text.casefold())
+
+
+def _deletions(word):
+    """Every string made by deleting one character of word"""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _within_one_edit(a, b):
+    """Check whether a and b differ by at most one insertion, deletion or substitution"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _score(product_id, weight, tiers):
+    """Add the best weight each tier matches to weight; None if a tier has no match"""
+    for tier in tiers:
+        for tier_weight, _, posting in tier:
+            if product_id in posting:
+                weight += tier_weight
+                break
+        else:
+            return None
+    return weight
+
+
+def _iter_bits(value):
+    """Yield the set bit positions of a non-negative integer, lowest first"""
+    data = value.to_bytes((value.bit_length() + 7) // 8, "little")
+    for match in _NONZERO.finditer(data):
+        base = match.start() * 8
+        byte = data[match.start()]
+        while byte:
+            low = byte & -byte
+            yield base + low.bit_length() - 1
+            byte ^= low
+
+
+class ProductSearchIndex:
+    """Incrementally maintained word index over product names and categories
+    
+    Postings map each word to the products containing it, in insertion
+    order, with each product's document number. A sorted vocabulary
+    answers prefix queries by bisection, and a deletion-neighbourhood map
+    (every word with one character removed) finds one-edit typo candidates
+    without scanning the vocabulary.
+    
+    Words in at least bitmap_min products also keep a bitmap over document
+    numbers, so multi-word queries intersect common words with a few
+    big-integer ANDs instead of probing postings product by product.
+    """
+    
+    def __init__(self, min_prefix=2, min_fuzzy=3, bitmap_min=1024):
+        # Shorter query words match too much of a large catalog to be useful
+        self.min_prefix = min_prefix
+        self.min_fuzzy = min_fuzzy
+        self.bitmap_min = bitmap_min
+        self._postings = {}
+        self._vocabulary = []
+        self._deletes = {}
+        # Product ID -> (document number, words)
+        self._documents = {}
+        # Document number -> product ID, None once removed. Numbers follow
+        # insertion order, so bitmaps list products in posting order.
+        self._numbered = []
+        self._bitmaps = {}
+        # Integer form of bitmaps used by searches, dropped on every change
+        self._bitmap_values = {}
+    
+    def __len__(self):
+        return len(self._documents)
+    
+    def add(self, product):
+        """Index a product's name and category words"""
+        product_id = product.product_id
+        words = tuple(dict.fromkeys(tokenize(f"{product.name} {product.category}")))
+        if product_id in self._documents:
+            self.remove(product_id)
+        number = len(self._numbered)
+        self._numbered.append(product_id)
+        self._documents[product_id] = (number, words)
+        self._bitmap_values.clear()
+        bitmaps = self._bitmaps
+        index, bit = number >> 3, 1 << (number & 7)
+        for word in words:
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                bisect.insort(self._vocabulary, word)
+                for variant in _deletions(word):
+                    self._deletes.setdefault(variant, set()).add(word)
+            posting[product_id] = number
+            bitmap = bitmaps.get(word)
+            if bitmap is not None:
+                if index >= len(bitmap):
+                    # Grow geometrically; trailing zero bytes do not change the bitmap
+                    bitmap.extend(bytes(max(index + 1, 2 * len(bitmap)) - len(bitmap)))
+                bitmap[index] |= bit
+            elif len(posting) >= self.bitmap_min:
+                self._build_bitmap(word)
+    
+    def remove(self, product_id):
+        """Drop a product from the index"""
+        if product_id not in self._documents:
+            return
+        number, words = self._documents.pop(product_id)
+        self._numbered[number] = None
+        self._bitmap_values.clear()
+        for word in words:
+            posting = self._postings[word]
+            del posting[product_id]
+            bitmap = self._bitmaps.get(word)
+            if bitmap is not None:
+                bitmap[number >> 3] &= ~(1 << (number & 7))
+            if not posting:
+                del self._postings[word]
+                self._bitmaps.pop(word, None)
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, word)]
+                for variant in _deletions(word):
+                    similar = self._deletes[variant]
+                    similar.discard(word)
+                    if not similar:
+                        del self._deletes[variant]
+        if len(self._numbered) > 2 * len(self._documents) + self.bitmap_min:
+            self._renumber()
+    
+    def _build_bitmap(self, word):
+        bitmap = bytearray((len(self._numbered) + 7) // 8)
+        for number in self._postings[word].values():
+            bitmap[number >> 3] |= 1 << (number & 7)
+        self._bitmaps[word] = bitmap
+    
+    def _renumber(self):
+        """Close the gaps removals leave in document numbers, keeping their order"""
+        documents = self._documents
+        self._numbered = list(documents)
+        for number, (product_id, (_, words)) in enumerate(documents.items()):
+            documents[product_id] = (number, words)
+        for posting in self._postings.values():
+            for product_id in posting:
+                posting[product_id] = documents[product_id][0]
+        for word in self._bitmaps:
+            self._build_bitmap(word)
+    
+    def _get_bitmap_value(self, word):
+        value = self._bitmap_values.get(word)
+        if value is None:
+            value = self._bitmap_values[word] = int.from_bytes(self._bitmaps[word], "little")
+        return value
+    
+    def _match_words(self, term, prefix):
+        """Map indexed words matching a query word to their match weight"""
+        matches = {}
+        if prefix and len(term) >= self.min_prefix:
+            vocabulary = self._vocabulary
+            start = bisect.bisect_left(vocabulary, term)
+            end = bisect.bisect_left(vocabulary, term + "\U0010ffff", start)
+            for word in vocabulary[start:end]:
+                matches[word] = PREFIX
+        if len(term) >= self.min_fuzzy:
+            candidates = set(self._deletes.get(term, ()))
+            for variant in _deletions(term):
+                if variant in self._postings:
+                    candidates.add(variant)
+                candidates.update(self._deletes.get(variant, ()))
+            for word in candidates:
+                if word not in matches and _within_one_edit(term, word):
+                    matches[word] = FUZZY
+        if term in self._postings:
+            matches[term] = EXACT
+        return matches
+    
+    def search(self, query, limit=10):
+        """Get up to limit (product_id, score) pairs, best first
+        
+        Every query word must match a word of the product. The last query
+        word also matches as a prefix, for search-as-you-type.
+        """
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+        matches = [self._match_words(term, i == len(terms) - 1) for i, term in enumerate(terms)]
+        # Drive the search from the most selective word, and intersect the
+        # rest smallest first so the candidate set shrinks as early as it can
+        postings = self._postings
+        matches.sort(key=lambda words: sum(len(postings[word]) for word in words))
+        driver, others = matches[0], matches[1:]
+        # Best first: heavier matches, then shorter words (closer to what was typed)
+        ordered = sorted(driver, key=lambda word: (-driver[word], len(word), word))
+        if not others:
+            return self._collect_top(ordered, driver, limit)
+        return self._search_all(ordered, driver, others, limit)
+    
+    def _search_all(self, ordered, driver, others, limit):
+        """Score products matching every query word, driver word by driver word"""
+        postings = self._postings
+        # Each other query word as (weight, word, posting) entries, heaviest first
+        tiers = [sorted(((weight, word, postings[word]) for word, weight in other.items()), key=lambda entry: -entry[0])
+                 for other in others]
+        if not all(tiers):
+            return []
+        # No product can outscore its driver word's weight plus the best
+        # weight of every other query word, so stop once limit products
+        # reach that bound. Scores take few distinct values, so a running
+        # count per score keeps that check cheap.
+        best_others = sum(tier[0][0] for tier in tiers)
+        best = [[entry for entry in tier if entry[0] == tier[0][0]] for tier in tiers]
+        scores = {}
+        score_counts = {}
+        for word in ordered:
+            weight = driver[word]
+            bound = weight + best_others
+            wanted = limit - sum(count for score, count in score_counts.items() if score >= bound)
+            if wanted <= 0:
+                break
+            # Products reaching the bound come first, through the heaviest
+            # words of every tier; the rest are only scored when too few do
+            for candidates in (self._get_candidates(word, best, True), self._get_candidates(word, tiers, False)):
+                wanted = self._take(candidates, weight, bound, tiers, scores, score_counts, wanted)
+                if wanted <= 0:
+                    break
+        # Ties keep discovery order: driver word rank, then catalog order
+        return heapq.nsmallest(limit, scores.items(), key=lambda pair: -pair[1])
+    
+    def _get_candidates(self, word, tiers, filter_all):
+        """Lazily get products under word matching every tier, in posting order
+        
+        Tiers made only of bitmapped words are intersected up front. Of the
+        rest, tiers of a single word filter in C; larger ones are filtered
+        only when filter_all is set and otherwise left to scoring.
+        """
+        if word in self._bitmaps:
+            value = self._get_bitmap_value(word)
+            probed = []
+            for tier in tiers:
+                if all(entry[1] in self._bitmaps for entry in tier):
+                    union = 0
+                    for entry in tier:
+                        union |= self._get_bitmap_value(entry[1])
+                    value &= union
+                else:
+                    probed.append(tier)
+            numbered = self._numbered
+            candidates = (numbered[number] for number in _iter_bits(value))
+        else:
+            candidates, probed = iter(self._postings[word]), tiers
+        for tier in probed:
+            if len(tier) == 1:
+                candidates = filter(tier[0][2].__contains__, candidates)
+            elif filter_all:
+                candidates = filter(lambda product_id, tier=tier: any(product_id in entry[2] for entry in tier),
+                                    candidates)
+        return candidates
+    
+    @staticmethod
+    def _take(candidates, weight, bound, tiers, scores, score_counts, wanted):
+        """Score new candidates until wanted of them reach bound; returns how many are still wanted"""
+        for product_id in candidates:
+            if product_id in scores:
+                continue
+            total = _score(product_id, weight, tiers)
+            if total is None:
+                continue
+            scores[product_id] = total
+            score_counts[total] = score_counts.get(total, 0) + 1
+            if total >= bound:
+                wanted -= 1
+                if wanted <= 0:
+                    break
+        return wanted
+    
+    def _collect_top(self, ordered, weights, limit):
+        """Take products word by word in rank order until limit are found"""
+        results = {}
+        for word in ordered:
+            for product_id in self._postings[word]:
+                if product_id not in results:
+                    results[product_id] = weights[word]
+                    if len(results) >= limit:
+                        return list(results.items())
+        return list(results.items())
@@ -0,0 +1,307 @@
+"""
+Sharded Inventory Module
+Partitions the catalog across worker processes behind a ProductManager-style router
+"""
+
+import heapq
+import multiprocessing
+import threading
+import zlib
+
+from product import ImportReport, Product, ProductManager
+
+
+def hash_partition(product_id, num_shards):
+    """Default partitioning: a stable hash of the product ID
+    
+    crc32 rather than hash(), which is salted per process.
+    """
+    return zlib.crc32(product_id.encode("utf-8")) % num_shards
+
+
+def store_partition(product_id, num_shards):
+    """Partition by the store prefix of IDs like "S01-P0001", keeping each store on one shard"""
+    return hash_partition(product_id.partition("-")[0], num_shards)
+
+
+# Products cross process boundaries as plain rows: pickling a Product would
+# drag its owning manager along
+def _to_row(product):
+    return (product.product_id, product.name, product.price_cents, product.quantity, product.category)
+
+
+def _from_row(row):
+    product_id, name, price_cents, quantity, category = row
+    product = Product(product_id, name, 0, quantity, category)
+    product.price_cents = price_cents
+    return product
+
+
+def _add(manager, row):
+    return manager.add_product(_from_row(row))
+
+
+def _bulk_load(manager, numbered_rows):
+    report = manager.bulk_load_rows((row_number, _from_row(row)) for row_number, row in numbered_rows)
+    return report.loaded, report.errors
+
+
+def _get(manager, product_ids):
+    rows = []
+    for product_id in product_ids:
+        product = manager.get_product(product_id)
+        rows.append(None if product is None else _to_row(product))
+    return rows
+
+
+def _update_stock(manager, changes):
+    return [manager.update_stock(product_id, quantity) for product_id, quantity in changes]
+
+
+def _remove(manager, product_id):
+    return manager.remove_product(product_id)
+
+
+def _category(manager, category):
+    return [_to_row(product) for product in manager.search_by_category(category)]
+
+
+def _low_stock(manager, threshold):
+    return [_to_row(product) for product in manager.get_low_stock_products(threshold)]
+
+
+def _value_cents(manager):
+    return sum(product.price_cents * product.quantity for product in manager.get_all_products())
+
+
+def _count(manager):
+    return len(manager.products)
+
+
+_COMMANDS = {
+    "add": _add,
+    "bulk_load": _bulk_load,
+    "get": _get,
+    "update_stock": _update_stock,
+    "remove": _remove,
+    "category": _category,
+    "low_stock": _low_stock,
+    "value_cents": _value_cents,
+    "count": _count,
+}
+
+
+def _serve(connection):
+    """Worker loop: run batches of (command, args) against a private ProductManager"""
+    manager = ProductManager()
+    while True:
+        try:
+            batch = connection.recv()
+        except EOFError:
+            break
+        if batch is None:
+            break
+        results = []
+        for command, args in batch:
+            try:
+                results.append((True, _COMMANDS[command](manager, *args)))
+            except Exception as error:
+                results.append((False, error))
+        connection.send(results)
+    connection.close()
+
+
+class ShardedInventory:
+    """Router over num_shards worker processes, each owning a ProductManager
+    
+    Every SKU lives on the shard chosen by partition(product_id,
+    num_shards). Requests travel over one pipe per worker as batches of
+    commands; calls touching several shards send every batch before
+    waiting on any reply, so the workers run in parallel. Returned products
+    are snapshots: change stock through update_stock, not the objects.
+    """
+    
+    def __init__(self, num_shards=4, partition=hash_partition, start_method=None):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.num_shards = num_shards
+        self.partition = partition
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+        # One lock per pipe keeps each request paired with its reply when
+        # the router is shared between threads
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        self._broken = False
+        for _ in range(num_shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+    
+    def close(self):
+        """Stop the workers"""
+        for connection, lock in zip(self._connections, self._locks):
+            with lock:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+    
+    def _call_shards(self, batches):
+        """Send {shard: [(command, args), ...]} and gather {shard: [result, ...]}
+        
+        Locks are taken in shard order so concurrent callers cannot deadlock.
+        The first failed command's exception is raised once every reply is in.
+        If a call fails part way, replies already owed are drained so the
+        next call does not read them; a dead worker or pipe marks the router
+        broken and later calls are refused.
+        """
+        if self._broken:
+            raise RuntimeError("Sharded inventory is broken after a failed call; close it")
+        shards = sorted(batches)
+        for shard in shards:
+            self._locks[shard].acquire()
+        sent = []
+        replies = {}
+        try:
+            for shard in shards:
+                self._connections[shard].send(batches[shard])
+                sent.append(shard)
+            for shard in shards:
+                replies[shard] = self._connections[shard].recv()
+        except (EOFError, OSError):
+            # A worker died or its pipe closed: that shard's data is gone
+            self._broken = True
+            raise
+        finally:
+            for shard in sent:
+                if shard not in replies:
+                    try:
+                        self._connections[shard].recv()
+                    except (EOFError, OSError):
+                        self._broken = True
+            for shard in shards:
+                self._locks[shard].release()
+        results = {}
+        for shard in shards:
+            values = []
+            for ok, value in replies[shard]:
+                if not ok:
+                    raise value
+                values.append(value)
+            results[shard] = values
+        return results
+    
+    def _call(self, shard, command, *args):
+        return self._call_shards({shard: [(command, args)]})[shard][0]
+    
+    def _call_all(self, command, *args):
+        """Scatter one command to every shard; results in shard order"""
+        results = self._call_shards({shard: [(command, args)] for shard in range(self.num_shards)})
+        return [results[shard][0] for shard in range(self.num_shards)]
+    
+    def _group(self, product_ids):
+        """Group product IDs by shard"""
+        groups = {}
+        for product_id in product_ids:
+            groups.setdefault(self.partition(product_id, self.num_shards), []).append(product_id)
+        return groups
+    
+    def add_product(self, product):
+        """Add a new product to its shard"""
+        return self._call(self.partition(product.product_id, self.num_shards), "add", _to_row(product))
+    
+    def bulk_load(self, products, chunk_size=10000):
+        """Add many products, loading every shard in parallel chunk by chunk
+        
+        Returns an ImportReport numbering rows from 1, like ProductManager.bulk_load.
+        """
+        report = ImportReport()
+        pending = {}
+        buffered = 0
+        for row_number, product in enumerate(products, 1):
+            shard = self.partition(product.product_id, self.num_shards)
+            pending.setdefault(shard, []).append((row_number, _to_row(product)))
+            buffered += 1
+            if buffered >= chunk_size * self.num_shards:
+                self._load_chunk(pending, report)
+                pending, buffered = {}, 0
+        if pending:
+            self._load_chunk(pending, report)
+        report.errors.sort()
+        return report
+    
+    def _load_chunk(self, pending, report):
+        results = self._call_shards({shard: [("bulk_load", (rows,))] for shard, rows in pending.items()})
+        for (loaded, errors), in results.values():
+            report.loaded += loaded
+            report.errors.extend(errors)
+    
+    def get_product(self, product_id):
+        """Retrieve a snapshot of a product by ID, or None"""
+        row, = self._call(self.partition(product_id, self.num_shards), "get", [product_id])
+        return None if row is None else _from_row(row)
+    
+    def get_products(self, product_ids):
+        """Look up many products in one round trip per shard; returns {product_id: product or None}"""
+        groups = self._group(product_ids)
+        results = self._call_shards({shard: [("get", (ids,))] for shard, ids in groups.items()})
+        found = {}
+        for shard, ids in groups.items():
+            for product_id, row in zip(ids, results[shard][0]):
+                found[product_id] = None if row is None else _from_row(row)
+        return found
+    
+    def update_stock(self, product_id, quantity):
+        """Update product stock level"""
+        return self._call(self.partition(product_id, self.num_shards), "update_stock", [(product_id, quantity)])[0]
+    
+    def update_stock_many(self, changes):
+        """Apply {product_id: quantity change} in one round trip per shard
+        
+        Returns {product_id: whether the product exists}.
+        """
+        groups = {}
+        for product_id, quantity in changes.items():
+            groups.setdefault(self.partition(product_id, self.num_shards), []).append((product_id, quantity))
+        results = self._call_shards({shard: [("update_stock", (pairs,))] for shard, pairs in groups.items()})
+        updated = {}
+        for shard, pairs in groups.items():
+            for (product_id, _), ok in zip(pairs, results[shard][0]):
+                updated[product_id] = ok
+        return updated
+    
+    def remove_product(self, product_id):
+        """Remove a product from its shard"""
+        return self._call(self.partition(product_id, self.num_shards), "remove", product_id)
+    
+    def search_by_category(self, category):
+        """Search products by category across every shard"""
+        return [_from_row(row) for rows in self._call_all("category", category) for row in rows]
+    
+    def get_low_stock_products(self, threshold=10):
+        """Get products with stock below threshold from every shard, lowest stock first"""
+        merged = heapq.merge(*self._call_all("low_stock", threshold), key=lambda row: row[3])
+        return [_from_row(row) for row in merged]
+    
+    def get_total_inventory_value(self):
+        """Calculate total value of all inventory across every shard"""
+        return sum(self._call_all("value_cents")) / 100
+    
+    def get_product_count(self):
+        """Count products across every shard"""
+        return sum(self._call_all("count"))
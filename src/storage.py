@@ -0,0 +1,258 @@
+"""
+Storage Module
+Pluggable persistence backends for ProductManager and SalesManager
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+
+from product import Product
+from sales import Sale, SaleItem
+
+
+def _product_from_row(product_id, name, price_cents, quantity, category="General"):
+    """Build a Product from a stored row holding the price in cents"""
+    product = Product(product_id, name, 0, quantity, category)
+    product.price_cents = price_cents
+    return product
+
+
+class Storage:
+    """Base storage backend; every hook is a no-op"""
+    
+    def load_product(self, product_id):
+        """Load a single product, or None if it is not stored"""
+        return None
+    
+    def iter_products(self):
+        """Iterate over every stored product"""
+        return iter(())
+    
+    def save_product(self, product):
+        """Insert or replace a product"""
+    
+    def delete_product(self, product_id):
+        """Delete a product"""
+    
+    def save_stock(self, product_id, quantity):
+        """Persist a new stock level for a product"""
+    
+    def save_sale(self, sale):
+        """Persist a recorded sale with its line items"""
+    
+    def load_sales(self):
+        """Load every recorded sale in recording order"""
+        return []
+    
+    def save_counter(self, name, value):
+        """Persist a named counter such as the next sale number"""
+    
+    def load_counter(self, name, default=0):
+        """Load a named counter"""
+        return default
+    
+    def flush(self):
+        """Write any buffered changes"""
+    
+    def close(self):
+        """Flush and release resources"""
+        self.flush()
+
+
+class SQLiteStorage(Storage):
+    """SQLite backend using WAL mode and group-committed write batches
+    
+    Writes are buffered and committed together in one transaction once
+    batch_size changes are pending, or when flush() / close() is called.
+    Repeated stock updates to the same product within a batch coalesce
+    into a single row update.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            product_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            price_cents INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            category TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sales (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            sale_id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            total_cents INTEGER NOT NULL,
+            payment_method TEXT,
+            discount_cents INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sale_items (
+            sale_seq INTEGER NOT NULL,
+            product_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            price_cents INTEGER NOT NULL,
+            quantity INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sale_items_by_sale ON sale_items (sale_seq);
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+    
+    # Fixed SQL strings let sqlite3's statement cache reuse the prepared
+    # statements on every batch
+    UPSERT_PRODUCT = "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)"
+    DELETE_PRODUCT = "DELETE FROM products WHERE product_id = ?"
+    UPDATE_STOCK = "UPDATE products SET quantity = ? WHERE product_id = ?"
+    INSERT_SALE = "INSERT INTO sales VALUES (?, ?, ?, ?, ?, ?)"
+    INSERT_ITEM = "INSERT INTO sale_items VALUES (?, ?, ?, ?, ?)"
+    UPSERT_COUNTER = "INSERT OR REPLACE INTO counters VALUES (?, ?)"
+    SELECT_PRODUCT = "SELECT product_id, name, price_cents, quantity, category FROM products WHERE product_id = ?"
+    
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        row = self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM sales").fetchone()
+        self._next_sale_seq = row[0] + 1
+        # Pending writes; products maps product_id -> row, or None for a delete
+        self._pending_products = {}
+        self._pending_stock = {}
+        self._pending_sales = []
+        self._pending_items = []
+        self._pending_counters = {}
+        self._pending_count = 0
+        # Managers on several threads may share one storage object
+        self._lock = threading.RLock()
+    
+    def _mark_pending(self):
+        """Count a buffered change and commit the batch when it is full"""
+        self._pending_count += 1
+        if self._pending_count >= self.batch_size:
+            self.flush()
+    
+    def load_product(self, product_id):
+        """Load a single product, or None if it is not stored"""
+        with self._lock:
+            if product_id in self._pending_products:
+                # Written but not yet flushed; None marks a pending delete
+                row = self._pending_products[product_id]
+                return None if row is None else _product_from_row(*row)
+            row = self.connection.execute(self.SELECT_PRODUCT, (product_id,)).fetchone()
+            if row is None:
+                return None
+            product = _product_from_row(*row)
+            if product_id in self._pending_stock:
+                product.quantity = self._pending_stock[product_id]
+            return product
+    
+    def iter_products(self):
+        """Iterate over every stored product"""
+        self.flush()
+        for row in self.connection.execute("SELECT product_id, name, price_cents, quantity, category FROM products"):
+            yield _product_from_row(*row)
+    
+    def save_product(self, product):
+        """Insert or replace a product"""
+        with self._lock:
+            self._pending_stock.pop(product.product_id, None)
+            self._pending_products[product.product_id] = (
+                product.product_id, product.name, product.price_cents, product.quantity, product.category)
+            self._mark_pending()
+    
+    def delete_product(self, product_id):
+        """Delete a product"""
+        with self._lock:
+            self._pending_stock.pop(product_id, None)
+            self._pending_products[product_id] = None
+            self._mark_pending()
+    
+    def save_stock(self, product_id, quantity):
+        """Persist a new stock level for a product"""
+        with self._lock:
+            row = self._pending_products.get(product_id)
+            if row is not None:
+                self._pending_products[product_id] = row[:3] + (quantity,) + row[4:]
+            else:
+                self._pending_stock[product_id] = quantity
+            self._mark_pending()
+    
+    def save_sale(self, sale):
+        """Persist a recorded sale with its line items"""
+        with self._lock:
+            seq = self._next_sale_seq
+            self._next_sale_seq += 1
+            self._pending_sales.append((seq, sale.sale_id, sale.timestamp.isoformat(), sale.total_cents,
+                                        sale.payment_method, sale.discount_cents))
+            self._pending_items.extend((seq, item.product.product_id, item.product.name, item.product.price_cents,
+                                        item.quantity) for item in sale.items)
+            self._mark_pending()
+    
+    def load_sales(self):
+        """Load every recorded sale in recording order"""
+        with self._lock:
+            self.flush()
+            sales = {}
+            for seq, sale_id, timestamp, total_cents, payment_method, discount_cents in self.connection.execute(
+                    "SELECT seq, sale_id, timestamp, total_cents, payment_method, discount_cents FROM sales ORDER BY seq"):
+                sale = Sale(sale_id)
+                sale.timestamp = datetime.fromisoformat(timestamp)
+                sale.total_cents = total_cents
+                sale.payment_method = payment_method
+                sale.discount_cents = discount_cents
+                sales[seq] = sale
+            for seq, product_id, name, price_cents, quantity in self.connection.execute(
+                    "SELECT sale_seq, product_id, name, price_cents, quantity FROM sale_items ORDER BY rowid"):
+                # Line items keep a detached snapshot of the product as sold
+                sales[seq].items.append(SaleItem(_product_from_row(product_id, name, price_cents, 0), quantity))
+            return list(sales.values())
+    
+    def save_counter(self, name, value):
+        """Persist a named counter such as the next sale number"""
+        with self._lock:
+            self._pending_counters[name] = value
+    
+    def load_counter(self, name, default=0):
+        """Load a named counter"""
+        with self._lock:
+            if name in self._pending_counters:
+                return self._pending_counters[name]
+            row = self.connection.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+            return default if row is None else row[0]
+    
+    def flush(self):
+        """Commit all buffered changes in a single transaction"""
+        with self._lock:
+            if not (self._pending_count or self._pending_counters):
+                return
+            upserts = [row for row in self._pending_products.values() if row is not None]
+            deletes = [(pid,) for pid, row in self._pending_products.items() if row is None]
+            with self.connection:
+                self.connection.execute("BEGIN")
+                if deletes:
+                    self.connection.executemany(self.DELETE_PRODUCT, deletes)
+                if upserts:
+                    self.connection.executemany(self.UPSERT_PRODUCT, upserts)
+                if self._pending_stock:
+                    self.connection.executemany(self.UPDATE_STOCK,
+                                                [(qty, pid) for pid, qty in self._pending_stock.items()])
+                if self._pending_sales:
+                    self.connection.executemany(self.INSERT_SALE, self._pending_sales)
+                    self.connection.executemany(self.INSERT_ITEM, self._pending_items)
+                if self._pending_counters:
+                    self.connection.executemany(self.UPSERT_COUNTER, self._pending_counters.items())
+            self._pending_products.clear()
+            self._pending_stock.clear()
+            self._pending_sales.clear()
+            self._pending_items.clear()
+            self._pending_counters.clear()
+            self._pending_count = 0
+    
+    def close(self):
+        """Flush and close the database connection"""
+        with self._lock:
+            self.flush()
+            self.connection.close()
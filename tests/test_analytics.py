@@ -0,0 +1,131 @@
+"""
+Unit Tests for Sales Analytics
+Tests for column building and the analytics backends
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, date
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import analytics
+from analytics import SalesAnalytics, SalesColumns
+from product import Product, ProductManager
+from sales import Sale, SalesManager
+from sales_archive import SalesArchive
+
+
+def _backends():
+    """Helper: every backend available in this environment"""
+    return ["python"] + (["numpy"] if analytics.np is not None else [])
+
+
+def _record_sales(manager):
+    """Helper: record sales over two days with a discount and mixed baskets"""
+    products = ProductManager()
+    products.add_product(Product("P001", "Milk", 4.00, 100, "Dairy"))
+    products.add_product(Product("P002", "Bread", 2.50, 100, "Bakery"))
+    products.add_product(Product("P003", "Cheese", 6.00, 100, "Dairy"))
+    baskets = [
+        (datetime(2024, 3, 1, 9), [("P001", 2), ("P002", 1)], "Cash", 0),
+        (datetime(2024, 3, 1, 17), [("P003", 1)], "Card", 50),
+        (datetime(2024, 3, 2, 9), [("P001", 1), ("P002", 3), ("P003", 2)], "Card", 10),
+        (datetime(2024, 3, 2, 12), [("P002", 2)], "Cash", 0),
+    ]
+    for n, (timestamp, items, payment, discount) in enumerate(baskets):
+        sale = Sale(f"SALE-{n + 1:04d}")
+        for product_id, quantity in items:
+            sale.add_item(products.get_product(product_id), quantity)
+        if discount:
+            sale.apply_discount(discount)
+        sale.complete_sale(payment)
+        sale.timestamp = timestamp
+        manager.record_sale(sale)
+    return products
+
+
+def test_analytics_matches_sales_manager():
+    """Test that every backend agrees with SalesManager and hand totals"""
+    manager = SalesManager()
+    products = _record_sales(manager)
+    columns = SalesColumns.from_manager(manager, products)
+    
+    for backend in _backends():
+        stats = SalesAnalytics(columns, backend)
+        assert stats.get_revenue_by_day() == {
+            date(2024, 3, 1): manager.get_revenue_by_date(date(2024, 3, 1)),
+            date(2024, 3, 2): manager.get_revenue_by_date(date(2024, 3, 2)),
+        }
+        hourly = stats.get_revenue_by_hour()
+        assert hourly[9] == 31.65 and hourly[17] == 3.00 and sum(hourly) == manager.get_total_revenue()
+        assert stats.get_revenue_by_payment_method() == manager.get_revenue_by_payment_method()
+        assert stats.get_revenue_by_category() == {"Dairy": 30.00, "Bakery": 15.00}
+        assert stats.get_top_products(2) == [("P002", 6), ("P001", 3)]
+        assert stats.get_top_products(1, by="revenue") == [("P003", 18.00)]
+        assert stats.get_basket_size_histogram() == {1: 1, 2: 1, 3: 1, 6: 1}
+        impact = stats.get_discount_impact()
+        assert impact["discounted_sales"] == 2
+        assert impact["discount_total"] == manager.get_total_discounts()
+        assert impact["average_full_price_sale"] == 7.75
+    
+    print("✓ Analytics backends test passed")
+
+
+def test_top_products_ranks_ties_by_first_seen():
+    """Test that top products break ties by first appearance and cope with n past the catalog size"""
+    manager = SalesManager()
+    products = ProductManager()
+    for n, quantity in enumerate([2, 5, 2, 5, 1]):
+        product = Product(f"P{n:03d}", f"Item {n}", 1.00, 100)
+        products.add_product(product)
+        sale = Sale(f"SALE-{n:04d}")
+        sale.add_item(product, quantity)
+        sale.complete_sale("Cash")
+        manager.record_sale(sale)
+    columns = SalesColumns.from_manager(manager, products)
+    
+    for backend in _backends():
+        stats = SalesAnalytics(columns, backend)
+        assert stats.get_top_products(3) == [("P001", 5), ("P003", 5), ("P000", 2)]
+        assert [product_id for product_id, _ in stats.get_top_products(10)] == ["P001", "P003", "P000", "P002", "P004"]
+        assert stats.get_top_products(0) == []
+    
+    print("✓ Top products tie-breaking test passed")
+
+
+def test_analytics_covers_archived_days():
+    """Test that archived days feed the same columns as live sales"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SalesManager(sales_archive=SalesArchive(tmp))
+        products = _record_sales(manager)
+        expected = SalesColumns.from_manager(manager, products)
+        manager.archive_closed_days(date(2024, 3, 2))
+        columns = SalesColumns.from_manager(manager, products)
+        
+        assert len(columns) == 4
+        for name in ("timestamps", "total_cents", "item_sales", "quantities", "unit_prices"):
+            assert getattr(columns, name) == getattr(expected, name)
+        for backend in _backends():
+            stats = SalesAnalytics(columns, backend)
+            assert stats.get_revenue_by_category() == {"Dairy": 30.00, "Bakery": 15.00}
+        manager.sales_archive.close()
+    
+    print("✓ Analytics over archived days test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - ANALYTICS MODULE")
+    print("="*60 + "\n")
+    
+    test_analytics_matches_sales_manager()
+    test_top_products_ranks_ties_by_first_seen()
+    test_analytics_covers_archived_days()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
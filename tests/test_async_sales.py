@@ -0,0 +1,219 @@
+"""
+Unit Tests for Async Sales Facade
+Tests for AsyncSalesManager batching, backpressure and sale numbering
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+from async_sales import AsyncSalesManager, AsyncSaleSink, StorageSink
+from storage import Storage
+
+
+class RecordingSink(AsyncSaleSink):
+    """Sink that remembers batches and can be made slow or failing"""
+    
+    def __init__(self, delay=0, fail=False):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail
+    
+    async def write_sales(self, sales):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise IOError("sink unavailable")
+        self.batches.append(list(sales))
+
+
+def test_async_checkout_batches_writes():
+    """Test that concurrent checkouts reach the sink in batches"""
+    inventory = ProductManager()
+    inventory.add_product(Product("P001", "Milk", 4.00, 1000))
+    sink = RecordingSink(delay=0.01)
+    
+    async def scenario():
+        async with AsyncSalesManager(SalesManager(inventory=inventory), sink, batch_size=20) as pos:
+            async def cart():
+                sale = pos.create_sale()
+                sale.add_item(inventory.get_product("P001"), 1)
+                await pos.checkout(sale, "Card")
+                return sale.sale_id
+            sale_ids = await asyncio.gather(*(cart() for _ in range(100)))
+        return pos, sale_ids
+    
+    pos, sale_ids = asyncio.run(scenario())
+    
+    assert len(set(sale_ids)) == 100
+    assert pos.sales_manager.get_sales_count() == 100
+    assert sum(len(batch) for batch in sink.batches) == 100
+    assert len(sink.batches) < 100
+    assert all(len(batch) <= 20 for batch in sink.batches)
+    assert inventory.get_product("P001").quantity == 900
+    
+    print("✓ Async checkout batching test passed")
+
+
+def test_async_record_sale_backpressure():
+    """Test that record_sale waits once max_pending sales are queued"""
+    sink = RecordingSink(delay=0.05)
+    
+    async def scenario():
+        pos = await AsyncSalesManager(sink=sink, batch_size=1, max_pending=2).start()
+        for _ in range(3):
+            await pos.record_sale(pos.create_sale())
+        # The writer holds one sale and the queue is full; the next one must wait
+        blocked = asyncio.ensure_future(pos.record_sale(pos.create_sale()))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        assert pos.get_pending_count() == 2
+        await blocked
+        await pos.close()
+        return pos
+    
+    pos = asyncio.run(scenario())
+    assert len(sink.batches) == 4
+    assert pos.get_pending_count() == 0
+    
+    print("✓ Async backpressure test passed")
+
+
+def test_async_sink_failures_are_kept():
+    """Test that a failing sink does not stall the writer"""
+    async def scenario():
+        async with AsyncSalesManager(sink=RecordingSink(fail=True), batch_size=10) as pos:
+            for _ in range(5):
+                await pos.record_sale(pos.create_sale())
+        return pos
+    
+    pos = asyncio.run(scenario())
+    assert len(pos.failed_sales) == 5
+    assert pos.sales_manager.get_sales_count() == 5
+    
+    print("✓ Async sink failure test passed")
+
+
+class SlowSalesManager(SalesManager):
+    """SalesManager whose record_sale blocks like a journal fsync"""
+    
+    def record_sale(self, sale):
+        time.sleep(0.05)
+        return super().record_sale(sale)
+
+
+def test_async_record_sale_does_not_block_the_loop():
+    """Test that slow synchronous recording runs off the event loop"""
+    async def scenario():
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+        
+        async with AsyncSalesManager(SlowSalesManager()) as pos:
+            task = asyncio.ensure_future(ticker())
+            await pos.record_sale(pos.create_sale())
+            task.cancel()
+        return pos, ticks
+    
+    pos, ticks = asyncio.run(scenario())
+    assert pos.sales_manager.get_sales_count() == 1
+    assert ticks >= 3
+    
+    print("✓ Async non-blocking record test passed")
+
+
+class ThreadTrackingSalesManager(SalesManager):
+    """SalesManager that remembers which threads recorded sales"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.threads = set()
+    
+    def record_sale(self, sale):
+        self.threads.add(threading.get_ident())
+        return super().record_sale(sale)
+
+
+def _run_carts(inventory, sales_manager, num_carts, executor=None):
+    """Helper: check out num_carts one-item carts concurrently"""
+    async def scenario():
+        async with AsyncSalesManager(sales_manager, batch_size=50, executor=executor) as pos:
+            async def cart(index):
+                sale = pos.create_sale()
+                sale.add_item(inventory.get_product(f"P{index % 10}"), 1)
+                await pos.checkout(sale, "Card")
+            await asyncio.gather(*(cart(index) for index in range(num_carts)))
+    
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        asyncio.run(scenario())
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_async_checkout_serializes_plain_inventory():
+    """Test checkouts against a non-concurrent inventory never race on its indexes"""
+    inventory = ProductManager()
+    for i in range(10):
+        inventory.add_product(Product(f"P{i}", f"Item {i}", 1.00, 10000))
+    sales = ThreadTrackingSalesManager(inventory=inventory)
+    _run_carts(inventory, sales, 2000)
+    
+    assert len(sales.threads) == 1
+    assert sales.get_sales_count() == 2000
+    assert sum(p.quantity for p in inventory.get_all_products()) == 100000 - 2000
+    assert len(inventory.get_low_stock_products(10000)) == 10
+    
+    concurrent_inventory = ProductManager(concurrent=True)
+    for i in range(10):
+        concurrent_inventory.add_product(Product(f"P{i}", f"Item {i}", 1.00, 10000))
+    concurrent_sales = ThreadTrackingSalesManager(inventory=concurrent_inventory)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        _run_carts(concurrent_inventory, concurrent_sales, 2000, executor)
+    assert concurrent_sales.get_sales_count() == 2000
+    assert sum(p.quantity for p in concurrent_inventory.get_all_products()) == 100000 - 2000
+    
+    print("✓ Async serialized checkout test passed")
+
+
+def test_async_refuses_double_persistence():
+    """Test that a StorageSink cannot be stacked on a manager that has storage"""
+    storage = Storage()
+    try:
+        AsyncSalesManager(SalesManager(storage=storage), StorageSink(storage))
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "twice" in str(e)
+    assert AsyncSalesManager(SalesManager(), StorageSink(storage)).sink.storage is storage
+    
+    print("✓ Async double persistence refusal test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - ASYNC SALES MODULE")
+    print("="*60 + "\n")
+    
+    test_async_checkout_batches_writes()
+    test_async_record_sale_backpressure()
+    test_async_sink_failures_are_kept()
+    test_async_record_sale_does_not_block_the_loop()
+    test_async_checkout_serializes_plain_inventory()
+    test_async_refuses_double_persistence()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
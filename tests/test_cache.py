@@ -0,0 +1,145 @@
+"""
+Unit Tests for Product Cache
+Tests for the LRU cache in front of storage-backed product lookups
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cache import LRUCache
+from product import Product, ProductManager
+from sales import Sale, SalesManager
+from storage import SQLiteStorage
+
+
+def _stored_catalog(path, count=5):
+    """Helper: store count products and return the path"""
+    storage = SQLiteStorage(path)
+    products = ProductManager(storage)
+    for i in range(count):
+        products.add_product(Product(f"P{i:03d}", f"Item {i}", 1.00 + i, 10, "General"))
+    storage.close()
+
+
+def test_lru_cache_counters():
+    """Test LRU order and the hit, miss and eviction counters"""
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    assert cache.put("c", 3) == [2]
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+    assert cache.get_hit_rate() == 0.5
+    
+    print("✓ LRU cache counters test passed")
+
+
+def test_cached_lookups_stay_bounded():
+    """Test that only cache_size products stay resident and evicted stock changes persist"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        _stored_catalog(path)
+        storage = SQLiteStorage(path)
+        products = ProductManager(storage, cache_size=2)
+        
+        held = products.get_product("P000")
+        sale = Sale("SALE-0001")
+        sale.add_item(held, 3)
+        products.get_product("P001")
+        products.get_product("P002")
+        assert len(products.products) == 2 and "P000" not in products.products
+        
+        # A sale still holding an evicted product settles stock through storage
+        sale.complete_sale("Cash")
+        assert products.get_product("P000").quantity == 7
+        reloaded = products.get_product("P001")
+        held.update_quantity(-1)
+        assert products.get_product("P000").quantity == 6
+        
+        products.update_stock("P001", 5)
+        assert products.get_product("P001") is reloaded and reloaded.quantity == 15
+        products.remove_product("P001")
+        assert products.get_product("P001") is None
+        assert products.cache.evictions >= 2 and products.cache.hits >= 1
+        
+        # A catalog-wide query loads everything and retires the cache
+        assert len(products.get_all_products()) == 4
+        assert products.get_product("P000").quantity == 6
+        storage.close()
+    
+    print("✓ Bounded cached lookup test passed")
+
+
+def test_evicted_change_after_full_load_keeps_product():
+    """Test a change to an evicted copy after the cache retired replaces the resident copy"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        _stored_catalog(path)
+        storage = SQLiteStorage(path)
+        products = ProductManager(storage, cache_size=1)
+        
+        held = products.get_product("P000")
+        moved = products.get_product("P001")
+        products.get_product("P002")
+        assert len(products.get_all_products()) == 5
+        assert products.get_product("P000") is not held
+        
+        held.update_quantity(-1)
+        assert products.get_product("P000") is held and held.quantity == 9
+        assert len(products.get_all_products()) == 5
+        assert [p.product_id for p in products.get_low_stock_products(10)] == ["P000"]
+        
+        moved.category = "Frozen"
+        assert products.get_product("P001") is moved
+        assert [p.product_id for p in products.search_by_category("Frozen")] == ["P001"]
+        assert len(products.search_by_category("General")) == 4
+        storage.close()
+    
+    print("✓ Evicted change after full load test passed")
+
+
+def test_cache_warm_up_from_best_sellers():
+    """Test that warm-up preloads the best sellers, best seller last in LRU order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        _stored_catalog(path)
+        storage = SQLiteStorage(path)
+        products = ProductManager(storage, cache_size=2)
+        
+        sales = SalesManager()
+        for product_id, quantity in (("P003", 5), ("P001", 9), ("P004", 1)):
+            sale = sales.create_sale()
+            sale.add_item(Product(product_id, "Snapshot", 1.00, 100), quantity)
+            sale.complete_sale("Cash")
+            sales.record_sale(sale)
+        assert sales.get_best_sellers(2) == [("P001", 9), ("P003", 5)]
+        
+        assert products.warm_cache(sales) == 2
+        assert set(products.products) == {"P001", "P003"}
+        products.get_product("P004")
+        assert set(products.products) == {"P001", "P004"}
+        assert products.cache.misses == 1
+        storage.close()
+    
+    print("✓ Cache warm-up test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - PRODUCT CACHE")
+    print("="*60 + "\n")
+    
+    test_lru_cache_counters()
+    test_cached_lookups_stay_bounded()
+    test_evicted_change_after_full_load_keeps_product()
+    test_cache_warm_up_from_best_sellers()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -0,0 +1,136 @@
+"""
+Unit Tests for Catalog Import/Export
+Tests for ProductManager.bulk_load and the CSV / JSON Lines streams
+"""
+
+import sys
+import os
+import io
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from catalog_io import import_csv, import_jsonl, export_csv, export_jsonl
+
+
+def test_bulk_load_reports_duplicates():
+    """Test bulk loading from a generator with per-row duplicate errors"""
+    manager = ProductManager()
+    manager.add_product(Product("P001", "Milk", 4.00, 10))
+    
+    rows = (Product(pid, "Item", 1.00, 5) for pid in ["P002", "P001", "P003", "P002"])
+    report = manager.bulk_load(rows, chunk_size=2)
+    
+    assert report.loaded == 2
+    assert [row for row, _ in report.errors] == [2, 4]
+    assert "already exists" in report.errors[0][1]
+    assert not report.is_clean()
+    assert len(manager.get_all_products()) == 3
+    
+    print("✓ Bulk load duplicate reporting test passed")
+
+
+def test_import_csv_reports_bad_rows():
+    """Test CSV import with file line numbers for rejected rows"""
+    source = io.StringIO(
+        "product_id,name,price,quantity,category\n"
+        "P001,Milk,3.99,50,Dairy\n"
+        "P002,Bread,not-a-price,10,Bakery\n"
+        "P003,Apple,0.99,200,\n"
+        "P001,Milk again,1.00,1,Dairy\n"
+    )
+    manager = ProductManager()
+    report = import_csv(manager, source, chunk_size=2)
+    
+    assert report.loaded == 2
+    assert [row for row, _ in report.errors] == [3, 5]
+    assert manager.get_product("P001").price == 3.99
+    assert manager.get_product("P003").category == "General"
+    
+    print("✓ CSV import test passed")
+
+
+def test_import_jsonl_reports_bad_rows():
+    """Test JSON Lines import with invalid JSON and missing fields"""
+    source = io.StringIO(
+        '{"product_id": "P001", "name": "Milk", "price": 3.99, "quantity": 50, "category": "Dairy"}\n'
+        '{"product_id": "P002", "name": "Bread"\n'
+        '\n'
+        '{"product_id": "P003", "price": 1.00}\n'
+        '{"product_id": "P004", "name": "Jam", "price": 2.50}\n'
+    )
+    manager = ProductManager()
+    report = import_jsonl(manager, source)
+    
+    assert report.loaded == 2
+    assert [row for row, _ in report.errors] == [2, 4]
+    assert manager.get_product("P004").quantity == 0
+    
+    print("✓ JSON Lines import test passed")
+
+
+def test_import_rejects_out_of_range_numbers():
+    """Test infinite, overflowing and negative numbers are rejected per row"""
+    source = io.StringIO(
+        "product_id,name,price,quantity,category\n"
+        "P001,Milk,inf,50,Dairy\n"
+        "P002,Bread,-2.49,10,Bakery\n"
+        "P003,Apple,0.99,-5,Produce\n"
+        "P004,Jam,2.50,3,Pantry\n"
+    )
+    manager = ProductManager()
+    report = import_csv(manager, source)
+    assert report.loaded == 1
+    assert [row for row, _ in report.errors] == [2, 3, 4]
+    assert "finite" in report.errors[0][1]
+    
+    source = io.StringIO(
+        '{"product_id": "P001", "name": "Milk", "price": 1%s}\n'
+        '{"product_id": "P002", "name": "Bread", "price": 2.49, "quantity": 1e400}\n'
+        '{"product_id": "P003", "name": "Jam", "price": 2.50}\n' % ("0" * 400)
+    )
+    manager = ProductManager()
+    report = import_jsonl(manager, source)
+    assert report.loaded == 1
+    assert [row for row, _ in report.errors] == [1, 2]
+    assert manager.get_product("P003").price == 2.50
+    
+    print("✓ Out-of-range number rejection test passed")
+
+
+def test_export_round_trip():
+    """Test that exported catalogs import back unchanged"""
+    manager = ProductManager()
+    manager.add_product(Product("P001", "Milk, whole", 3.99, 50, "Dairy"))
+    manager.add_product(Product("P002", "Bread", 2.49, 100, "Bakery"))
+    
+    for export, load in [(export_csv, import_csv), (export_jsonl, import_jsonl)]:
+        buffer = io.StringIO()
+        assert export(manager, buffer) == 2
+        buffer.seek(0)
+        copy = ProductManager()
+        assert load(copy, buffer).is_clean()
+        for original in manager.get_all_products():
+            restored = copy.get_product(original.product_id)
+            assert (restored.name, restored.price_cents, restored.quantity, restored.category) == \
+                (original.name, original.price_cents, original.quantity, original.category)
+    
+    print("✓ Export round trip test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - CATALOG IMPORT/EXPORT")
+    print("="*60 + "\n")
+    
+    test_bulk_load_reports_duplicates()
+    test_import_csv_reports_bad_rows()
+    test_import_jsonl_reports_bad_rows()
+    test_import_rejects_out_of_range_numbers()
+    test_export_round_trip()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
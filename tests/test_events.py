@@ -0,0 +1,136 @@
+"""
+Unit Tests for Events
+Tests for the event bus, subscription delivery modes and manager publishing
+"""
+
+import sys
+import os
+import asyncio
+import threading
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from events import EventBus, ProductAdded, ProductRemoved, SaleCompleted, SaleRecorded, StockChanged
+from product import Product, ProductManager
+from sales import SalesManager
+
+
+def test_managers_publish_sync_events():
+    """Test stock, catalog and sale events reach synchronous handlers"""
+    bus = EventBus()
+    seen = []
+    subscription = bus.subscribe((StockChanged, ProductAdded, ProductRemoved, SaleCompleted, SaleRecorded),
+                                 seen.append)
+    products = ProductManager(events=bus)
+    sales = SalesManager(events=bus)
+    milk = Product("P001", "Milk", 3.99, 10)
+    products.add_product(milk)
+    sale = sales.create_sale()
+    sale.add_item(milk, 3)
+    sale.complete_sale("Cash")
+    sales.record_sale(sale)
+    products.update_stock("P001", 5)
+    products.remove_product("P001")
+    
+    assert [type(event).__name__ for event in seen] == [
+        "ProductAdded", "StockChanged", "SaleCompleted", "SaleRecorded", "StockChanged", "ProductRemoved"]
+    assert (seen[1].product_id, seen[1].old_quantity, seen[1].quantity) == ("P001", 10, 7)
+    assert seen[2].sale is sale and seen[4].quantity == 12
+    
+    subscription.close()
+    assert not bus.subscribed
+    products.add_product(Product("P002", "Bread", 2.49, 5))
+    assert len(seen) == 6
+    
+    print("✓ Manager sync events test passed")
+
+
+def test_queue_coalesces_and_stays_bounded():
+    """Test a coalescing queue keeps only the latest level per SKU and drops the oldest when full"""
+    bus = EventBus()
+    products = ProductManager(events=bus)
+    products.bulk_load([Product(f"P{i:03d}", f"Item {i}", 1.00, 100) for i in range(5)])
+    levels = bus.subscribe(StockChanged, coalesce=True, maxsize=3)
+    for _ in range(10):
+        products.update_stock("P000", -1)
+    products.update_stock("P001", -5)
+    
+    assert len(levels) == 2 and levels.dropped == 0
+    first = levels.get(timeout=0)
+    assert (first.product_id, first.old_quantity, first.quantity) == ("P000", 100, 90)
+    assert levels.get(timeout=0).quantity == 95
+    assert levels.get(timeout=0) is None
+    
+    for product_id in ("P001", "P002", "P003", "P004"):
+        products.update_stock(product_id, 1)
+    assert [event.product_id for event in levels.drain()] == ["P002", "P003", "P004"]
+    assert levels.dropped == 1
+    
+    print("✓ Coalescing bounded queue test passed")
+
+
+def test_thread_and_asyncio_delivery():
+    """Test worker-thread delivery and awaiting events from an asyncio consumer"""
+    bus = EventBus()
+    delivered = threading.Event()
+    received = []
+    
+    def handler(event):
+        received.append(event.sale.sale_id)
+        delivered.set()
+    
+    worker = bus.subscribe(SaleRecorded, handler, delivery="thread")
+    queue = bus.subscribe(SaleRecorded)
+    sales = SalesManager(events=bus)
+    sale = sales.create_sale()
+    sale.complete_sale("Card")
+    sales.complete_and_record_batch([sales.create_sale()], "Cash")
+    sales.record_sale(sale)
+    
+    assert delivered.wait(1)
+    worker.close()
+    assert received == ["SALE-0002", "SALE-0001"]
+    
+    async def consume():
+        first = await queue.get_async()
+        second = await queue.get_async()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, queue.close)
+        return first.sale.sale_id, second.sale.sale_id, await queue.get_async()
+    
+    assert asyncio.run(consume()) == ("SALE-0002", "SALE-0001", None)
+    
+    print("✓ Thread and asyncio delivery test passed")
+
+
+def test_handler_errors_do_not_break_checkout():
+    """Test a failing sync handler is logged without failing the publisher"""
+    bus = EventBus()
+    
+    def broken(event):
+        raise RuntimeError("dashboard down")
+    
+    bus.subscribe(StockChanged, broken)
+    products = ProductManager(events=bus)
+    products.add_product(Product("P001", "Milk", 3.99, 10))
+    assert products.update_stock("P001", -1)
+    assert products.get_product("P001").quantity == 9
+    
+    print("✓ Handler error isolation test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - EVENTS")
+    print("="*60 + "\n")
+    
+    test_managers_publish_sync_events()
+    test_queue_coalesces_and_stays_bounded()
+    test_thread_and_asyncio_delivery()
+    test_handler_errors_do_not_break_checkout()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
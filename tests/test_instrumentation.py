@@ -0,0 +1,143 @@
+"""
+Unit Tests for Instrumentation
+Tests for latency histograms, method timing and profiling windows
+"""
+
+import sys
+import os
+import io
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from instrumentation import LatencyHistogram, SamplingProfiler, instrument_core
+from product import Product, ProductManager
+from sales import SalesManager
+
+
+def test_latency_histogram_percentiles():
+    """Test percentiles stay within the histogram's bucket precision"""
+    histogram = LatencyHistogram(precision_bits=6)
+    for value in range(1, 100_001):
+        histogram.record(value * 1000)
+    
+    assert histogram.count == 100_000
+    assert histogram.min == 1000 and histogram.max == 100_000_000
+    for percent in (50, 90, 99):
+        exact = percent * 1000 * 1000
+        assert abs(histogram.get_percentile(percent) - exact) <= exact / 32
+    assert histogram.get_percentile(100) == histogram.max
+    assert LatencyHistogram().get_percentile(99) == 0
+    
+    print("✓ Latency histogram percentiles test passed")
+
+
+def test_instrumentation_wraps_and_restores_methods():
+    """Test enabled instrumentation counts calls and disable restores the originals"""
+    original = ProductManager.add_product
+    instrumentation = instrument_core()
+    instrumentation.enable()
+    try:
+        pm = ProductManager()
+        pm.add_product(Product("P001", "Milk", 3.99, 50, "Dairy"))
+        sm = SalesManager()
+        sale = sm.create_sale()
+        sale.add_item(pm.get_product("P001"), 2)
+        sale.complete_sale("cash")
+        sm.record_sale(sale)
+        sm.get_total_revenue()
+    finally:
+        instrumentation.disable()
+    
+    assert ProductManager.add_product is original
+    stats = instrumentation.get_stats()
+    assert stats["ProductManager.add_product"]["calls"] == 1
+    # add_product looks the ID up itself before the explicit call
+    assert stats["ProductManager.get_product"]["calls"] == 2
+    assert stats["Sale.add_item"]["calls"] == 1
+    assert stats["SalesManager.record_sale"]["calls"] == 1
+    assert stats["SalesManager.record_sale"]["p99_ms"] >= 0
+    assert "SalesManager.get_total_revenue" in instrumentation.get_report()
+    
+    ProductManager().add_product(Product("P002", "Bread", 2.49, 10))
+    assert instrumentation.get_stats()["ProductManager.add_product"]["calls"] == 1
+    
+    print("✓ Instrumentation wrap and restore test passed")
+
+
+def test_interleaved_instances_restore_methods():
+    """Test two instances over the same class can be disabled in either order"""
+    original = ProductManager.add_product
+    first, second = instrument_core(), instrument_core()
+    first.enable()
+    second.enable()
+    first.disable()
+    ProductManager().add_product(Product("P001", "Milk", 3.99, 50))
+    second.disable()
+    assert ProductManager.add_product is original
+    assert "ProductManager.add_product" not in first.get_stats()
+    assert second.get_stats()["ProductManager.add_product"]["calls"] == 1
+    
+    second.enable()
+    first.enable()
+    ProductManager().add_product(Product("P002", "Bread", 2.49, 10))
+    second.disable()
+    first.disable()
+    assert ProductManager.add_product is original
+    assert first.get_stats()["ProductManager.add_product"]["calls"] == 1
+    assert second.get_stats()["ProductManager.add_product"]["calls"] == 2
+    
+    print("✓ Interleaved instrumentation test passed")
+
+
+def test_slow_calls_are_logged():
+    """Test calls over the threshold land in the slow-call log"""
+    instrumentation = instrument_core(slow_threshold_ms=0)
+    instrumentation.enable()
+    try:
+        SalesManager().get_sales_count()
+    finally:
+        instrumentation.disable()
+    
+    assert [name for name, _, _ in instrumentation.slow_calls] == ["SalesManager.get_sales_count"]
+    instrumentation.reset()
+    assert not instrumentation.slow_calls and not instrumentation.get_stats()
+    
+    print("✓ Slow call logging test passed")
+
+
+def test_profiling_windows():
+    """Test the cProfile block and the self-stopping sampling profiler"""
+    instrumentation = instrument_core()
+    output = io.StringIO()
+    with instrumentation.profile(stream=output):
+        SalesManager().get_total_revenue()
+    assert "get_total_revenue" in output.getvalue()
+    
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start(duration=0.05)
+    deadline = time.monotonic() + 0.1
+    while time.monotonic() < deadline:
+        sum(range(1000))
+    profiler.stop()
+    assert profiler.get_top(1)
+    
+    print("✓ Profiling windows test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - INSTRUMENTATION")
+    print("="*60 + "\n")
+    
+    test_latency_histogram_percentiles()
+    test_instrumentation_wraps_and_restores_methods()
+    test_interleaved_instances_restore_methods()
+    test_slow_calls_are_logged()
+    test_profiling_windows()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -5,6 +5,7 @@ Tests the interaction between Product, Sales, and Manager classes
 
 import sys
 import os
+import threading
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -233,6 +234,61 @@ def test_multi_transaction_inventory_consistency():
     return True
 
 
+def _assert_stock_matches_sales(product_manager, sales_manager, starting_stock):
+    """Helper: check every unit sold left stock and no sale ID repeats; returns the sale count"""
+    sold = {}
+    for sale in sales_manager.sales:
+        for item in sale.items:
+            sold[item.product.product_id] = sold.get(item.product.product_id, 0) + item.quantity
+    
+    for product in product_manager.get_all_products():
+        assert product.quantity >= 0
+        assert product.quantity == starting_stock - sold.get(product.product_id, 0)
+    sale_ids = [sale.sale_id for sale in sales_manager.sales]
+    assert len(sale_ids) == len(set(sale_ids))
+    return len(sale_ids)
+
+
+def test_concurrent_lanes_never_oversell():
+    """
+    Integration Test: Concurrent POS lanes against a shared inventory
+    Ensures checkout never sells more stock than exists
+    """
+    print("\n" + "="*60)
+    print("INTEGRATION TEST: Concurrent Lanes")
+    print("="*60)
+    
+    product_manager = ProductManager(concurrent=True, lock_stripes=8)
+    sales_manager = SalesManager(inventory=product_manager)
+    for i in range(4):
+        product_manager.add_product(Product(f"P30{i}", f"Hot Item {i}", 1.00, 200))
+    
+    def lane(lane_number):
+        for n in range(150):
+            sale = sales_manager.create_sale()
+            try:
+                sale.add_item(product_manager.get_product(f"P30{n % 4}"), 1)
+                sale.add_item(product_manager.get_product(f"P30{(n + lane_number) % 4}"), 2)
+                sale.complete_sale("Cash")
+            except ValueError:
+                sale.cancel_sale()
+                continue
+            sales_manager.record_sale(sale)
+    
+    lanes = [threading.Thread(target=lane, args=(i,)) for i in range(8)]
+    for thread in lanes:
+        thread.start()
+    for thread in lanes:
+        thread.join()
+    
+    recorded = _assert_stock_matches_sales(product_manager, sales_manager, 200)
+    print(f"✓ {recorded} sales recorded across 8 lanes with no oversells")
+    
+    print("\n" + "="*60)
+    print("🎉 CONCURRENT LANES TEST PASSED!")
+    print("="*60)
+
+
 # Run all integration tests
 if __name__ == "__main__":
     print("\n" + "="*70)
@@ -242,6 +298,7 @@ if __name__ == "__main__":
     test_complete_shopping_scenario()
     test_error_handling_integration()
     test_multi_transaction_inventory_consistency()
+    test_concurrent_lanes_never_oversell()
     
     print("\n" + "="*70)
     print("🎉🎉🎉 ALL INTEGRATION TESTS PASSED! 🎉🎉🎉")
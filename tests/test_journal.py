@@ -0,0 +1,125 @@
+"""
+Unit Tests for Sales Journal
+Tests for write-ahead journaling, crash recovery and replay
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+from journal import SalesJournal
+
+
+def _base_catalog(journal=None):
+    """Helper: catalog as it stood when the journal was started"""
+    products = ProductManager()
+    products.add_product(Product("P001", "Milk", 4.00, 20, "Dairy"))
+    products.add_product(Product("P002", "Bread", 2.50, 10, "Bakery"))
+    # Attach the journal afterwards so the starting catalog is not journaled
+    products.journal = journal
+    return products
+
+
+def _run_journaled_session(path):
+    """Helper: sell and restock through journaled managers, then crash"""
+    journal = SalesJournal(path, fsync_every=2, fsync_interval=0)
+    products = _base_catalog(journal)
+    sales = SalesManager(inventory=products, journal=journal)
+    
+    products.add_product(Product("P003", "Jam", 3.00, 5, "Pantry"))
+    products.add_product(Product("P004", "Tea", 6.00, 8, "Pantry"))
+    products.remove_product("P004")
+    
+    sale = sales.create_sale()
+    sale.add_item(products.get_product("P001"), 3)
+    sale.add_item(products.get_product("P003"), 2)
+    sale.complete_sale("Card")
+    sales.record_sale(sale)
+    products.update_stock("P002", 4)
+    journal.close()
+    return products, sales
+
+
+def test_journal_replay_rebuilds_state():
+    """Test that replay restores catalog, stock and sales exactly"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.journal")
+        original_products, original_sales = _run_journaled_session(path)
+        
+        journal = SalesJournal(path, fsync_interval=0)
+        products = _base_catalog(journal)
+        sales = SalesManager(inventory=products, journal=journal)
+        assert journal.replay(products, sales) == 5
+        
+        for product_id in ("P001", "P002", "P003"):
+            assert products.get_product(product_id).quantity == original_products.get_product(product_id).quantity
+        assert products.get_product("P004") is None
+        assert products.get_product("P001").quantity == 17
+        assert products.get_product("P002").quantity == 14
+        
+        restored = sales.sales[0]
+        original = original_sales.sales[0]
+        assert (restored.sale_id, restored.timestamp, restored.total_cents, restored.payment_method) == \
+            (original.sale_id, original.timestamp, original.total_cents, original.payment_method)
+        assert restored.items[0].product is products.get_product("P001")
+        assert sales.create_sale().sale_id == "SALE-0002"
+        # Replay does not write the replayed events back into the journal
+        assert journal.replay(ProductManager(), SalesManager()) == 5
+        journal.close()
+    
+    print("✓ Journal replay test passed")
+
+
+def test_journal_truncates_torn_tail():
+    """Test that a record torn by a crash is dropped and later appends stay readable"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.journal")
+        _run_journaled_session(path)
+        intact = os.path.getsize(path)
+        with open(path, "ab") as handle:
+            handle.write(b"\x40\x00\x00\x00\x01\x02\x03")
+        
+        journal = SalesJournal(path, fsync_interval=0)
+        assert os.path.getsize(path) == intact
+        journal.append_stock("P001", 10)
+        journal.close()
+        
+        products = _base_catalog()
+        assert SalesJournal(path, fsync_interval=0).replay(products) == 6
+        assert products.get_product("P001").quantity == 27
+    
+    print("✓ Journal torn tail test passed")
+
+
+def test_journal_groups_fsyncs():
+    """Test that appends are fsynced in groups rather than one by one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SalesJournal(os.path.join(tmp, "sales.journal"), fsync_every=10, fsync_interval=0)
+        for n in range(25):
+            journal.append_stock("P001", n)
+        assert journal.syncs == 2
+        journal.sync()
+        assert journal.syncs == 3
+        journal.close()
+    
+    print("✓ Journal fsync grouping test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - JOURNAL MODULE")
+    print("="*60 + "\n")
+    
+    test_journal_replay_rebuilds_state()
+    test_journal_truncates_torn_tail()
+    test_journal_groups_fsyncs()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
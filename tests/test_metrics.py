@@ -0,0 +1,149 @@
+"""
+Unit Tests for Live Sales Metrics
+Tests for the Space-Saving and t-digest sketches and the rolling-window ring
+"""
+
+import sys
+import os
+import random
+from datetime import datetime, timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import LiveSalesMetrics, SpaceSaving, TDigest
+from product import Product
+from sales import Sale, SalesManager
+
+
+def _sale(sale_id, timestamp, lines):
+    """Helper: a sale at timestamp for (product, quantity) lines"""
+    sale = Sale(sale_id)
+    for product, quantity in lines:
+        sale.add_item(product, quantity)
+    sale.timestamp = timestamp
+    return sale
+
+
+def test_sketches():
+    """Test Space-Saving keeps heavy hitters and the t-digest tracks percentiles"""
+    rng = random.Random(7)
+    stream = ["milk"] * 500 + ["bread"] * 300 + [f"sku{i}" for i in range(1000)]
+    rng.shuffle(stream)
+    summary = SpaceSaving(capacity=20)
+    for key in stream:
+        summary.add(key)
+    (first, first_count), (second, second_count) = summary.top(2)
+    assert (first, second) == ("milk", "bread")
+    assert 500 <= first_count <= 500 + summary.errors["milk"]
+    assert len(summary.counts) <= 40 and summary.total == len(stream)
+    
+    exact = SpaceSaving(capacity=20)
+    for key, weight in (("a", 3), ("b", 1), ("a", 2)):
+        exact.add(key, weight)
+    assert exact.top() == [("a", 5), ("b", 1)]
+    
+    values = [rng.uniform(0, 1000) for _ in range(20000)]
+    whole = TDigest()
+    first_half, second_half = TDigest(), TDigest()
+    for index, value in enumerate(values):
+        whole.add(value)
+        (first_half if index % 2 else second_half).add(value)
+    merged = TDigest().merge(first_half, second_half)
+    ordered = sorted(values)
+    for percent in (1, 25, 50, 90, 99):
+        true_value = ordered[int(len(values) * percent / 100)]
+        assert abs(whole.get_percentile(percent) - true_value) < 5
+        assert abs(merged.get_percentile(percent) - true_value) < 5
+    assert len(whole.means) < 100 and merged.count == whole.count == 20000
+    assert TDigest().get_percentile(50) == 0
+    
+    print("✓ Sketches test passed")
+
+
+def test_window_figures():
+    """Test rolling-window revenue, basket size, best sellers and percentiles fed from record_sale"""
+    milk = Product("P001", "Milk", 4.00, 1000)
+    bread = Product("P002", "Bread", 2.50, 1000)
+    eggs = Product("P003", "Eggs", 3.00, 1000)
+    sales = SalesManager()
+    metrics = LiveSalesMetrics(sales)
+    now = datetime(2024, 3, 1, 12, 0)
+    baskets = [
+        (now - timedelta(hours=2), [(eggs, 10)]),
+        (now - timedelta(minutes=40), [(bread, 4), (eggs, 1)]),
+        (now - timedelta(minutes=10), [(milk, 2), (bread, 1)]),
+        (now - timedelta(minutes=5), [(milk, 1)]),
+        (now - timedelta(minutes=1), [(milk, 3), (eggs, 2)]),
+    ]
+    for timestamp, lines in baskets:
+        sale = sales.create_sale()
+        for product, quantity in lines:
+            sale.add_item(product, quantity)
+        sale.timestamp = timestamp
+        sales.record_sale(sale)
+    
+    window = timedelta(minutes=15)
+    assert metrics.get_sales_count(window, now) == 3
+    assert metrics.get_revenue(window, now) == 10.50 + 4.00 + 18.00
+    assert metrics.get_items_per_basket(window, now) == 3
+    assert metrics.get_top_products(2, timedelta(hours=1), now) == [("P001", 6), ("P002", 5)]
+    assert metrics.get_top_products(1, timedelta(hours=3), now) == [("P003", 13)]
+    assert metrics.get_basket_value_percentile(50, window, now) == 10.50
+    assert metrics.get_basket_value_percentile(100, timedelta(hours=24), now) == 30.00
+    
+    summary = metrics.get_summary(timedelta(hours=1), now, top_n=1)
+    assert summary["sales_count"] == 4 and summary["top_products"] == [("P001", 6)]
+    assert metrics.get_sales_count(window, now + timedelta(hours=1)) == 0
+    
+    try:
+        metrics.get_revenue(timedelta(hours=25), now)
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "horizon" in str(e)
+    
+    metrics.close()
+    sale = sales.create_sale()
+    sale.timestamp = now
+    sales.record_sale(sale)
+    assert metrics.get_sales_count(window, now) == 3
+    
+    print("✓ Window figures test passed")
+
+
+def test_ring_memory_is_bounded():
+    """Test old buckets are reused in place and sales older than the horizon are dropped"""
+    milk = Product("P001", "Milk", 4.00, 10**6)
+    metrics = LiveSalesMetrics(bucket_seconds=60, horizon=timedelta(minutes=10))
+    start = datetime(2024, 3, 1, 9, 0)
+    for minute in range(120):
+        for second in range(0, 60, 10):
+            metrics.observe(_sale("S", start + timedelta(minutes=minute, seconds=second), [(milk, 1)]))
+    now = start + timedelta(minutes=119, seconds=59)
+    
+    assert len(metrics._fine.slots) == 11 and len(metrics._coarse.slots) == 2
+    # Windows cover the minute buckets starting inside them: 10:50 to 10:59
+    assert metrics.get_sales_count(timedelta(minutes=10), now) == 60
+    assert metrics.get_sales_count(timedelta(minutes=2), now) == 12
+    assert metrics.get_top_products(1, timedelta(minutes=10), now) == [("P001", 60)]
+    
+    metrics.observe(_sale("S", start, [(milk, 1)]))
+    assert metrics.dropped == 1
+    assert metrics.get_sales_count(timedelta(minutes=10), now) == 60
+    
+    print("✓ Bounded ring test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - LIVE SALES METRICS")
+    print("="*60 + "\n")
+    
+    test_sketches()
+    test_window_figures()
+    test_ring_memory_is_bounded()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
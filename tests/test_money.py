@@ -0,0 +1,100 @@
+"""
+Unit Tests for Money Arithmetic
+Checks integer-cent totals against the previous float behaviour
+"""
+
+import sys
+import os
+import random
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, to_cents
+from sales import Sale, SalesManager
+
+
+def _float_sale(lines, discount_percent):
+    """Reference: the original float arithmetic of Sale"""
+    total = 0
+    for price, quantity in lines:
+        total += price * quantity
+    discount = total * (discount_percent / 100)
+    return total - discount, discount
+
+
+def test_to_cents_rounding():
+    """Test dollar to cent conversion of awkward float prices"""
+    assert to_cents(4.35) == 435  # 4.35 * 100 == 434.99999999999994
+    assert to_cents(0.29) == 29
+    assert to_cents(19.99) == 1999
+    assert to_cents(3) == 300
+    
+    print("✓ Cent conversion test passed")
+
+
+def test_discount_rounds_half_up():
+    """Test that discounts round half up to a whole cent"""
+    sale = Sale("SALE-0001")
+    sale.add_item(Product("P001", "Gum", 0.05, 10), 1)
+    
+    assert sale.apply_discount(50) == 0.03  # 2.5 cents rounds up
+    assert sale.total_cents == 2
+    
+    sale = Sale("SALE-0002")
+    sale.add_item(Product("P002", "Candy", 0.10, 10), 1)
+    assert sale.apply_discount(12.5) == 0.01  # 1.25 cents rounds down
+    assert sale.total == 0.09
+    
+    print("✓ Discount rounding test passed")
+
+
+def test_cents_match_float_behaviour():
+    """Test randomized baskets stay within half a cent of the float results"""
+    rng = random.Random(1234)
+    for n in range(2000):
+        lines = [(rng.randrange(1, 10000) / 100, rng.randrange(1, 20)) for _ in range(rng.randrange(1, 8))]
+        discount_percent = rng.choice([0, 5, 10, 12.5, 15, 33, 50, 100])
+        
+        sale = Sale(f"SALE-{n}")
+        for i, (price, quantity) in enumerate(lines):
+            sale.add_item(Product(f"P{i}", "Item", price, 1000), quantity)
+        discount = sale.apply_discount(discount_percent)
+        
+        float_total, float_discount = _float_sale(lines, discount_percent)
+        assert abs(sale.total - float_total) <= 0.005 + 1e-9
+        assert abs(discount - float_discount) <= 0.005 + 1e-9
+        assert sale.total_cents + sale.discount_cents == sum(to_cents(p) * q for p, q in lines)
+    
+    print("✓ Float equivalence test passed")
+
+
+def test_revenue_is_exact():
+    """Test that aggregated revenue has no floating point drift"""
+    manager = SalesManager()
+    product = Product("P003", "Dime Sweet", 0.10, 10**6)
+    for _ in range(1000):
+        sale = manager.create_sale()
+        sale.add_item(product, 1)
+        manager.record_sale(sale)
+    
+    assert sum(0.10 for _ in range(1000)) != 100.0  # the float path drifts
+    assert manager.get_total_revenue() == 100.0
+    
+    print("✓ Exact revenue test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - MONEY ARITHMETIC")
+    print("="*60 + "\n")
+    
+    test_to_cents_rounding()
+    test_discount_rounds_half_up()
+    test_cents_match_float_behaviour()
+    test_revenue_is_exact()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -0,0 +1,130 @@
+"""
+Unit Tests for Receipt Rendering
+Tests for receipt templates, sinks and batch output
+"""
+
+import sys
+import os
+import io
+from datetime import datetime
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import Sale, SalesManager
+from receipts import ReceiptRenderer, HTML_TEMPLATE, ESCPOS_TEMPLATE
+
+
+EXPECTED_TEXT = (
+    "\n==================================================\n"
+    "               SUPERMARKET RECEIPT                \n"
+    "==================================================\n"
+    "Sale ID: SALE-0042\n"
+    "Date: 2024-03-01 09:05:07\n"
+    "--------------------------------------------------\n"
+    "Milk x3 = $12.00\n"
+    "Bread & Jam x1 = $2.55\n"
+    "--------------------------------------------------\n"
+    "Discount: -$1.46\n"
+    "Total: $13.09\n"
+    "Payment Method: Card\n"
+    "==================================================\n"
+    "         Thank you for shopping with us!          \n"
+    "==================================================\n"
+)
+
+
+def _discounted_sale(sale_id="SALE-0042"):
+    """Helper: a completed two-item sale with a 10% discount"""
+    sale = Sale(sale_id)
+    sale.add_item(Product("P001", "Milk", 4.00, 10), 3)
+    sale.add_item(Product("P002", "Bread & Jam", 2.55, 10), 1)
+    sale.apply_discount(10)
+    sale.complete_sale("Card")
+    sale.timestamp = datetime(2024, 3, 1, 9, 5, 7, 123456)
+    return sale
+
+
+def test_text_receipt_layout():
+    """Test that the text template keeps the classic receipt layout"""
+    sale = _discounted_sale()
+    assert sale.get_receipt() == EXPECTED_TEXT
+    assert ReceiptRenderer().render(sale) == EXPECTED_TEXT
+    
+    plain = Sale("SALE-0043")
+    plain.timestamp = datetime(2024, 3, 1)
+    assert "Discount" not in plain.get_receipt()
+    assert "Payment Method: None" in plain.get_receipt()
+    
+    print("✓ Text receipt layout test passed")
+
+
+def test_html_and_escpos_templates():
+    """Test the HTML and ESC/POS variants"""
+    sale = _discounted_sale()
+    page = ReceiptRenderer(HTML_TEMPLATE).render(sale)
+    assert "<td>Bread &amp; Jam</td>" in page
+    assert '<p class="total">Total: $13.09</p>' in page
+    
+    ticket = ReceiptRenderer(ESCPOS_TEMPLATE).render(sale)
+    assert ticket.startswith("\x1b@")
+    assert ticket.endswith("\x1dV\x00")
+    assert "Milk x3 = $12.00\n" in ticket
+    ticket.encode("cp437")
+    
+    print("✓ HTML and ESC/POS template test passed")
+
+
+def test_batch_rendering_streams_to_sink():
+    """Test that batches are written in order through a text sink"""
+    sales = [_discounted_sale(f"SALE-{n:04d}") for n in range(10)]
+    renderer = ReceiptRenderer()
+    sink = io.StringIO()
+    
+    assert renderer.write_batch(sales, sink, separator="\f", buffer_receipts=3) == 10
+    receipts = sink.getvalue().split("\f")
+    assert receipts[-1] == ""
+    assert receipts[:-1] == list(renderer.iter_receipts(sales))
+    assert "Sale ID: SALE-0007" in receipts[7]
+    
+    print("✓ Batch receipt rendering test passed")
+
+
+def test_archived_sale_reprints():
+    """Test that archived sales reprint the same receipt from their line item columns"""
+    products = ProductManager()
+    products.add_product(Product("P001", "Milk", 4.00, 10))
+    products.add_product(Product("P002", "Bread & Jam", 2.55, 10))
+    manager = SalesManager(archive_sales=True)
+    sale = Sale("SALE-0042")
+    sale.add_item(products.get_product("P001"), 3)
+    sale.add_item(products.get_product("P002"), 1)
+    sale.apply_discount(10)
+    sale.complete_sale("Card")
+    sale.timestamp = datetime(2024, 3, 1, 9, 5, 7, 123456)
+    manager.record_sale(sale)
+    (archived,) = manager.sales
+    assert not isinstance(archived, Sale)
+    
+    assert ReceiptRenderer(products=products).render(archived) == EXPECTED_TEXT
+    unnamed = ReceiptRenderer(HTML_TEMPLATE).render(archived)
+    assert "<td>P002</td><td>x1</td><td>$2.55</td>" in unnamed
+    
+    print("✓ Archived sale reprint test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - RECEIPTS MODULE")
+    print("="*60 + "\n")
+    
+    test_text_receipt_layout()
+    test_html_and_escpos_templates()
+    test_batch_rendering_streams_to_sink()
+    test_archived_sale_reprints()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
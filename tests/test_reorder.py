@@ -0,0 +1,146 @@
+"""
+Unit Tests for the Reorder Monitor
+Tests for per-SKU reorder points, the incrementally maintained flagged heap and suggestions
+"""
+
+import sys
+import os
+from datetime import datetime, date
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from reorder import ReorderMonitor
+from sales import SalesManager
+
+
+def _catalog():
+    """Helper: a small catalog over two categories"""
+    products = ProductManager()
+    products.add_product(Product("P001", "Milk", 3.99, 12, "Dairy"))
+    products.add_product(Product("P002", "Cheese", 6.50, 4, "Dairy"))
+    products.add_product(Product("P003", "Bread", 2.49, 30, "Bakery"))
+    products.add_product(Product("P004", "Bagels", 3.29, 8, "Bakery"))
+    return products
+
+
+def test_flagged_follows_stock_changes():
+    """Test SKUs enter and leave the flagged set as stock and reorder points change"""
+    products = _catalog()
+    monitor = ReorderMonitor(products, reorder_point=5)
+    assert [p.product_id for p in monitor.get_flagged()] == ["P002"]
+    
+    monitor.set_category_reorder_point("Bakery", 25)
+    assert monitor.get_reorder_point("P003") == 25
+    assert [p.product_id for p in monitor.get_flagged()] == ["P004", "P002"]
+    
+    products.update_stock("P004", 20)
+    products.get_product("P001").update_quantity(-10)
+    monitor.set_reorder_point("P003", 40)
+    assert [p.product_id for p in monitor.get_flagged()] == ["P003", "P001", "P002"]
+    assert monitor.get_flagged(limit=1)[0].product_id == "P003"
+    
+    products.remove_product("P003")
+    products.add_product(Product("P005", "Yogurt", 1.19, 0, "Dairy"))
+    assert [p.product_id for p in monitor.get_flagged()] == ["P005", "P001", "P002"]
+    assert monitor.get_flagged_count() == 3
+    
+    monitor.set_reorder_point("P001", 0)
+    assert [p.product_id for p in monitor.get_flagged()] == ["P005", "P002"]
+    
+    print("✓ Flagged set follows stock changes test passed")
+
+
+def test_margin_tracks_near_products():
+    """Test products just above their point are tracked as near but not flagged"""
+    products = _catalog()
+    monitor = ReorderMonitor(products, reorder_point=10, margin=3)
+    assert [p.product_id for p in monitor.get_flagged()] == ["P002", "P004"]
+    assert [p.product_id for p in monitor.get_flagged(include_near=True)] == ["P002", "P004", "P001"]
+    assert monitor.get_flagged_count(include_near=True) == 3
+    
+    products.update_stock("P001", 1)
+    assert monitor.get_flagged(include_near=True)[-1].product_id == "P001"
+    products.update_stock("P001", 1)
+    assert monitor.get_flagged_count(include_near=True) == 2
+    products.update_stock("P004", 4)
+    assert [p.product_id for p in monitor.get_flagged(include_near=True)] == ["P002", "P004"]
+    assert monitor.get_flagged_count() == 1
+    
+    print("✓ Near-threshold tracking test passed")
+
+
+def test_recategorized_product_takes_new_point():
+    """Test moving a product into another category applies that category's reorder point"""
+    products = _catalog()
+    monitor = ReorderMonitor(products, reorder_point=5)
+    monitor.set_category_reorder_point("Frozen", 50)
+    products.add_product(Product("P005", "Peas", 1.50, 20, "Dairy"))
+    assert [p.product_id for p in monitor.get_flagged()] == ["P002"]
+    
+    products.get_product("P005").category = "Frozen"
+    assert monitor.get_reorder_point("P005") == 50
+    assert [p.product_id for p in monitor.get_flagged()] == ["P005", "P002"]
+    
+    products.get_product("P005").category = "Dairy"
+    assert [p.product_id for p in monitor.get_flagged()] == ["P002"]
+    
+    print("✓ Recategorized product reorder point test passed")
+
+
+def test_suggestions_use_sales_velocity():
+    """Test suggestions order to cover recent velocity, most urgent first"""
+    products = _catalog()
+    sales = SalesManager()
+    
+    def sell(day, product_id, quantity):
+        sale = sales.create_sale()
+        sale.add_item(products.get_product(product_id), quantity)
+        sale.complete_sale("Cash")
+        sale.timestamp = datetime(2024, 3, day, 12)
+        sales.record_sale(sale)
+    
+    sell(1, "P004", 5)
+    sell(2, "P001", 2)
+    monitor = ReorderMonitor(products, sales, reorder_point=10, lookback_days=7, cover_days=7,
+                             today=date(2024, 3, 7))
+    assert monitor.get_daily_velocity("P004") == 5 / 7
+    
+    # Checkout moves stock and velocity through the attached event bus
+    sell(7, "P001", 5)
+    assert products.get_product("P001").quantity == 5
+    assert monitor.get_daily_velocity("P001") == 1.0
+    
+    suggestions = monitor.get_suggestions()
+    assert [s.product_id for s in suggestions] == ["P004", "P001", "P002"]
+    assert suggestions[0].days_of_stock == 3 / (5 / 7)
+    _, milk, cheese = suggestions
+    assert (milk.quantity, milk.reorder_point, milk.days_of_stock, milk.order_quantity) == (5, 10, 5.0, 12)
+    assert cheese.days_of_stock is None and cheese.order_quantity == 6
+    
+    # P004's sales on the 1st fall out of the window a week later
+    assert monitor.get_daily_velocity("P004", today=date(2024, 3, 8)) == 0
+    assert monitor.get_daily_velocity("P001") == 1.0
+    
+    monitor.close()
+    sell(9, "P002", 4)
+    assert [p.product_id for p in monitor.get_flagged()] == ["P004", "P002", "P001"]
+    
+    print("✓ Velocity-based suggestions test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - REORDER MONITOR")
+    print("="*60 + "\n")
+    
+    test_flagged_follows_stock_changes()
+    test_margin_tracks_near_products()
+    test_recategorized_product_takes_new_point()
+    test_suggestions_use_sales_velocity()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -0,0 +1,177 @@
+"""
+Unit Tests for End-of-Day Reporting
+Tests for chunked partial aggregates and the consolidated report
+"""
+
+import sys
+import os
+import threading
+from datetime import datetime, date
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analytics import SalesColumns
+from events import EventBus, SaleRecorded
+from product import Product, ProductManager
+from reporting import ReportPartial, aggregate_sales, build_end_of_day_report
+from sales import SalesManager
+
+
+def _store():
+    """Helper: a small catalog and sales over two days"""
+    products = ProductManager()
+    products.add_product(Product("P001", "Milk", 4.00, 100, "Dairy"))
+    products.add_product(Product("P002", "Bread", 2.50, 5, "Bakery"))
+    products.add_product(Product("P003", "Cheese", 6.00, 40, "Dairy"))
+    sales = SalesManager()
+    baskets = [
+        (datetime(2024, 3, 1, 9), [("P001", 2), ("P002", 1)], "Cash", 0),
+        (datetime(2024, 3, 1, 17), [("P003", 1)], "Card", 50),
+        (datetime(2024, 3, 2, 9), [("P001", 1), ("P002", 3), ("P003", 2)], "Card", 10),
+        (datetime(2024, 3, 2, 12), [("P002", 2)], "Cash", 0),
+        (datetime(2024, 3, 2, 18), [("P001", 4)], "Mobile", 0),
+    ]
+    for timestamp, items, payment, discount in baskets:
+        sale = sales.create_sale()
+        for product_id, quantity in items:
+            sale.add_item(products.get_product(product_id), quantity)
+        sale.apply_discount(discount)
+        sale.timestamp = timestamp
+        sale.payment_method = payment
+        sales.record_sale(sale)
+    return products, sales
+
+
+def test_partials_merge_exactly():
+    """Test that merging chunk partials equals aggregating everything at once"""
+    columns = ([0, 1, 2], [100, 250, 50], [0, 10, 0], [0, 1, 0], [0, 1, 1, 2], [1, 2, 3, 4])
+    whole = aggregate_sales(*columns)
+    first = aggregate_sales([0, 1], [100, 250], [0, 10], [0, 1], [0, 1, 1], [1, 2, 3])
+    second = aggregate_sales([2], [50], [0], [0], [2], [4])
+    merged = ReportPartial().merge(first).merge(second)
+    
+    assert (merged.totals.count, merged.totals.revenue_cents, merged.totals.discount_cents) == (3, 400, 10)
+    assert merged.units == whole.units == {0: 1, 1: 5, 2: 4}
+    assert {code: s.revenue_cents for code, s in merged.by_payment.items()} == {0: 150, 1: 250}
+    
+    print("✓ Partial merge test passed")
+
+
+def test_report_matches_managers():
+    """Test the consolidated report agrees with the managers' own figures, in and out of process"""
+    products, sales = _store()
+    serial = build_end_of_day_report(sales, products, workers=1, chunk_size=2, low_stock_threshold=10)
+    parallel = build_end_of_day_report(sales, products, workers=2, chunk_size=2, low_stock_threshold=10)
+    assert serial == parallel
+    
+    assert serial["sales_count"] == sales.get_sales_count()
+    assert serial["total_revenue"] == sales.get_total_revenue()
+    assert serial["total_discounts"] == sales.get_total_discounts()
+    assert serial["average_sale_value"] == sales.get_average_sale_value()
+    for day in (date(2024, 3, 1), date(2024, 3, 2)):
+        assert serial["revenue_by_date"][day] == sales.get_revenue_by_date(day)
+        assert serial["sales_count_by_date"][day] == len(sales.get_sales_by_date(day))
+    assert serial["revenue_by_payment_method"] == sales.get_revenue_by_payment_method()
+    assert serial["top_products"] == sales.get_best_sellers(3)
+    
+    assert serial["product_count"] == 3
+    assert serial["low_stock_count"] == len(products.get_low_stock_products(10)) == 1
+    assert serial["inventory_value"] == products.get_total_inventory_value()
+    assert serial["inventory_value_by_category"] == {"Dairy": 640.0, "Bakery": 12.5}
+    
+    print("✓ Report matches managers test passed")
+
+
+def test_report_without_products():
+    """Test a sales-only report leaves out the inventory figures"""
+    _, sales = _store()
+    report = build_end_of_day_report(sales, workers=1, top_n=1)
+    assert report["top_products"] == [("P001", 7)]
+    assert "inventory_value" not in report
+    
+    print("✓ Sales-only report test passed")
+
+
+def test_report_from_followed_columns():
+    """Test columns following record_sale give the same report as flattening every sale"""
+    products, sales = _store()
+    columns = SalesColumns.from_manager(sales, products, follow=True)
+    sale = sales.create_sale()
+    sale.add_item(products.get_product("P003"), 3)
+    sale.complete_sale("Cash")
+    sale.timestamp = datetime(2024, 3, 2, 20)
+    sales.record_sale(sale)
+    
+    assert len(columns) == 6
+    assert (build_end_of_day_report(sales, products, workers=1, sales_columns=columns)
+            == build_end_of_day_report(sales, products, workers=1))
+    
+    columns.close()
+    sale = sales.create_sale()
+    sale.add_item(products.get_product("P001"), 1)
+    sale.complete_sale("Card")
+    sales.record_sale(sale)
+    assert len(columns) == 6
+    
+    print("✓ Followed columns report test passed")
+
+
+class GatedEventBus(EventBus):
+    """EventBus that holds each publish until its gate opens"""
+    
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.waiting = threading.Event()
+    
+    def publish(self, event):
+        self.waiting.set()
+        self.gate.wait()
+        super().publish(event)
+
+
+def test_followed_columns_skip_sales_already_copied():
+    """Test a sale recorded before the copy but published after it is appended once"""
+    products, sales = _store()
+    sales.events = GatedEventBus()
+    sales.events.subscribe(SaleRecorded, lambda event: None)
+    sale = sales.create_sale()
+    sale.add_item(products.get_product("P001"), 1)
+    sale.complete_sale("Cash")
+    lane = threading.Thread(target=sales.record_sale, args=(sale,))
+    lane.start()
+    sales.events.waiting.wait()
+    
+    columns = SalesColumns.from_manager(sales, products, follow=True)
+    sales.events.gate.set()
+    lane.join()
+    sale = sales.create_sale()
+    sale.add_item(products.get_product("P003"), 2)
+    sale.complete_sale("Card")
+    sales.record_sale(sale)
+    
+    assert len(columns) == sales.get_sales_count() == 7
+    assert list(columns.item_sales) == sorted(columns.item_sales)
+    assert (build_end_of_day_report(sales, products, workers=1, sales_columns=columns)
+            == build_end_of_day_report(sales, products, workers=1))
+    columns.close()
+    
+    print("✓ Followed columns skip copied sales test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - END-OF-DAY REPORTING")
+    print("="*60 + "\n")
+    
+    test_partials_merge_exactly()
+    test_report_matches_managers()
+    test_report_without_products()
+    test_report_from_followed_columns()
+    test_followed_columns_skip_sales_already_copied()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
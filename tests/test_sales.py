@@ -10,8 +10,9 @@ from datetime import datetime
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from product import Product
-from sales import SaleItem, Sale, SalesManager
+from product import Product, ProductManager
+from sales import SaleItem, Sale, SalesManager, ArchivedSale, LineItemColumns
+from storage import Storage
 
 
 # ========== SaleItem Class Tests ==========
@@ -283,6 +284,307 @@ def test_sales_manager_average_sale_value():
     print("✓ SalesManager average sale value test passed")
 
 
+def test_sales_manager_running_aggregates():
+    """Test per-day, per-payment and discount totals kept by record_sale"""
+    manager = SalesManager()
+    product = Product("P017", "Item", 10.00, 50)
+    
+    for method, discount in [("Cash", 0), ("Card", 10), ("Cash", 50)]:
+        sale = manager.create_sale()
+        sale.add_item(product, 2)  # 20.00 before discount
+        sale.apply_discount(discount)
+        sale.complete_sale(method)
+        manager.record_sale(sale)
+    
+    today = datetime.now().date()
+    assert manager.get_total_revenue() == 20.00 + 18.00 + 10.00
+    assert manager.get_total_discounts() == 2.00 + 10.00
+    assert manager.get_revenue_by_date(today) == 48.00
+    assert manager.get_sales_count_by_date(today) == 3
+    assert manager.get_revenue_by_payment_method() == {"Cash": 30.00, "Card": 18.00}
+    assert manager.get_average_sale_value() == 16.00
+    
+    # Dates with no sales report zero rather than failing
+    assert manager.get_revenue_by_date(datetime(2000, 1, 1).date()) == 0
+    
+    print("✓ SalesManager running aggregates test passed")
+
+
+def _recorded_sale(manager, product, timestamp, quantity=1):
+    """Helper: record a completed sale with a fixed timestamp"""
+    sale = manager.create_sale()
+    sale.timestamp = timestamp
+    sale.add_item(product, quantity)
+    sale.complete_sale("Cash")
+    manager.record_sale(sale)
+    return sale
+
+
+def test_sales_manager_date_partitions():
+    """Test that sales land in their day partition in time order"""
+    manager = SalesManager()
+    product = Product("P018", "Item", 1.00, 100)
+    
+    late = _recorded_sale(manager, product, datetime(2024, 3, 2, 18, 0))
+    early = _recorded_sale(manager, product, datetime(2024, 3, 1, 9, 30))
+    # Back-dated sale recorded after a later one on the same day
+    backdated = _recorded_sale(manager, product, datetime(2024, 3, 2, 8, 15))
+    
+    assert manager.get_sales_by_date(datetime(2024, 3, 1).date()) == [early]
+    assert manager.get_sales_by_date(datetime(2024, 3, 2).date()) == [backdated, late]
+    assert manager.get_sales_by_date(datetime(2024, 3, 3).date()) == []
+    
+    print("✓ SalesManager date partition test passed")
+
+
+def test_sales_manager_time_range_queries():
+    """Test get_sales_between and hourly buckets"""
+    manager = SalesManager()
+    product = Product("P019", "Item", 2.00, 100)
+    
+    s1 = _recorded_sale(manager, product, datetime(2024, 3, 1, 23, 50))
+    s2 = _recorded_sale(manager, product, datetime(2024, 3, 2, 0, 10))
+    s3 = _recorded_sale(manager, product, datetime(2024, 3, 2, 0, 40), quantity=2)
+    s4 = _recorded_sale(manager, product, datetime(2024, 3, 2, 13, 0))
+    
+    between = manager.get_sales_between(datetime(2024, 3, 1, 23, 0), datetime(2024, 3, 2, 13, 0))
+    assert between == [s1, s2, s3]  # end is exclusive
+    assert manager.get_sales_between(datetime(2024, 3, 2, 13, 0), datetime(2024, 3, 5)) == [s4]
+    
+    day = datetime(2024, 3, 2).date()
+    assert manager.get_sales_by_hour(day, 0) == [s2, s3]
+    counts = manager.get_hourly_sales_counts(day)
+    assert len(counts) == 24
+    assert counts[0] == 2 and counts[13] == 1 and sum(counts) == 3
+    revenue = manager.get_hourly_revenue(day)
+    assert revenue[0] == 6.00 and revenue[13] == 2.00
+    
+    print("✓ SalesManager time range query test passed")
+
+
+def test_sale_classes_are_slotted():
+    """Test that sale objects carry no per-instance __dict__"""
+    product = Product("P020", "Item", 1.00, 10)
+    sale = Sale("SALE-0010")
+    item = sale.add_item(product, 1)
+    
+    for obj in (product, sale, item):
+        assert not hasattr(obj, "__dict__")
+    
+    print("✓ Slotted sale classes test passed")
+
+
+def test_sale_archive_columns():
+    """Test converting a completed sale into columnar form"""
+    sale = Sale("SALE-0011")
+    tea = Product("P021", "Tea", 4.25, 30)
+    jam = Product("P022", "Jam", 3.10, 30)
+    sale.add_item(tea, 2)
+    sale.add_item(jam, 1)
+    sale.add_item(tea, 3)
+    sale.complete_sale("Cash")
+    
+    columns = LineItemColumns()
+    archived = sale.archive(columns)
+    
+    assert isinstance(archived, ArchivedSale)
+    assert archived.sale_id == "SALE-0011"
+    assert archived.total == sale.total
+    assert len(archived) == 3
+    assert columns.product_ids == ["P021", "P022"]  # repeated products share an index
+    assert list(columns.unit_prices) == [425, 310, 425]
+    assert archived.get_line_items() == [("P021", 2, 4.25), ("P022", 1, 3.10), ("P021", 3, 4.25)]
+    
+    print("✓ Sale archive columns test passed")
+
+
+def test_sales_manager_archive_mode():
+    """Test that archive mode records compact sales with the same analytics"""
+    manager = SalesManager(archive_sales=True)
+    product = Product("P023", "Item", 5.00, 20)
+    sale = manager.create_sale()
+    sale.add_item(product, 2)
+    sale.complete_sale("Card")
+    manager.record_sale(sale)
+    
+    assert isinstance(manager.sales[0], ArchivedSale)
+    assert manager.get_total_revenue() == 10.00
+    assert manager.get_sales_by_date(sale.timestamp.date())[0].sale_id == sale.sale_id
+    
+    print("✓ SalesManager archive mode test passed")
+
+
+def test_sale_reserves_stock_with_inventory():
+    """Test that carts hold stock from add_item until checkout or cancel"""
+    inventory = ProductManager()
+    product = Product("P024", "Flour", 2.00, 5)
+    inventory.add_product(product)
+    manager = SalesManager(inventory=inventory)
+    
+    first = manager.create_sale()
+    first.add_item(product, 4)
+    second = manager.create_sale()
+    try:
+        second.add_item(product, 2)  # only 1 unit left unreserved
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "Insufficient stock" in str(e)
+    
+    first.cancel_sale()
+    second.add_item(product, 2)
+    second.complete_sale("Cash")
+    assert product.quantity == 3
+    assert inventory.get_available_quantity("P024") == 3
+    
+    print("✓ Sale stock reservation test passed")
+
+
+def test_batch_checkout_is_all_or_nothing():
+    """Test a batch applies one net decrement per SKU, or nothing when any SKU runs short"""
+    bread = Product("P030", "Bread", 2.00, 10)
+    milk = Product("P031", "Milk", 3.00, 3)
+    manager = SalesManager()
+    sales = []
+    for quantity in (2, 2):
+        sale = manager.create_sale()
+        sale.add_item(bread, 3)
+        sale.add_item(milk, quantity)
+        sales.append(sale)
+    try:
+        manager.complete_and_record_batch(sales, "Cash")  # 4 milk wanted, 3 in stock
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "Insufficient stock for Milk" in str(e)
+    assert (bread.quantity, milk.quantity) == (10, 3)
+    assert manager.get_sales_count() == 0
+    
+    sales[1].items.pop()
+    sales[1].payment_method = "Card"
+    assert manager.complete_and_record_batch(sales, "Cash") == 2
+    assert (bread.quantity, milk.quantity) == (4, 1)
+    assert [sale.payment_method for sale in sales] == ["Cash", "Card"]
+    assert manager.get_sales_count() == 2
+    
+    print("✓ Batch checkout all-or-nothing test passed")
+
+
+def test_batch_checkout_commits_reservations():
+    """Test a batch of inventory-backed carts settles every reservation in one commit"""
+    inventory = ProductManager()
+    inventory.add_product(Product("P032", "Rice", 5.00, 6))
+    manager = SalesManager(inventory=inventory)
+    rice = inventory.get_product("P032")
+    sales = [manager.create_sale() for _ in range(3)]
+    for sale in sales:
+        sale.add_item(rice, 2)
+    assert inventory.get_available_quantity("P032") == 0
+    
+    try:
+        manager.complete_and_record_batch(sales)
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "no payment method" in str(e)
+    assert rice.quantity == 6
+    
+    assert manager.complete_and_record_batch(sales, "Card") == 3
+    assert rice.quantity == 0
+    assert inventory.get_available_quantity("P032") == 0
+    assert all(not sale.reservations for sale in sales)
+    assert manager.get_total_revenue() == 30.00
+    
+    print("✓ Batch checkout reservation commit test passed")
+
+
+def test_batch_checkout_rejects_repeated_sales():
+    """Test a batch refuses repeated sales and sales already completed, touching no stock"""
+    bread = Product("P033", "Bread", 2.00, 10)
+    manager = SalesManager()
+    sale = manager.create_sale()
+    sale.add_item(bread, 2)
+    twin = Sale(sale.sale_id)
+    twin.add_item(bread, 1)
+    for batch in ([sale, sale], [sale, twin]):
+        try:
+            manager.complete_and_record_batch(batch, "Cash")
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "more than once" in str(e)
+    assert bread.quantity == 10 and manager.get_sales_count() == 0
+    
+    sale.complete_sale("Cash")
+    try:
+        manager.complete_and_record_batch([sale], "Cash")
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "already completed" in str(e)
+    assert bread.quantity == 8 and manager.get_sales_count() == 0
+    
+    print("✓ Batch checkout repeated sale test passed")
+
+
+class FailingStorage(Storage):
+    """Storage whose sale writes fail until fail is cleared"""
+    
+    fail = True
+    
+    def save_sale(self, sale):
+        if self.fail:
+            raise IOError("disk full")
+        super().save_sale(sale)
+
+
+def test_batch_checkout_returns_stock_when_recording_fails():
+    """Test stock taken for a batch is given back if persisting the sales fails"""
+    bread = Product("P034", "Bread", 2.00, 10)
+    storage = FailingStorage()
+    manager = SalesManager(storage=storage)
+    sale = manager.create_sale()
+    sale.add_item(bread, 4)
+    try:
+        manager.complete_and_record_batch([sale], "Cash")
+        assert False, "Should have raised IOError"
+    except IOError as e:
+        assert "disk full" in str(e)
+    assert bread.quantity == 10 and manager.get_sales_count() == 0
+    assert sale.payment_method is None and not sale.completed
+    
+    inventory = ProductManager()
+    inventory.add_product(Product("P035", "Rice", 5.00, 6))
+    manager = SalesManager(storage=storage, inventory=inventory)
+    carts = [manager.create_sale() for _ in range(3)]
+    for cart in carts:
+        cart.add_item(inventory.get_product("P035"), 2)
+    try:
+        manager.complete_and_record_batch(carts, "Card")
+        assert False, "Should have raised IOError"
+    except IOError:
+        pass
+    assert inventory.get_product("P035").quantity == 6
+    
+    storage.fail = False
+    assert manager.complete_and_record_batch(carts, "Card") == 3
+    assert inventory.get_product("P035").quantity == 0
+    assert inventory.get_available_quantity("P035") == 0
+    assert all(cart.completed and not cart.reservations for cart in carts)
+    
+    print("✓ Batch checkout stock return test passed")
+
+
+def test_sales_manager_iter_sales():
+    """Test chunked lazy iteration over a time range"""
+    manager = SalesManager()
+    product = Product("P021", "Item", 2.00, 100)
+    recorded = [_recorded_sale(manager, product, datetime(2024, 3, day, hour)) for day in (1, 2, 3) for hour in (8, 20)]
+    recorded[1].payment_method = "Card"
+    
+    assert list(manager.iter_sales(chunk_size=1)) == recorded
+    assert list(manager.iter_sales(datetime(2024, 3, 1, 12), datetime(2024, 3, 3, 8), chunk_size=2)) == recorded[1:4]
+    assert list(manager.iter_sales(payment_method="Card")) == [recorded[1]]
+    assert list(manager.iter_sales_by_date(datetime(2024, 3, 2).date())) == recorded[2:4]
+    
+    print("✓ SalesManager lazy iteration test passed")
+
+
 # Run all tests if executed directly
 if __name__ == "__main__":
     print("\n" + "="*60)
@@ -306,6 +608,18 @@ if __name__ == "__main__":
     test_sales_manager_total_revenue()
     test_sales_manager_sales_count()
     test_sales_manager_average_sale_value()
+    test_sales_manager_running_aggregates()
+    test_sales_manager_date_partitions()
+    test_sales_manager_time_range_queries()
+    test_sales_manager_iter_sales()
+    test_sale_classes_are_slotted()
+    test_sale_archive_columns()
+    test_sales_manager_archive_mode()
+    test_sale_reserves_stock_with_inventory()
+    test_batch_checkout_is_all_or_nothing()
+    test_batch_checkout_commits_reservations()
+    test_batch_checkout_rejects_repeated_sales()
+    test_batch_checkout_returns_stock_when_recording_fails()
     
     print("\n" + "="*60)
     print("🎉 ALL UNIT TESTS PASSED!")
@@ -0,0 +1,129 @@
+"""
+Unit Tests for Sales Archive
+Tests for moving closed days into memory-mapped columnar files
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, date
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product
+from sales import Sale, SalesManager
+from sales_archive import SalesArchive
+
+
+def _record_days(manager):
+    """Helper: record sales over three days, with two line items each"""
+    milk = Product("P001", "Milk", 4.00, 1000, "Dairy")
+    bread = Product("P002", "Bread", 2.50, 1000, "Bakery")
+    for day in (1, 2, 3):
+        for hour in (9, 14, 9):
+            sale = Sale(f"SALE-{day}{hour:02d}{manager.get_sales_count():03d}")
+            sale.add_item(milk, day)
+            sale.add_item(bread, 1)
+            sale.complete_sale("Card" if hour == 9 else "Cash")
+            sale.timestamp = datetime(2024, 3, day, hour, manager.get_sales_count())
+            manager.record_sale(sale)
+
+
+def test_archive_spans_live_and_archived_days():
+    """Test that analytics answer identically after days are archived"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SalesManager(sales_archive=SalesArchive(tmp))
+        _record_days(manager)
+        revenue = manager.get_total_revenue()
+        by_method = manager.get_revenue_by_payment_method()
+        day_one = [(s.sale_id, s.timestamp, s.total_cents) for s in manager.get_sales_by_date(date(2024, 3, 1))]
+        hourly = manager.get_hourly_revenue(date(2024, 3, 2))
+        
+        assert manager.archive_closed_days(date(2024, 3, 3)) == [date(2024, 3, 1), date(2024, 3, 2)]
+        assert len(manager.sales) == 3
+        
+        assert manager.get_total_revenue() == revenue
+        assert manager.get_sales_count() == 9
+        assert manager.get_revenue_by_payment_method() == by_method
+        assert [(s.sale_id, s.timestamp, s.total_cents) for s in manager.get_sales_by_date(date(2024, 3, 1))] == day_one
+        assert manager.get_hourly_revenue(date(2024, 3, 2)) == hourly
+        assert manager.get_sales_count_by_date(date(2024, 3, 2)) == 3
+        assert len(manager.get_sales_between(datetime(2024, 3, 1, 12), datetime(2024, 3, 3, 12))) == 6
+        
+        archived = manager.get_sales_by_date(date(2024, 3, 2))[0]
+        assert archived.get_line_items() == [("P001", 2, 4.00), ("P002", 1, 2.50)]
+        manager.sales_archive.close()
+    
+    print("✓ Archive spanning live and archived days test passed")
+
+
+def test_archive_survives_restart():
+    """Test that a reopened archive restores totals and rejects late sales"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SalesManager(archive_sales=True, sales_archive=SalesArchive(tmp))
+        _record_days(manager)
+        manager.archive_closed_days(date(2024, 3, 3))
+        # The shared line-item columns only keep the live day
+        assert len(manager.line_items) == 6
+        assert manager.sales[0].get_line_items() == [("P001", 3, 4.00), ("P002", 1, 2.50)]
+        manager.sales_archive.close()
+        
+        reopened = SalesManager(sales_archive=SalesArchive(tmp))
+        assert reopened.get_sales_count() == 6
+        assert reopened.get_total_revenue() == 6 * 2.50 + 3 * 4.00 + 3 * 8.00
+        assert reopened.get_revenue_by_payment_method() == {"Card": 34.00, "Cash": 17.00}
+        
+        late = Sale("SALE-LATE")
+        late.timestamp = datetime(2024, 3, 1, 18)
+        try:
+            reopened.record_sale(late)
+            assert False, "Recording into an archived day should fail"
+        except ValueError:
+            pass
+        reopened.sales_archive.close()
+    
+    print("✓ Archive restart test passed")
+
+
+def test_failed_archive_write_keeps_the_day():
+    """Test a day whose file cannot be written stays in memory and queryable"""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SalesManager(sales_archive=SalesArchive(tmp))
+        _record_days(manager)
+        product = Product("P003", "Eggs", 3.00, 1000)
+        for method in range(257):
+            sale = Sale(f"SALE-X{method:03d}")
+            sale.add_item(product, 1)
+            sale.complete_sale(f"Voucher {method}")
+            sale.timestamp = datetime(2024, 3, 2, 18, 0, method % 60)
+            manager.record_sale(sale)
+        
+        try:
+            manager.archive_closed_days(date(2024, 3, 3))
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "256 payment methods" in str(e)
+        assert manager.sales_archive.get_days() == [date(2024, 3, 1)]
+        assert len(manager.get_sales_by_date(date(2024, 3, 2))) == 260
+        assert len(manager.get_sales_between(datetime(2024, 3, 1), datetime(2024, 3, 4))) == 266
+        assert len(manager.sales) == 263
+        assert manager.get_sales_count() == 266
+        manager.sales_archive.close()
+    
+    print("✓ Failed archive write test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - SALES ARCHIVE MODULE")
+    print("="*60 + "\n")
+    
+    test_archive_spans_live_and_archived_days()
+    test_archive_survives_restart()
+    test_failed_archive_write_keeps_the_day()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -187,6 +187,214 @@ def test_product_manager_total_inventory_value():
     print("✓ ProductManager total inventory value test passed")
 
 
+def test_product_manager_indexes_follow_stock_changes():
+    """Test that category and stock indexes track add, update and remove"""
+    manager = ProductManager()
+    apple = Product("P020", "Apple", 1.50, 5, "Fruits")
+    milk = Product("P021", "Milk", 4.50, 40, "Dairy")
+    manager.add_product(apple)
+    manager.add_product(milk)
+    
+    assert manager.get_low_stock_products(threshold=10) == [apple]
+    
+    # Restock through the manager and sell directly on the product
+    manager.update_stock("P020", 20)
+    milk.update_quantity(-35)
+    assert manager.get_low_stock_products(threshold=10) == [milk]
+    
+    manager.remove_product("P021")
+    assert manager.get_low_stock_products(threshold=10) == []
+    assert manager.search_by_category("Dairy") == []
+    assert manager.search_by_category("Fruits") == [apple]
+    
+    # Removed products no longer update the manager's indexes
+    milk.update_quantity(-5)
+    assert manager.get_low_stock_products(threshold=10) == []
+    
+    print("✓ ProductManager index maintenance test passed")
+
+
+def test_product_manager_rejects_shared_products():
+    """Test a product tracked by one manager cannot be added to another"""
+    first = ProductManager()
+    second = ProductManager()
+    milk = Product("P1", "Milk", 4.50, 10)
+    first.add_product(milk)
+    try:
+        second.add_product(milk)
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "another ProductManager" in str(e)
+    report = second.bulk_load([milk])
+    assert report.loaded == 0 and len(report.errors) == 1
+    
+    milk.update_quantity(-1)
+    assert first.get_low_stock_products(10) == [milk]
+    assert first.get_products_by_stock_range(9, 9) == [milk]
+    assert first.remove_product("P1")
+    
+    # Once removed it is free to join another manager
+    second.add_product(milk)
+    assert second.get_product("P1") is milk
+    
+    print("✓ ProductManager shared product rejection test passed")
+
+
+def test_product_manager_category_changes_reindex():
+    """Test that changing a product's category moves it in the category index"""
+    manager = ProductManager()
+    soup = Product("P030", "Tomato Soup", 2.00, 10, "Cold")
+    manager.add_product(soup)
+    assert [p.product_id for p in manager.search("cold")] == ["P030"]
+    
+    soup.category = "Hot"
+    assert manager.search_by_category("Hot") == [soup]
+    assert manager.search_by_category("Cold") == []
+    assert [p.product_id for p in manager.search("hot")] == ["P030"]
+    assert manager.search("cold") == []
+    assert manager.remove_product("P030")
+    assert manager.search_by_category("Hot") == []
+    
+    print("✓ ProductManager category reindex test passed")
+
+
+def test_product_manager_stock_range():
+    """Test sorted stock range queries"""
+    manager = ProductManager()
+    manager.add_product(Product("P022", "Item1", 1.00, 30))
+    manager.add_product(Product("P023", "Item2", 2.00, 5))
+    manager.add_product(Product("P024", "Item3", 3.00, 12))
+    manager.add_product(Product("P025", "Item4", 4.00, 12))
+    
+    in_range = manager.get_products_by_stock_range(5, 12)
+    assert [p.product_id for p in in_range] == ["P023", "P024", "P025"]
+    
+    above = manager.get_products_by_stock_range(min_quantity=13)
+    assert [p.product_id for p in above] == ["P022"]
+    
+    assert len(manager.get_products_by_stock_range()) == 4
+    
+    print("✓ ProductManager stock range query test passed")
+
+
+def test_product_manager_decrement_stock_all_or_nothing():
+    """Test that atomic decrements apply fully or not at all"""
+    for concurrent in (False, True):
+        manager = ProductManager(concurrent=concurrent)
+        apple = Product("P026", "Apple", 1.00, 10)
+        pear = Product("P027", "Pear", 1.00, 2)
+        manager.add_product(apple)
+        manager.add_product(pear)
+        
+        # Repeated SKUs are summed before checking stock
+        manager.decrement_stock([("P026", 3), ("P027", 1), ("P026", 2)])
+        assert apple.quantity == 5
+        assert pear.quantity == 1
+        
+        try:
+            manager.decrement_stock([("P026", 1), ("P027", 5)])
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "Insufficient stock" in str(e)
+        assert apple.quantity == 5  # untouched by the failed batch
+        
+        try:
+            manager.decrement_stock([("P999", 1)])
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "not found" in str(e)
+    
+    print("✓ ProductManager atomic decrement test passed")
+
+
+def test_product_manager_reservations():
+    """Test holding, committing and releasing reserved stock"""
+    manager = ProductManager()
+    product = Product("P028", "Bananas", 0.50, 10)
+    manager.add_product(product)
+    
+    held = manager.reserve("P028", 6)
+    assert manager.get_available_quantity("P028") == 4
+    assert product.quantity == 10  # reserving does not take stock yet
+    
+    try:
+        manager.reserve("P028", 5)
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "Insufficient stock" in str(e)
+    
+    manager.commit_reservations([held])
+    assert product.quantity == 4
+    assert manager.get_available_quantity("P028") == 4
+    
+    other = manager.reserve("P028", 3)
+    assert manager.release_reservation(other) == True
+    assert manager.release_reservation(other) == False
+    assert manager.get_available_quantity("P028") == 4
+    
+    print("✓ ProductManager reservation test passed")
+
+
+def test_product_manager_reservation_expiry():
+    """Test that the TTL sweep releases only expired reservations"""
+    manager = ProductManager()
+    product = Product("P029", "Yogurt", 1.20, 10)
+    manager.add_product(product)
+    
+    short = manager.reserve("P029", 4, ttl=5)
+    manager.reserve("P029", 3, ttl=60)
+    assert manager.get_available_quantity("P029") == 3
+    
+    assert manager.sweep_expired(short.expires_at - 1) == 0
+    assert manager.sweep_expired(short.expires_at) == 1
+    assert manager.get_available_quantity("P029") == 7
+    
+    # An expired reservation can still be committed while stock lasts
+    manager.commit_reservations([short])
+    assert product.quantity == 6
+    
+    print("✓ ProductManager reservation expiry test passed")
+
+
+def test_product_manager_cursor_pagination():
+    """Test that keyset pages neither skip nor repeat products across catalog changes"""
+    manager = ProductManager()
+    for i in range(10):
+        manager.add_product(Product(f"P{i:03d}", f"Item {i}", 1.00 + i, i * 2, "Even" if i % 2 == 0 else "Odd"))
+    
+    page, cursor = manager.get_products_page(limit=4)
+    assert [p.product_id for p in page] == ["P000", "P001", "P002", "P003"]
+    # Changes before and after the cursor do not disturb the following pages
+    manager.remove_product("P001")
+    manager.remove_product("P005")
+    manager.add_product(Product("P0005", "Early", 1.00, 1))
+    manager.add_product(Product("P0065", "Late", 1.00, 1))
+    seen = [p.product_id for p in page]
+    while cursor is not None:
+        page, cursor = manager.get_products_page(cursor, limit=4)
+        seen.extend(p.product_id for p in page)
+    assert seen == ["P000", "P001", "P002", "P003", "P004", "P006", "P0065", "P007", "P008", "P009"]
+    
+    print("✓ ProductManager cursor pagination test passed")
+
+
+def test_product_manager_filtered_iteration():
+    """Test that iterator filters compose and match the list queries"""
+    manager = ProductManager()
+    for i in range(20):
+        manager.add_product(Product(f"P{i:03d}", f"Item {i}", 1.00 + i, i, "Even" if i % 2 == 0 else "Odd"))
+    
+    even = manager.iter_products(page_size=3, category="Even")
+    assert next(even).product_id == "P000"
+    assert len(list(even)) == 9
+    assert {p.product_id for p in manager.iter_products(max_quantity=9)} == \
+        {p.product_id for p in manager.get_low_stock_products(10)}
+    matches = manager.iter_products(page_size=2, category="Odd", min_price=5.00, max_price=12.00, min_quantity=6)
+    assert [p.product_id for p in matches] == ["P007", "P009", "P011"]
+    
+    print("✓ ProductManager filtered iteration test passed")
+
+
 # Run all tests if executed directly
 if __name__ == "__main__":
     print("\n" + "="*60)
@@ -205,6 +413,15 @@ if __name__ == "__main__":
     test_product_manager_search_by_category()
     test_product_manager_low_stock_products()
     test_product_manager_total_inventory_value()
+    test_product_manager_indexes_follow_stock_changes()
+    test_product_manager_rejects_shared_products()
+    test_product_manager_category_changes_reindex()
+    test_product_manager_stock_range()
+    test_product_manager_decrement_stock_all_or_nothing()
+    test_product_manager_reservations()
+    test_product_manager_reservation_expiry()
+    test_product_manager_cursor_pagination()
+    test_product_manager_filtered_iteration()
     
     print("\n" + "="*60)
     print("🎉 ALL UNIT TESTS PASSED!")
@@ -0,0 +1,135 @@
+"""
+Unit Tests for Product Search
+Tests for prefix, word and typo-tolerant product name search
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from search import ProductSearchIndex, EXACT, PREFIX, FUZZY
+
+
+def _catalog():
+    """Helper: a small grocery catalog"""
+    manager = ProductManager()
+    for product in (Product("P001", "Whole Milk 1L", 1.20, 10, "Dairy"),
+                    Product("P002", "Skimmed Milk 2L", 1.90, 10, "Dairy"),
+                    Product("P003", "Milk Chocolate Bar", 0.99, 10, "Confectionery"),
+                    Product("P004", "Cheddar Cheese", 3.50, 10, "Dairy"),
+                    Product("P005", "Cheesecake", 4.25, 10, "Bakery"),
+                    Product("P006", "Chocolate Chip Cookies", 2.10, 10, "Bakery")):
+        manager.add_product(product)
+    return manager
+
+
+def _ids(products):
+    return [product.product_id for product in products]
+
+
+def test_search_prefix_and_words():
+    """Test whole-word, prefix and multi-word queries"""
+    manager = _catalog()
+    
+    assert _ids(manager.search("milk")) == ["P001", "P002", "P003"]
+    # Exact word first, then shorter prefix completions before longer ones
+    assert _ids(manager.search("chee")) == ["P004", "P005"]
+    assert _ids(manager.search("cheese")) == ["P004", "P005"]
+    assert _ids(manager.search("chocolate milk")) == ["P003"]
+    assert _ids(manager.search("milk choc")) == ["P003"]
+    assert _ids(manager.search("bakery")) == ["P005", "P006"]
+    assert _ids(manager.search("milk", limit=2)) == ["P001", "P002"]
+    assert manager.search("") == [] and manager.search("caviar") == []
+    
+    print("✓ Prefix and word search test passed")
+
+
+def test_search_tolerates_one_typo():
+    """Test matching words one insertion, deletion or substitution away"""
+    manager = _catalog()
+    
+    assert _ids(manager.search("chedar")) == ["P004"]
+    assert _ids(manager.search("cheddarr")) == ["P004"]
+    assert _ids(manager.search("cookias")) == ["P006"]
+    assert _ids(manager.search("skimed mlk")) == ["P002"]
+    assert manager.search("chddr") == []
+    
+    index = ProductSearchIndex()
+    index.add(Product("P100", "Milk", 1.00, 1, "Dairy"))
+    index.add(Product("P101", "Silk Scarf", 9.00, 1, "Clothing"))
+    index.add(Product("P102", "Milkshake", 2.00, 1, "Drinks"))
+    assert index.search("milk") == [("P100", EXACT), ("P102", PREFIX), ("P101", FUZZY)]
+    
+    print("✓ Typo-tolerant search test passed")
+
+
+def test_search_index_follows_catalog_changes():
+    """Test that adds and removes after the first search are reflected"""
+    manager = _catalog()
+    assert _ids(manager.search("oat")) == []
+    
+    manager.add_product(Product("P007", "Oat Milk", 1.60, 10, "Dairy"))
+    manager.bulk_load([Product("P008", "Oatcakes", 1.10, 10, "Bakery")])
+    assert _ids(manager.search("oat")) == ["P007", "P008"]
+    manager.remove_product("P007")
+    manager.remove_product("P008")
+    assert _ids(manager.search("oat")) == []
+    assert _ids(manager.search("milk")) == ["P001", "P002", "P003"]
+    
+    print("✓ Incremental search index test passed")
+
+
+def test_bitmaps_match_posting_scans():
+    """Test that bitmapped words give the same results as posting scans, through removals and renumbering"""
+    brands = ["Acme", "Valley", "Summit"]
+    kinds = ["fresh", "smoked", "spicy", "sweet"]
+    nouns = ["milk", "mild cheddar", "salmon", "salsa", "salted crackers"]
+    bitmapped, scanned = ProductSearchIndex(bitmap_min=4), ProductSearchIndex(bitmap_min=10**9)
+    products = [Product(f"P{n:03d}", f"{brands[n % 3]} {kinds[n % 4]} {nouns[n % 5]}", 1.00, 1, "Grocery")
+                for n in range(300)]
+    queries = ["acme fresh mil", "valley sal", "spicy milk", "summit swet salmon", "sweet mild ch", "acme"]
+    
+    def check():
+        for query in queries:
+            for limit in (1, 5, 50):
+                assert bitmapped.search(query, limit) == scanned.search(query, limit), query
+    
+    for product in products:
+        bitmapped.add(product)
+        scanned.add(product)
+    assert bitmapped._bitmaps and bitmapped.search("acme fresh milk", 3) == [
+        ("P000", 9), ("P060", 9), ("P120", 9)]
+    check()
+    
+    for product in products[:250]:
+        bitmapped.remove(product.product_id)
+        scanned.remove(product.product_id)
+    assert len(bitmapped) == 50 and len(bitmapped._numbered) < 300
+    check()
+    
+    for product in products[250:280]:
+        product.name = product.name.replace("Acme", "Valley")
+        bitmapped.add(product)
+        scanned.add(product)
+    check()
+    
+    print("✓ Bitmap intersection test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - SEARCH MODULE")
+    print("="*60 + "\n")
+    
+    test_search_prefix_and_words()
+    test_search_tolerates_one_typo()
+    test_search_index_follows_catalog_changes()
+    test_bitmaps_match_posting_scans()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -0,0 +1,145 @@
+"""
+Unit Tests for Sharded Inventory
+Tests for the multi-process inventory router
+"""
+
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sharding import ShardedInventory, hash_partition, store_partition
+
+
+def _catalog():
+    """Helper: a small catalog spread over two categories"""
+    return [Product(f"P{i:03d}", f"Item {i}", 1.00 + i, i * 3, "Dairy" if i % 2 else "Bakery") for i in range(20)]
+
+
+def test_sharded_crud_routes_to_owning_shard():
+    """Test single-product calls reach the shard that owns the SKU"""
+    with ShardedInventory(num_shards=3) as inventory:
+        for product in _catalog():
+            assert inventory.add_product(product)
+        try:
+            inventory.add_product(Product("P001", "Again", 1.00, 1))
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "already exists" in str(e)
+        
+        assert inventory.get_product_count() == 20
+        assert {hash_partition(p.product_id, 3) for p in _catalog()} == {0, 1, 2}
+        product = inventory.get_product("P004")
+        assert (product.name, product.price, product.quantity) == ("Item 4", 5.00, 12)
+        assert inventory.get_product("P999") is None
+        
+        assert inventory.update_stock("P004", -2)
+        assert inventory.get_product("P004").quantity == 10
+        assert not inventory.update_stock("P999", 1)
+        assert inventory.remove_product("P004")
+        assert inventory.get_product("P004") is None
+        assert inventory.get_product_count() == 19
+    
+    print("✓ Sharded CRUD routing test passed")
+
+
+def test_sharded_batches_and_bulk_load():
+    """Test batched lookups and stock changes, and bulk load reporting duplicates"""
+    with ShardedInventory(num_shards=2) as inventory:
+        products = _catalog() + [Product("P003", "Duplicate", 1.00, 1)]
+        report = inventory.bulk_load(products, chunk_size=4)
+        assert report.loaded == 20
+        assert report.errors == [(21, "Product ID P003 already exists")]
+        
+        found = inventory.get_products(["P001", "P010", "P404"])
+        assert found["P001"].name == "Item 1" and found["P010"].name == "Item 10"
+        assert found["P404"] is None
+        
+        assert inventory.update_stock_many({"P001": 5, "P010": -10, "P404": 1}) == {
+            "P001": True, "P010": True, "P404": False}
+        quantities = {pid: p.quantity for pid, p in inventory.get_products(["P001", "P010"]).items()}
+        assert quantities == {"P001": 8, "P010": 20}
+    
+    print("✓ Sharded batches and bulk load test passed")
+
+
+def test_sharded_queries_match_single_manager():
+    """Test scatter-gather queries give the same answers as one ProductManager"""
+    single = ProductManager()
+    single.bulk_load(_catalog())
+    with ShardedInventory(num_shards=3) as inventory:
+        inventory.bulk_load(_catalog())
+        
+        assert inventory.get_total_inventory_value() == single.get_total_inventory_value()
+        assert sorted(p.product_id for p in inventory.search_by_category("Dairy")) == \
+            sorted(p.product_id for p in single.search_by_category("Dairy"))
+        low = inventory.get_low_stock_products(threshold=20)
+        assert [p.quantity for p in low] == sorted(p.quantity for p in single.get_low_stock_products(20))
+        assert {p.product_id for p in low} == {p.product_id for p in single.get_low_stock_products(20)}
+    
+    print("✓ Sharded scatter-gather query test passed")
+
+
+def test_partition_functions():
+    """Test hash partitioning is stable and store partitioning keeps a store together"""
+    assert hash_partition("P001", 8) == hash_partition("P001", 8)
+    assert 0 <= hash_partition("P001", 8) < 8
+    shards = {store_partition(f"S07-P{i:04d}", 8) for i in range(100)}
+    assert len(shards) == 1
+    
+    print("✓ Partition functions test passed")
+
+
+def _by_last_digit(product_id, num_shards):
+    """Helper: a partition that places P0 on shard 0 and P1 on shard 1"""
+    return int(product_id[-1]) % num_shards
+
+
+def test_failed_call_leaves_no_stale_replies():
+    """Test a call failing after some shards were sent to does not desync later calls"""
+    with ShardedInventory(num_shards=2, partition=_by_last_digit) as inventory:
+        inventory.add_product(Product("P0", "Milk", 1.00, 10))
+        inventory.add_product(Product("P1", "Bread", 2.00, 10))
+        try:
+            # Shard 0's batch goes out before shard 1's fails to pickle
+            inventory.update_stock_many({"P0": 5, "P1": lambda: 1})
+            assert False, "Should have raised an error"
+        except (AttributeError, TypeError, ValueError):
+            pass
+        assert inventory.get_product("P0").quantity == 15
+        assert inventory.get_product("P1").quantity == 10
+        assert inventory.get_products(["P0", "P1"])["P1"].name == "Bread"
+        
+        inventory._processes[1].kill()
+        inventory._processes[1].join()
+        try:
+            inventory.get_product_count()
+            assert False, "Should have raised EOFError"
+        except (EOFError, OSError):
+            pass
+        try:
+            inventory.get_product("P0")
+            assert False, "Should have raised RuntimeError"
+        except RuntimeError as e:
+            assert "broken" in str(e)
+    
+    print("✓ Failed call drains replies test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - SHARDED INVENTORY")
+    print("="*60 + "\n")
+    
+    test_sharded_crud_routes_to_owning_shard()
+    test_sharded_batches_and_bulk_load()
+    test_sharded_queries_match_single_manager()
+    test_partition_functions()
+    test_failed_call_leaves_no_stale_replies()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")
@@ -0,0 +1,149 @@
+"""
+Unit Tests for Storage Backends
+Tests for SQLiteStorage persistence behind ProductManager and SalesManager
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from product import Product, ProductManager
+from sales import SalesManager
+from storage import SQLiteStorage
+
+
+def _run_store_session(path):
+    """Helper: stock a catalog, sell, and close the store"""
+    storage = SQLiteStorage(path, batch_size=3)
+    products = ProductManager(storage)
+    sales = SalesManager(storage=storage)
+    
+    products.add_product(Product("P001", "Milk", 4.00, 20, "Dairy"))
+    products.add_product(Product("P002", "Bread", 2.50, 10, "Bakery"))
+    products.add_product(Product("P003", "Jam", 3.00, 5, "Pantry"))
+    products.remove_product("P003")
+    
+    sale = sales.create_sale()
+    sale.add_item(products.get_product("P001"), 3)
+    sale.add_item(products.get_product("P002"), 1)
+    sale.complete_sale("Cash")
+    sales.record_sale(sale)
+    products.update_stock("P002", 4)
+    
+    storage.close()
+    return sale
+
+
+def test_sqlite_storage_restores_state():
+    """Test that products, stock levels and sales survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        original = _run_store_session(path)
+        
+        storage = SQLiteStorage(path)
+        products = ProductManager(storage)
+        sales = SalesManager(storage=storage)
+        
+        assert products.get_product("P001").quantity == 17
+        assert products.get_product("P002").quantity == 13
+        assert products.get_product("P003") is None
+        
+        assert sales.get_sales_count() == 1
+        assert sales.get_total_revenue() == 14.50
+        restored = sales.sales[0]
+        assert restored.sale_id == original.sale_id
+        assert restored.timestamp == original.timestamp
+        assert [(i.product.product_id, i.quantity) for i in restored.items] == [("P001", 3), ("P002", 1)]
+        
+        # Sale numbering continues where the previous session stopped
+        assert sales.create_sale().sale_id == "SALE-0002"
+        storage.close()
+    
+    print("✓ SQLiteStorage restart recovery test passed")
+
+
+def test_sqlite_storage_lazy_loading():
+    """Test that products load on demand until a catalog-wide query"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        _run_store_session(path)
+        
+        storage = SQLiteStorage(path)
+        products = ProductManager(storage)
+        assert len(products.products) == 0
+        
+        products.get_product("P002")
+        assert len(products.products) == 1
+        
+        try:
+            products.add_product(Product("P001", "Duplicate", 1.00, 1))
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "already exists" in str(e)
+        
+        assert len(products.search_by_category("Dairy")) == 1
+        assert len(products.get_all_products()) == 2
+        storage.close()
+    
+    print("✓ SQLiteStorage lazy loading test passed")
+
+
+def test_sqlite_storage_batches_writes():
+    """Test that writes are buffered until the batch fills or flush is called"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.db")
+        storage = SQLiteStorage(path, batch_size=100)
+        products = ProductManager(storage)
+        product = Product("P001", "Milk", 4.00, 20)
+        products.add_product(product)
+        for _ in range(5):
+            product.update_quantity(-1)
+        
+        reader = SQLiteStorage(path)
+        assert reader.load_product("P001") is None
+        
+        storage.flush()
+        assert reader.load_product("P001").quantity == 15
+        reader.close()
+        storage.close()
+    
+    print("✓ SQLiteStorage write batching test passed")
+
+
+def test_sqlite_storage_serves_unflushed_products():
+    """Test that load_product sees products, stock and deletes still waiting in the batch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "store.db"), batch_size=100)
+        storage.save_product(Product("P001", "Milk", 4.00, 20, "Dairy"))
+        storage.save_stock("P001", 17)
+        
+        pending = storage.load_product("P001")
+        assert (pending.name, pending.price_cents, pending.quantity, pending.category) == ("Milk", 400, 17, "Dairy")
+        
+        storage.flush()
+        storage.save_stock("P001", 12)
+        assert storage.load_product("P001").quantity == 12
+        storage.delete_product("P001")
+        assert storage.load_product("P001") is None
+        storage.close()
+    
+    print("✓ SQLiteStorage unflushed lookup test passed")
+
+
+# Run all tests if executed directly
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RUNNING UNIT TESTS - STORAGE MODULE")
+    print("="*60 + "\n")
+    
+    test_sqlite_storage_restores_state()
+    test_sqlite_storage_lazy_loading()
+    test_sqlite_storage_batches_writes()
+    test_sqlite_storage_serves_unflushed_products()
+    
+    print("\n" + "="*60)
+    print("🎉 ALL UNIT TESTS PASSED!")
+    print("="*60 + "\n")